@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""Çok dilli paylaşım (fan-out) için hesap tanımları."""
+
+
+class TwitterAccount:
+    """Tek bir paylaşım hesabı ve ona ait bileşenler.
+
+    Haberler bir kez çekilip hesabın diline çevrilir; tweepy istemcileri,
+    hız yöneticisi, aday kuyruğu, ön hazırlık işçisi ve benzer başlık indeksi
+    her hesap için ayrıdır. Bileşenler main.py'de kurulup atanır.
+    """
+
+    def __init__(self, name, lang, client=None, api_v1=None):
+        self.name = name
+        self.lang = lang
+        self.client = client  # tweepy.Client (API v2, tweet atmak için)
+        self.api_v1 = api_v1  # tweepy.API (v1.1, medya yüklemek için)
+        self.rate_governor = None
+        self.candidate_queue = None
+        self.prefetcher = None
+        self.title_index = None
+        self.tweet_counter = 0
+        self.waiting_for_news = False
+
+    @property
+    def ready(self):
+        return self.client is not None and self.api_v1 is not None
+
+    @property
+    def post_job_key(self):
+        return f"post:{self.name}"
+
+    def __repr__(self):
+        return f"TwitterAccount({self.name!r}, {self.lang!r})"
+
+
+def parse_account_specs(spec):
+    """'en:en,de:de' biçimindeki tanımı [(ad, dil)] listesine çevirir.
+
+    Dil verilmezse hesap adı dil kodu olarak kullanılır ('en' -> ('en', 'en')).
+    """
+    accounts = []
+    for part in (spec or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, lang = part.partition(':')
+        name = name.strip().lower()
+        accounts.append((name, (lang.strip() or name)))
+    return accounts
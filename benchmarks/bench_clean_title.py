@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""main.clean_title_text için eşdeğerlik kontrolü ve mikro benchmark.
+
+Tek geçişli translate tablosuyla yazılan temizleme, önceki (replace + re.sub
+zinciri) uygulamayla sabit tohumlu bir derlem üzerinde karşılaştırılır; tek
+bir fark bile varsa betik hata verir.
+
+Kullanım: python benchmarks/bench_clean_title.py [derlem_boyutu]
+"""
+
+import os
+import random
+import re
+import sys
+import tempfile
+import timeit
+from contextlib import redirect_stdout
+
+from unidecode import unidecode
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+# Tipografik işaretler, ASCII noktalama, aksanlı/Türkçe harfler, CJK, emoji,
+# birleşik işaretler ve farklı boşluk türleri
+ALPHABET = (list("abcXYZ019 .,!?$%&'():/-_#@*+=<>[]{}|\\\"~`^;") +
+            list("–—‘’“”…«»") + list("çğıöşüÇĞİÖŞÜéàñß") +
+            list("中文日本語한국어Привет") + ["🚀", "📈", "🇹🇷", "👍🏽", "❤️"] +
+            ["́", " ", " ", "\t", "\n", "\r", "‍"])
+EDGE_CASES = ["", "   ", "???", "?" * 10 + "a", "…" * 5, "“”‘’–—",
+              "Bitcoin “hits” record — again…", "中文标题", "🚀🚀🚀",
+              "&amp; &quot; &#39;", "  spaced\t\nout  ", None, 42, b"bytes"]
+
+
+def clean_title_text_old(text_input):
+    """Önceki uygulama (karşılaştırma için aynen korunmuştur)."""
+    if not text_input or not isinstance(text_input, str):
+        return ""
+
+    text = text_input
+
+    # 1. Temel HTML entity'leri
+    replacements = {
+        " ": " ",
+        "&": "&",
+        "\"": '"',
+        "'": "'",
+        "'": "'",
+        "<": "<",
+        ">": ">",
+        "«": "«",
+        "»": "»",
+        "–": "-",
+        "—": "—",
+        "‘": "'",
+        "’": "'",
+        "“": '"',
+        "”": '"',
+        "…": "...",
+    }
+    for entity, char in replacements.items():
+        text = text.replace(entity, char)
+
+    # 2. Unicode kıvrımlı tırnakları ve diğerlerini düzelt
+    text = re.sub(r'[“”]', '"', text)
+    text = re.sub(r'[‘’]', "'", text)
+    text = re.sub(r'[–—]', "-", text)  # En dash, em dash
+
+    # 3. Unidecode (dikkatli kullanılmalı, çeviriyi etkileyebilir)
+    try:
+        text_unidecoded = unidecode(text)
+        if text_unidecoded.count('?') < len(text_unidecoded) / 2:
+            text = text_unidecoded
+    except Exception:
+        pass
+
+    # 4. Kalan istenmeyen karakterleri temizle (çeviriye uygun hale getirme)
+    text = re.sub(r'[^\w\s.,!?$%&\'():/\-]', ' ', text)
+
+    # 5. Fazla boşlukları ve satır başı/sonu boşluklarını temizle
+    text = ' '.join(text.split())
+    return text.strip()
+
+
+def make_corpus(count, seed=17):
+    rng = random.Random(seed)
+    corpus = list(EDGE_CASES)
+    for _ in range(count):
+        corpus.append(''.join(rng.choice(ALPHABET)
+                              for _ in range(rng.randint(1, 120))))
+    return corpus
+
+
+def import_main():
+    """main'i geçici bir dizinde (tweets.db oraya) sessizce içe aktarır."""
+    os.environ.setdefault('SOURCES_FILE', os.path.join(REPO_DIR, 'sources.json'))
+    os.chdir(tempfile.mkdtemp(prefix='bench-clean-title-'))
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, \
+            redirect_stdout(devnull):
+        import main
+        main.scheduler.stop()
+        main.log_config.stop()
+    return main
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    bot = import_main()
+    corpus = make_corpus(count)
+
+    mismatches = []
+    for text in corpus:
+        expected = clean_title_text_old(text)
+        # Hem önbellekli giriş noktası hem önbelleksiz çekirdek denetlenir
+        actual = bot.clean_title_text(text)
+        core = bot._clean_title(text) if isinstance(text, str) and text else ""
+        if actual != expected or core != expected:
+            mismatches.append((text, expected, actual, core))
+    if mismatches:
+        for text, expected, actual, core in mismatches[:10]:
+            print(f"FARK {text!r}: eski={expected!r} yeni={actual!r} "
+                  f"çekirdek={core!r}")
+        sys.exit(f"{len(mismatches)} / {len(corpus)} metinde fark var")
+    print(f"eşdeğerlik: {len(corpus)} metin, fark yok")
+
+    texts = [text for text in corpus if isinstance(text, str)]
+    old = min(timeit.repeat(lambda: [clean_title_text_old(t) for t in texts],
+                            number=1, repeat=3))
+    new = min(timeit.repeat(lambda: [bot._clean_title(t) for t in texts],
+                            number=1, repeat=3))
+    print(f"eski: {old * 1000:.1f} ms, yeni (önbelleksiz): {new * 1000:.1f} ms "
+          f"({len(texts)} metin)")
+
+
+if __name__ == '__main__':
+    main()
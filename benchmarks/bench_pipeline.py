@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""Haber hattı için ağsız uçtan uca benchmark (RSS -> çeviri -> tweet).
+
+Feed'ler, makale sayfaları ve görseller yerel bir sunucudan (feed_server),
+çeviri ve Twitter API'si sahte nesnelerden (fakes) gelir; main.py'nin
+gerçek poll_source ve posting_slot işleri çalıştırılır. Her senaryo temiz
+bir geçici dizinde, ayrı bir süreçte çalışır, böylece tepe bellek ölçümleri
+birbirini etkilemez.
+
+Kullanım:
+    python benchmarks/bench_pipeline.py                  # tüm senaryolar
+    python benchmarks/bench_pipeline.py sources-50 --latency-ms 20
+    python benchmarks/bench_pipeline.py --fixtures kayitli_feedler/ --json sonuc.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import feedparser  # noqa: E402
+
+from fakes import FakeAPI, FakeClient, FakeTranslator  # noqa: E402
+from feed_server import FeedServer  # noqa: E402
+
+# sources: kaynak sayısı, seen_rows: hesap başına önceden kayıtlı (eski,
+# ilgisiz) tweet sayısı, seen_fraction: feed'deki haberlerden önceden
+# paylaşılmış sayılanların oranı
+SCENARIOS = {
+    'sources-2': {'sources': 2},
+    'sources-50': {'sources': 50},
+    'sources-500': {'sources': 500},
+    'dedup-large': {'sources': 50, 'seen_rows': 200_000, 'seen_fraction': 0.5},
+}
+SEED_VOCABULARY = 20_000  # Kayıtlı başlıklar için sentetik kelime sayısı
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1,
+                max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples):
+    summary = {}
+    for stage, values in sorted(samples.items()):
+        values = sorted(values)
+        summary[stage] = {
+            'count': len(values),
+            'p50_ms': percentile(values, 0.50) * 1000,
+            'p99_ms': percentile(values, 0.99) * 1000,
+            'total_s': sum(values),
+        }
+    return summary
+
+
+def seed_dedup(main, server, scenario):
+    """Tweet tablosunu ilgisiz kayıtlarla ve feed haberlerinin bir kısmıyla doldurur."""
+    seen_rows = scenario.get('seen_rows', 0)
+    seen_fraction = scenario.get('seen_fraction', 0.0)
+    if not seen_rows and not seen_fraction:
+        return
+    rows = [(' '.join(f"w{(i * 7919 + k * 104729) % SEED_VOCABULARY}"
+                      for k in range(8)), f"https://seed.invalid/{i}")
+            for i in range(seen_rows)]
+    if seen_fraction:
+        step = max(1, round(1 / seen_fraction))
+        for index in range(scenario['sources']):
+            feed = feedparser.parse(server.feed(index))
+            for i, entry in enumerate(feed.entries):
+                if i % step == 0:
+                    rows.append((entry.title, entry.link.split('?')[0].strip()))
+    for account in main.accounts:
+        main.db.save_many(rows, account.name)
+    # İlgisiz kayıtlar eski geçmiş gibi davransın: benzer başlık penceresine
+    # girmez, sadece link tekrar kontrolünü (tablo + bellek içi indeks) büyütür
+    with main.db.connection() as conn:
+        conn.execute(
+            "UPDATE tweets SET created_at = datetime('now', '-30 days') "
+            "WHERE link LIKE 'https://seed.invalid/%'")
+    main.db.load_seen_index()
+    for account in main.accounts:
+        account.title_index.load(
+            main.db.recent_titles(main.NEAR_DUP_WINDOW, account.name))
+
+
+def run_scenario(name, args):
+    """Senaryoyu bu süreçte çalıştırır ve sonuç sözlüğünü döndürür."""
+    scenario = SCENARIOS[name]
+    workdir = tempfile.mkdtemp(prefix=f"bench-{name}-")
+    server = FeedServer(items_per_feed=args.items_per_feed,
+                        latency=args.latency_ms / 1000,
+                        page_padding=args.page_kb * 1024,
+                        fixtures_dir=args.fixtures).start()
+    sources_path = os.path.join(workdir, 'sources.json')
+    with open(sources_path, 'w', encoding='utf-8') as f:
+        json.dump({'sources': [{'name': f"bench{i}", 'url': server.feed_url(i)}
+                               for i in range(scenario['sources'])]}, f)
+    os.environ['SOURCES_FILE'] = sources_path
+    os.environ['FANOUT_ACCOUNTS'] = args.accounts
+    os.chdir(workdir)  # tweets.db geçici dizinde oluşturulur
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    samples = defaultdict(list)
+    devnull = open(os.devnull, 'w', encoding='utf-8')
+    with redirect_stdout(devnull):
+        import main
+        from rate_limit import RateGovernor
+        main.scheduler.stop()  # İşler kendini yeniden zamanlamasın
+
+        # Aşama süreleri main'in kendi histogramlarından ham örnek olarak alınır
+        main.STAGE_SECONDS.observe = (
+            lambda value, stage: samples[stage].append(value))
+        main.FEED_FETCH_SECONDS.observe = (
+            lambda value, source: samples['feed_fetch'].append(value))
+        unlimited = {
+            endpoint: {'bench': (10**9, 1, 10**9)}
+            for endpoint in main.TWITTER_RATE_LIMITS
+        }
+        main.translators.factory = lambda lang: FakeTranslator(
+            lang, latency=args.translate_latency_ms / 1000)
+        for account in main.accounts:
+            account.client = FakeClient(latency=args.twitter_latency_ms / 1000)
+            account.api_v1 = FakeAPI(latency=args.twitter_latency_ms / 1000)
+            account.rate_governor = RateGovernor(main.db, unlimited,
+                                                 namespace=f"bench-{account.name}")
+
+        started = time.perf_counter()
+        seed_dedup(main, server, scenario)
+        seed_seconds = time.perf_counter() - started
+        seeded_rows = main.db.count_tweets()
+
+        fetched = []
+        parse_feed_entries = main.parse_feed_entries
+
+        def counting_parse(source, feed):
+            news = parse_feed_entries(source, feed)
+            fetched.append(len(news))
+            return news
+
+        main.parse_feed_entries = counting_parse
+
+        def timed(stage, fn):
+            def wrapper(arg):
+                start = time.perf_counter()
+                try:
+                    return fn(arg)
+                finally:
+                    samples[stage].append(time.perf_counter() - start)
+            return wrapper
+
+        def drain(account):
+            # Kuyruk boşalana kadar paylaşım slotlarını beklemeden art arda çalıştır
+            slot = timed('posting_slot', main.posting_slot)
+            while not account.waiting_for_news:
+                slot(account)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=main.SCHEDULER_WORKERS) as pool:
+            list(pool.map(timed('poll_source', main.poll_source),
+                          main.source_registry.sources()))
+            ingest_seconds = time.perf_counter() - started
+            list(pool.map(drain, main.accounts))
+        total_seconds = time.perf_counter() - started
+        main.log_config.stop()  # Kuyruktaki loglar devnull kapanmadan yazılsın
+    devnull.close()
+
+    tweets = sum(len(account.client.tweets) for account in main.accounts)
+    result = {
+        'scenario': name,
+        'sources': scenario['sources'],
+        'accounts': len(main.accounts),
+        'seeded_rows': seeded_rows,
+        'items_fetched': sum(fetched),
+        'tweets': tweets,
+        'http_requests': server.requests,
+        'seed_seconds': seed_seconds,
+        'ingest_seconds': ingest_seconds,
+        'total_seconds': total_seconds,
+        'tweets_per_second': tweets / total_seconds if total_seconds else 0.0,
+        'items_per_second': sum(fetched) / ingest_seconds if ingest_seconds else 0.0,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'stages': summarize(samples),
+    }
+    if args.tracemalloc:
+        result['tracemalloc_peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+    server.stop()
+    return result
+
+
+def print_result(result):
+    print(f"\n== {result['scenario']} ({result['sources']} kaynak, "
+          f"{result['accounts']} hesap, {result['seeded_rows']} kayıtlı tweet) ==")
+    print(f"  {result['items_fetched']} haber {result['ingest_seconds']:.2f} sn'de "
+          f"toplandı ({result['items_per_second']:.1f} haber/sn)")
+    print(f"  {result['tweets']} tweet, toplam {result['total_seconds']:.2f} sn "
+          f"({result['tweets_per_second']:.1f} tweet/sn), "
+          f"{result['http_requests']} HTTP isteği")
+    memory = f"  tepe bellek: RSS {result['peak_rss_mb']:.1f} MB"
+    if 'tracemalloc_peak_mb' in result:
+        memory += f", Python yığını {result['tracemalloc_peak_mb']:.1f} MB"
+    if result['seed_seconds'] > 0.01:
+        memory += f" (tekrar tablosu kurulumu {result['seed_seconds']:.2f} sn)"
+    print(memory)
+    print(f"  {'aşama':<16}{'adet':>8}{'p50 ms':>10}{'p99 ms':>10}{'toplam sn':>11}")
+    for stage, stats in result['stages'].items():
+        print(f"  {stage:<16}{stats['count']:>8}{stats['p50_ms']:>10.2f}"
+              f"{stats['p99_ms']:>10.2f}{stats['total_s']:>11.2f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('scenarios', nargs='*',
+                        help=f"çalıştırılacak senaryolar: {', '.join(SCENARIOS)} "
+                        "(varsayılan: hepsi)")
+    parser.add_argument('--items-per-feed', type=int, default=10)
+    parser.add_argument('--latency-ms', type=float, default=5,
+                        help="yerel sunucunun her isteğe eklediği gecikme")
+    parser.add_argument('--translate-latency-ms', type=float, default=20)
+    parser.add_argument('--twitter-latency-ms', type=float, default=5)
+    parser.add_argument('--page-kb', type=int, default=0,
+                        help="makale sayfası gövdesinin dolgu boyutu")
+    parser.add_argument('--accounts', default='',
+                        help="ek dil hesapları, ör. 'en:en,de:de'")
+    parser.add_argument('--fixtures',
+                        help="kaydedilmiş *.xml feed ve *.html sayfa dizini")
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help="Python yığınının tepe değerini de ölç (yavaşlatır)")
+    parser.add_argument('--json', help="sonuçların yazılacağı dosya")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"bilinmeyen senaryo: {', '.join(unknown)}")
+    return args
+
+
+def main():
+    args = parse_args()
+    if args.child:
+        result = run_scenario(args.scenarios[0], args)
+        with open(args.child, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return
+
+    forwarded = [arg for arg in sys.argv[1:] if arg not in SCENARIOS]
+    results = []
+    for name in args.scenarios or SCENARIOS:
+        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+            result_path = f.name
+        try:
+            subprocess.run([sys.executable, os.path.abspath(__file__), name,
+                            '--child', result_path] + forwarded,
+                           check=True)
+            with open(result_path, encoding='utf-8') as f:
+                results.append(json.load(f))
+        finally:
+            os.unlink(result_path)
+        print_result(results[-1])
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""tweet_text.compose_tweet için mikro benchmark.
+
+Kullanım: python benchmarks/bench_tweet_text.py [tekrar_sayısı]
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tweet_text import MAX_TWEET_WEIGHT, compose_tweet, weighted_length  # noqa: E402
+
+TAGS = ["#Bitcoin", "#BTC", "#Kripto", "#Ekonomi", "#Finans", "#Yatırım",
+        "#Teknoloji", "#Altcoin", "#CoinDesk", "#BlockchainHaberleri"]
+PREFIXES = ["", "📰 ", "⚡️ ", "💡 ", "🚀 ", "🔔 ", "📢 "]
+EMOJIS = ["📉", "📈", "📊", "🧐", "📌", "🔍", "🌐", "🔥", "✨"]
+WORDS = ("Bitcoin ETF fiyat rekor kırdı SEC onay borsa yatırımcı piyasa "
+         "düşüş yükseliş 中文 🚀 staking ağ güncelleme").split()
+
+
+def make_cases(count, seed=42):
+    rng = random.Random(seed)
+    cases = []
+    for i in range(count):
+        title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 60)))
+        link = f"https://www.example.com/news/{i}/" + 'x' * rng.randint(10, 120)
+        tags = rng.sample(TAGS, rng.randint(1, 4))
+        cases.append((title, link, tags, rng.choice(PREFIXES),
+                      rng.choice(EMOJIS)))
+    return cases
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    cases = make_cases(2000)
+
+    # Doğruluk: sınır aşılmamalı, link her zaman tam kalmalı
+    for title, link, tags, prefix, emoji in cases:
+        text = compose_tweet(title, link, tags, prefix, emoji)
+        assert weighted_length(text) <= MAX_TWEET_WEIGHT, text
+        assert link in text, text
+
+    def run():
+        for title, link, tags, prefix, emoji in cases:
+            compose_tweet(title, link, tags, prefix, emoji)
+
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    print(f"compose_tweet: {len(cases)} tweet, en iyi {best * 1000:.1f} ms "
+          f"({best / len(cases) * 1e6:.1f} µs/tweet)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Benchmark'larda gerçek çeviri ve Twitter API'si yerine kullanılan sahte nesneler."""
+
+import itertools
+import threading
+import time
+from types import SimpleNamespace
+
+
+class FakeTranslator:
+    """GoogleTranslator yerine: her satırın başına dil etiketi ekler.
+
+    Satır sayısı korunur, böylece main.translate_batch'in ayraçlı toplu
+    çevirisi gerçekteki gibi çalışır. latency (sn) her çağrıya eklenir.
+    """
+
+    def __init__(self, target, latency=0.0):
+        self.target = target
+        self.latency = latency
+        self.calls = 0
+        self.chars = 0
+
+    def translate(self, text):
+        self.calls += 1
+        self.chars += len(text)
+        if self.latency:
+            time.sleep(self.latency)
+        return '\n'.join(f"[{self.target}] {line}" for line in text.split('\n'))
+
+
+class FakeClient:
+    """tweepy.Client yerine: create_tweet başarılı bir yanıt döndürür."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.tweets = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def create_tweet(self, text=None, media_ids=None, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            tweet_id = str(next(self._ids))
+            self.tweets.append((tweet_id, text, media_ids))
+        return SimpleNamespace(data={'id': tweet_id, 'text': text}, errors=[])
+
+
+class FakeAPI:
+    """tweepy.API (v1.1) yerine: media_upload dosyayı okuyup media_id döndürür."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.uploaded_bytes = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def media_upload(self, filename, file=None, **kwargs):
+        data = file.read() if file is not None else b''
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.uploaded_bytes += len(data)
+            media_id = str(next(self._ids))
+        return SimpleNamespace(media_id=int(media_id),
+                               media_id_string=media_id,
+                               expires_after_secs=86400)
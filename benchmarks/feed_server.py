@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""Benchmark'lar için RSS, makale sayfası ve görsel sunan yerel HTTP sunucusu.
+
+Ağ olmadan çalışır: feed'ler ya sentetik olarak üretilir ya da kaydedilmiş
+dosyalardan (fixtures dizinindeki *.xml / *.html) tekrar oynatılır. Her
+isteğe yapılandırılabilir gecikme eklenebilir.
+"""
+
+import email.utils
+import glob
+import io
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+from PIL import Image
+
+TITLE_WORDS = (
+    "Bitcoin Ethereum Solana XRP ETF SEC stablecoin exchange whale miners "
+    "rally slump record high low inflows outflows approval lawsuit hack "
+    "upgrade mainnet testnet treasury fund bank regulators Congress bill "
+    "tokenization DeFi NFT staking validators halving hashrate futures "
+    "options liquidation traders analysts market price surge plunge").split()
+# Kaydedilmiş feed/sayfalardaki mutlak linkler yerel sunucuya yönlendirilir
+_ABSOLUTE_URL_RE = re.compile(rb'https?://[^/"\'<>\s]+')
+
+
+def make_jpeg(width=1200, height=675):
+    """Gerçekçi boyutta (gürültülü, iyi sıkışmayan) bir JPEG üretir."""
+    image = Image.effect_noise((width, height), 48).convert('RGB')
+    output = io.BytesIO()
+    image.save(output, format='JPEG', quality=85)
+    return output.getvalue()
+
+
+def make_title(rng, words=8):
+    return ' '.join(rng.choice(TITLE_WORDS) for _ in range(words))
+
+
+def make_feed(base_url, index, items, now=None):
+    """index numaralı kaynak için `items` entry'lik sentetik RSS 2.0 belgesi."""
+    rng = random.Random(index)
+    now = time.time() if now is None else now
+    entries = []
+    for i in range(items):
+        link = f"{base_url}/article/{index}/{i}?utm_source=rss"
+        published = email.utils.formatdate(now - (i + 1) * 600)
+        entries.append(
+            f"<item><title>{escape(make_title(rng, rng.randint(6, 14)))}</title>"
+            f"<link>{escape(link)}</link><pubDate>{published}</pubDate>"
+            f"<description>{escape(make_title(rng, 40))}</description></item>")
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>Bench {index}</title><link>{base_url}</link>"
+        f"{''.join(entries)}</channel></rss>").encode('utf-8')
+
+
+def make_article(path, padding_bytes=0):
+    """og:image meta tag'li makale sayfası; gövde padding_bytes kadar doldurulur."""
+    body = '<p>lorem ipsum dolor sit amet</p>' * (padding_bytes // 32 + 1)
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8">'
+            f'<title>{escape(path)}</title>'
+            f'<meta property="og:image" content="/img{escape(path)}.jpg">'
+            f'</head><body>{body}</body></html>').encode('utf-8')
+
+
+class FeedServer:
+    """Arka plan thread'inde çalışan yerel sunucu.
+
+    /feed/<n>.xml: n numaralı kaynağın feed'i, /img/...: JPEG, diğer her yol
+    makale sayfası döner. latency (sn) her isteğe eklenir. fixtures_dir
+    verilirse oradaki *.xml dosyaları kaynaklara sırayla dağıtılır, *.html
+    dosyaları makale sayfası olarak kullanılır.
+    """
+
+    def __init__(self, items_per_feed=10, latency=0.0, page_padding=0,
+                 fixtures_dir=None):
+        self.items_per_feed = items_per_feed
+        self.latency = latency
+        self.page_padding = page_padding
+        self.image = make_jpeg()
+        self.requests = 0
+        self._fixture_feeds = []
+        self._fixture_pages = []
+        if fixtures_dir:
+            for path in sorted(glob.glob(os.path.join(fixtures_dir, '*.xml'))):
+                with open(path, 'rb') as f:
+                    self._fixture_feeds.append(f.read())
+            for path in sorted(glob.glob(os.path.join(fixtures_dir, '*.html'))):
+                with open(path, 'rb') as f:
+                    self._fixture_pages.append(f.read())
+        self._feeds = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def feed_url(self, index):
+        return f"{self.base_url}/feed/{index}.xml"
+
+    def _rewrite(self, data, index):
+        # Her kaynağın linkleri ayrı kalsın diye yol önekine kaynak no eklenir
+        prefix = f"{self.base_url}/fx{index}".encode()
+        return _ABSOLUTE_URL_RE.sub(lambda m: prefix, data)
+
+    def feed(self, index):
+        with self._lock:
+            data = self._feeds.get(index)
+            if data is None:
+                if self._fixture_feeds:
+                    data = self._rewrite(
+                        self._fixture_feeds[index % len(self._fixture_feeds)],
+                        index)
+                else:
+                    data = make_feed(self.base_url, index, self.items_per_feed)
+                self._feeds[index] = data
+            return data
+
+    def page(self, path):
+        if self._fixture_pages:
+            page = self._fixture_pages[zlib.crc32(path.encode()) %
+                                       len(self._fixture_pages)]
+            return self._rewrite(page, 'page')
+        return make_article(path, self.page_padding)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive: havuzlu oturum gibi
+            # Başlık ve gövde ayrı yazılıyor; Nagle + gecikmeli ACK ~40 ms eklemesin
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                path = self.path.split('?', 1)[0]
+                match = re.fullmatch(r'/feed/(\d+)\.xml', path)
+                if match:
+                    body, content_type = server.feed(int(
+                        match.group(1))), 'application/rss+xml'
+                elif path.lower().endswith(('.jpg', '.jpeg', '.png', '.gif',
+                                            '.webp')):
+                    body, content_type = server.image, 'image/jpeg'
+                else:
+                    body, content_type = server.page(
+                        path), 'text/html; charset=utf-8'
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # İstemci <head> sonrası bağlantıyı kapatabilir
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever,
+                         name='bench-feed-server',
+                         daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,430 @@
+# -*- coding: utf-8 -*-
+"""Tazelik, kaynak ağırlığı ve anahtar kelimeye göre sıralı kalıcı aday kuyruğu."""
+
+import heapq
+import math
+import re
+import time
+from datetime import datetime, timezone
+from threading import Lock
+
+from storage import DEFAULT_ACCOUNT
+
+_WORD_RE = re.compile(r"[a-z0-9$]+")
+
+# Aday (iş) durumları; geçişler ileri yönlüdür (requeue() hariç)
+FETCHED = 'fetched'  # Feed'den alındı, çevrilmedi
+TRANSLATED = 'translated'  # Başlık hesabın diline çevrildi, sırada
+MEDIA_READY = 'media_ready'  # Tweet metni ve (varsa) yüklenmiş medya hazır
+POSTING = 'posting'  # create_tweet çağrılmak üzere; metin artık değişmez
+POSTED = 'posted'
+FAILED = 'failed'
+_QUEUED_STATES = (TRANSLATED, MEDIA_READY, POSTING)
+# Eski sürümlerin durumları: 'taken' satırlarının metni kayıtlı değildi
+_LEGACY_STATES = {'pending': TRANSLATED, 'taken': FAILED}
+_JOB_COLUMNS = {
+    'tweet_text': 'TEXT',
+    'media_id': 'TEXT',
+    'media_expires_at': 'REAL',
+    'tweet_id': 'TEXT',
+    'updated_at': 'REAL',
+}
+
+
+class CandidateQueue:
+    """Paylaşılacak haberlerin öncelik kuyruğu (SQLite'ta kalıcı).
+
+    Öncelik = kaynak_ağırlığı * (1 + anahtar_kelime_bonusu) * 2^(-yaş/yarı_ömür).
+    Yaş çarpanı tüm adaylar için aynı hızda azaldığından sıralama
+    log(ağırlık * (1 + bonus)) + yayın_zamanı / τ anahtarıyla sabittir; bu
+    sayede yeni adaylar heap'e eklenir, her döngüde yeniden sıralama yapılmaz.
+
+    Tablo aynı zamanda paylaşım işlerinin kaydıdır: her satır fetched ->
+    translated -> media_ready -> posting -> posted (ya da failed) durumlarından
+    geçer ve her adımın sonucu (çeviri, tweet metni, media_id, tweet id)
+    yazılır. Geçişler koşullu UPDATE'lerdir, tekrar çağrılmaları zararsızdır.
+    Yeniden başlatmada sıradaki işler kaldıkları durumdan yüklenir; 'posting'
+    işleri aynı metinle tekrar denenir (tweets tablosunda kaydı olanlar
+    doğrudan posted yapılır), tweet zaten atılmışsa Twitter bunu duplicate
+    olarak reddeder. Geçici hatayla paylaşılamayanlar requeue() ile sıraya
+    döner; başarısız olan adaylar yeniden eklenmez. max_age'den eski kayıtlar
+    expire() ile silinir, sonucu belirsiz 'posting' işleri hariç. Her paylaşım
+    hesabının kendi kuyruğu vardır; satırlar `account` sütunuyla ayrılır.
+    """
+
+    def __init__(self, db, source_weights=None, keyword_boosts=None,
+                 half_life=2 * 60 * 60, max_age=12 * 60 * 60,
+                 account=DEFAULT_ACCOUNT):
+        self.db = db
+        self.account = account
+        self.source_weights = source_weights or {}
+        self.keyword_boosts = {
+            k.lower(): v
+            for k, v in (keyword_boosts or {}).items()
+        }
+        self.tau = half_life / math.log(2)
+        self.max_age = max_age
+        self._heap = []
+        self._items = {}  # link -> haber (sadece sıradakiler)
+        self._fetched = {}  # link -> çevrilmeyi bekleyen haber
+        self._posting = set()  # Yeniden başlatmada 'posting' durumunda bulunanlar
+        self._known = set()  # Tablodaki tüm linkler
+        self._lock = Lock()
+        self._init_table()
+        self._load()
+
+    def _init_table(self):
+        conn = self.db.connection()
+        with conn:
+            columns = [
+                row[1]
+                for row in conn.execute("PRAGMA table_info(candidates)")
+            ]
+            if columns and 'account' not in columns:
+                # Hesap sütunundan önceki kuyruk birincil hesaba aittir;
+                # birincil anahtar değiştiği için tablo yeniden kurulur
+                if not conn.in_transaction:
+                    conn.execute("BEGIN")
+                conn.execute("ALTER TABLE candidates RENAME TO candidates_old")
+            conn.execute('''CREATE TABLE IF NOT EXISTS candidates
+                        (account TEXT NOT NULL DEFAULT 'default',
+                        link TEXT NOT NULL,
+                        source TEXT NOT NULL,
+                        original_title TEXT NOT NULL,
+                        title TEXT NOT NULL,
+                        published REAL NOT NULL,
+                        priority REAL NOT NULL,
+                        state TEXT NOT NULL DEFAULT 'fetched',
+                        added_at REAL NOT NULL,
+                        tweet_text TEXT,
+                        media_id TEXT,
+                        media_expires_at REAL,
+                        tweet_id TEXT,
+                        updated_at REAL,
+                        PRIMARY KEY (account, link))''')
+            if columns and 'account' not in columns:
+                conn.execute(
+                    "INSERT INTO candidates (account, link, source, original_title, "
+                    "title, published, priority, state, added_at) "
+                    "SELECT ?, link, source, original_title, title, published, "
+                    "priority, state, added_at FROM candidates_old",
+                    (DEFAULT_ACCOUNT, ))
+                conn.execute("DROP TABLE candidates_old")
+            # İş durumlarından önceki tabloya yeni sütunlar eklenir
+            existing = {
+                row[1]
+                for row in conn.execute("PRAGMA table_info(candidates)")
+            }
+            for name, column_type in _JOB_COLUMNS.items():
+                if name not in existing:
+                    conn.execute(
+                        f"ALTER TABLE candidates ADD COLUMN {name} {column_type}")
+            for old, new in _LEGACY_STATES.items():
+                conn.execute("UPDATE candidates SET state=? WHERE state=?",
+                             (new, old))
+
+    def _load(self):
+        conn = self.db.connection()
+        with conn:
+            # Tweet'i kaydedilmiş ama işi kapatılamamış satırlar
+            conn.execute(
+                "UPDATE candidates SET state=?, updated_at=? "
+                "WHERE account=? AND state=? AND link IN "
+                "(SELECT link FROM tweets WHERE account=?)",
+                (POSTED, time.time(), self.account, POSTING, self.account))
+        self.expire()
+        rows = self.db.connection().execute(
+            "SELECT link, source, original_title, title, published, priority, "
+            "state, tweet_text, media_id, media_expires_at "
+            "FROM candidates WHERE account=?", (self.account, )).fetchall()
+        with self._lock:
+            for (link, source, original_title, title, published, priority,
+                 state, tweet_text, media_id, media_expires_at) in rows:
+                self._known.add(link)
+                news_item = {
+                    'source': source,
+                    'original_title': original_title,
+                    'link': link,
+                    'published': datetime.fromtimestamp(published,
+                                                        tz=timezone.utc),
+                    'priority': priority,
+                }
+                if state == FETCHED:
+                    self._fetched[link] = news_item
+                    continue
+                if state not in _QUEUED_STATES:
+                    continue
+                if state == POSTING:
+                    self._posting.add(link)
+                news_item['title'] = title
+                if tweet_text:
+                    # Hazırlanmış iş: metin ve medya yeniden kullanılır
+                    news_item.update(tweet_text=tweet_text,
+                                     media_id=media_id,
+                                     media_expires_at=media_expires_at or 0)
+                self._items[link] = news_item
+                heapq.heappush(self._heap, (-priority, link))
+
+    def priority(self, news_item):
+        weight = self.source_weights.get(news_item['source'], 1.0)
+        words = set(_WORD_RE.findall(news_item['original_title'].lower()))
+        boost = sum(v for k, v in self.keyword_boosts.items() if k in words)
+        return (math.log(max(weight, 1e-6) * (1 + boost)) +
+                news_item['published'].timestamp() / self.tau)
+
+    def unknown(self, news):
+        """Tabloda zaten olan (sıradaki, paylaşılmış ya da başarısız) ve max_age'den eski haberleri ayıklar."""
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            return [
+                item for item in news if item['link'] not in self._known
+                and item['published'].timestamp() >= cutoff
+            ]
+
+    def _new_rows(self, news, state):
+        # Kilit çağıran tarafından tutuluyor olmalı
+        cutoff = time.time() - self.max_age
+        added = []
+        rows = []
+        for news_item in news:
+            link = news_item['link']
+            if link in self._known or news_item['published'].timestamp(
+            ) < cutoff:
+                continue
+            priority = self.priority(news_item)
+            news_item = dict(news_item, priority=priority)
+            self._known.add(link)
+            added.append(news_item)
+            now = time.time()
+            rows.append((self.account, link, news_item['source'],
+                         news_item['original_title'],
+                         news_item.get('title', news_item['original_title']),
+                         news_item['published'].timestamp(), priority, state,
+                         now, now))
+        return added, rows
+
+    def _insert(self, rows):
+        if rows:
+            conn = self.db.connection()
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO candidates "
+                    "(account, link, source, original_title, title, published, "
+                    "priority, state, added_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def push_fetched(self, news):
+        """Henüz çevrilmemiş haberleri kaydeder; eklenenleri (öncelikli kopyalar) döndürür.
+
+        Kaydedilenler mark_translated ile sıraya girer; arada süreç
+        durursa fetched() ile kaldıkları yerden alınabilirler.
+        """
+        with self._lock:
+            added, rows = self._new_rows(news, FETCHED)
+            for news_item in added:
+                self._fetched[news_item['link']] = news_item
+        self._insert(rows)
+        return added
+
+    def reject(self, news):
+        """Sıraya alınmadan elenen haberleri (ör. benzeri paylaşılmış) failed olarak kaydeder.
+
+        Sonraki yoklamalarda unknown() bunları ayıklar; kayıtlar max_age
+        dolunca expire() ile silinir. Kaydedilen sayıyı döndürür.
+        """
+        with self._lock:
+            _, rows = self._new_rows(news, FAILED)
+        self._insert(rows)
+        return len(rows)
+
+    def fetched(self):
+        """Kaydedilmiş ama çevrilmemiş haberler."""
+        with self._lock:
+            return list(self._fetched.values())
+
+    def mark_translated(self, news):
+        """Çevrilmiş ('title' içeren) kayıtlı haberleri sıraya alır; eklenen sayıyı döndürür."""
+        rows = []
+        with self._lock:
+            for news_item in news:
+                link = news_item['link']
+                if self._fetched.pop(link, None) is None:
+                    continue  # Başka bir iş çevirip sıraya almış
+                news_item = dict(news_item,
+                                 priority=news_item.get('priority')
+                                 or self.priority(news_item))
+                self._items[link] = news_item
+                heapq.heappush(self._heap, (-news_item['priority'], link))
+                rows.append((news_item['title'], TRANSLATED, time.time(),
+                             self.account, link))
+        if rows:
+            conn = self.db.connection()
+            with conn:
+                conn.executemany(
+                    "UPDATE candidates SET title=?, state=?, updated_at=? "
+                    "WHERE account=? AND link=? AND state='fetched'", rows)
+        return len(rows)
+
+    def _drop_stale_top(self):
+        # Kilit çağıran tarafından tutuluyor olmalı
+        cutoff = time.time() - self.max_age
+        while self._heap:
+            _, link = self._heap[0]
+            news_item = self._items.get(link)
+            if news_item is None:
+                heapq.heappop(self._heap)  # Daha önce çıkarılmış
+            elif (link not in self._posting
+                  and news_item['published'].timestamp() < cutoff):
+                heapq.heappop(self._heap)
+                del self._items[link]
+            else:
+                return
+
+    def peek(self, limit):
+        """En yüksek öncelikli `limit` adayı (kuyruktan çıkarmadan) döndürür."""
+        with self._lock:
+            self._drop_stale_top()
+            top = heapq.nsmallest(limit + len(self._heap) - len(self._items),
+                                  self._heap)
+            return [self._items[link] for _, link in top
+                    if link in self._items][:limit]
+
+    def pop(self):
+        """En yüksek öncelikli adayı kuyruktan çıkarır; yoksa None.
+
+        Satırın durumu değişmez: posted ya da failed olarak işaretlenmeden
+        süreç durursa aday bir sonraki başlangıçta yeniden sıraya girer.
+        """
+        with self._lock:
+            self._drop_stale_top()
+            if not self._heap:
+                return None
+            _, link = heapq.heappop(self._heap)
+            return self._items.pop(link)
+
+    def requeue(self, news_item):
+        """pop() ile alınıp geçici bir hatayla paylaşılamamış adayı sıraya geri koyar.
+
+        'posting' işi kayıtlı metniyle media_ready'ye döner (metin yoksa
+        translated); tekrar denemede aynı metin ve media_id kullanılır.
+        Kapanmış (posted/failed) ya da silinmiş işler için False döner.
+        """
+        link = news_item['link']
+        conn = self.db.connection()
+        with conn:
+            conn.execute(
+                "UPDATE candidates SET state=CASE WHEN tweet_text IS NULL "
+                "THEN ? ELSE ? END, updated_at=? "
+                "WHERE account=? AND link=? AND state=?",
+                (TRANSLATED, MEDIA_READY, time.time(), self.account, link,
+                 POSTING))
+            row = conn.execute(
+                "SELECT state, tweet_text, media_id, media_expires_at "
+                "FROM candidates WHERE account=? AND link=?",
+                (self.account, link)).fetchone()
+        if row is None or row[0] not in _QUEUED_STATES:
+            return False
+        _, tweet_text, media_id, media_expires_at = row
+        news_item = dict(news_item)
+        if tweet_text:
+            news_item.update(tweet_text=tweet_text, media_id=media_id,
+                             media_expires_at=media_expires_at or 0)
+        with self._lock:
+            self._posting.discard(link)
+            if link in self._items:
+                return False
+            self._items[link] = news_item
+            heapq.heappush(self._heap, (-news_item['priority'], link))
+        return True
+
+    def _update(self, sql, params):
+        conn = self.db.connection()
+        with conn:
+            conn.execute(sql, params)
+
+    def mark_media_ready(self, link, tweet_text, media_id, media_expires_at):
+        """Hazırlanan tweet metnini ve media_id'yi işe yazar.
+
+        Sıradaki kopya da güncellenir. Kayıtlı metin hiç değiştirilmez; bir
+        kez hazırlanan iş her denemede aynı metinle paylaşılır.
+        """
+        with self._lock:
+            news_item = self._items.get(link)
+            if news_item is not None:
+                news_item.setdefault('tweet_text', tweet_text)
+                news_item.update(media_id=media_id,
+                                 media_expires_at=media_expires_at)
+        self._update(
+            "UPDATE candidates SET state=?, tweet_text=COALESCE(tweet_text, ?), "
+            "media_id=?, media_expires_at=?, updated_at=? "
+            "WHERE account=? AND link=? "
+            "AND state IN ('translated', 'media_ready')",
+            (MEDIA_READY, tweet_text, media_id, media_expires_at, time.time(),
+             self.account, link))
+
+    def mark_posting(self, link, tweet_text, media_id, media_expires_at):
+        """create_tweet'ten hemen önce çağrılır: bu noktadan sonra iş aynı metinle tekrarlanır."""
+        self._update(
+            "UPDATE candidates SET state=?, tweet_text=?, media_id=?, "
+            "media_expires_at=?, updated_at=? WHERE account=? AND link=? "
+            "AND state IN ('translated', 'media_ready', 'posting')",
+            (POSTING, tweet_text, media_id, media_expires_at, time.time(),
+             self.account, link))
+
+    def mark_posted(self, link, tweet_id=None):
+        """İşi tamamlandı olarak kapatır; tweet id biliniyorsa saklanır."""
+        with self._lock:
+            self._known.add(link)
+            self._items.pop(link, None)
+            self._fetched.pop(link, None)
+            self._posting.discard(link)
+        self._update(
+            "UPDATE candidates SET state=?, tweet_id=COALESCE(?, tweet_id), "
+            "updated_at=? WHERE account=? AND link=?",
+            (POSTED, tweet_id, time.time(), self.account, link))
+
+    def mark_failed(self, link):
+        """Başarısız adayın max_age dolana kadar yeniden eklenmesini engeller."""
+        with self._lock:
+            self._known.add(link)
+            self._items.pop(link, None)
+            self._fetched.pop(link, None)
+            self._posting.discard(link)
+        self._update(
+            "UPDATE candidates SET state=?, updated_at=? "
+            "WHERE account=? AND link=? AND state!='posted'",
+            (FAILED, time.time(), self.account, link))
+
+    def state_counts(self):
+        """Durum -> iş sayısı (kayıtlı tüm satırlar)."""
+        return dict(self.db.connection().execute(
+            "SELECT state, COUNT(*) FROM candidates WHERE account=? "
+            "GROUP BY state", (self.account, )).fetchall())
+
+    def links(self):
+        with self._lock:
+            return list(self._items)
+
+    def expire(self):
+        """max_age'den eski adayları siler; 'posting' işleri sonuçlanana kadar kalır."""
+        cutoff = time.time() - self.max_age
+        conn = self.db.connection()
+        with conn:
+            expired = [
+                row[0] for row in conn.execute(
+                    "SELECT link FROM candidates WHERE account=? AND published<? "
+                    "AND state!=?", (self.account, cutoff, POSTING))
+            ]
+            conn.execute(
+                "DELETE FROM candidates WHERE account=? AND published<? "
+                "AND state!=?", (self.account, cutoff, POSTING))
+        with self._lock:
+            for link in expired:
+                self._known.discard(link)
+                self._items.pop(link, None)
+                self._fetched.pop(link, None)
+        return len(expired)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Tweetlenmiş linkler için bellek içi ön filtre (hash kümesi / Bloom filtresi)."""
+
+import hashlib
+import math
+import sys
+from threading import Lock
+
+
+def link_digest(link):
+    return hashlib.blake2b(link.encode('utf-8'), digest_size=16).digest()
+
+
+class BloomFilter:
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(
+            8, int(-self.capacity * math.log(error_rate) / (math.log(2)**2)))
+        self.num_hashes = max(
+            1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, digest):
+        # Çift hash: 16 baytlık özetin iki yarısından k pozisyon türet
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, digest):
+        for pos in self._positions(digest):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, digest):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7))
+                   for pos in self._positions(digest))
+
+    def memory_bytes(self):
+        return sys.getsizeof(self.bits)
+
+
+class SeenIndex:
+    """Tweetlenmiş linklerin özetlerini tutar.
+
+    might_contain() False dönerse link kesinlikle veritabanında yoktur;
+    True dönerse veritabanından doğrulanmalıdır. Kayıt sayısı max_set_items'ı
+    geçince 8 baytlık özet kümesinden Bloom filtresine geçilir, böylece bellek
+    kullanımı sınırlı kalır.
+    """
+
+    def __init__(self, max_set_items=500_000, bloom_error_rate=0.001):
+        self.max_set_items = max_set_items
+        self.bloom_error_rate = bloom_error_rate
+        self._lock = Lock()
+        self._reset()
+
+    def _reset(self):
+        self._digests = set()
+        self._bloom = None
+        self.count = 0
+        self.negatives = 0
+        self.possible_positives = 0
+
+    @property
+    def mode(self):
+        return 'bloom' if self._bloom is not None else 'set'
+
+    def load(self, links):
+        """İndeksi verilen linklerle baştan kurar."""
+        links = list(links)
+        with self._lock:
+            self._reset()
+            if len(links) > self.max_set_items:
+                # Büyüme payı bırak; kapasite aşılınca needs_rebuild() True döner
+                self._bloom = BloomFilter(len(links) * 2, self.bloom_error_rate)
+            for link in links:
+                self._add_locked(link)
+
+    def _add_locked(self, link):
+        digest = link_digest(link)
+        if self._bloom is not None:
+            self._bloom.add(digest)
+            self.count += 1
+            return
+        short = digest[:8]
+        if short in self._digests:
+            return
+        self._digests.add(short)
+        self.count += 1
+
+    def add(self, link):
+        with self._lock:
+            self._add_locked(link)
+
+    def needs_rebuild(self):
+        """Küme sınırı ya da Bloom kapasitesi aşıldıysa True döner.
+
+        Küme yalnızca kısa özetleri tuttuğu için Bloom'a yerinde taşınamaz;
+        çağıran taraf load() ile veritabanından yeniden kurmalıdır.
+        """
+        with self._lock:
+            if self._bloom is None:
+                return self.count > self.max_set_items
+            return self.count > self._bloom.capacity
+
+    def might_contain(self, link):
+        digest = link_digest(link)
+        with self._lock:
+            if self._bloom is not None:
+                found = digest in self._bloom
+            else:
+                found = digest[:8] in self._digests
+            if found:
+                self.possible_positives += 1
+            else:
+                self.negatives += 1
+            return found
+
+    def memory_bytes(self):
+        with self._lock:
+            if self._bloom is not None:
+                return self._bloom.memory_bytes()
+            # Küme tablosu + her özet için bytes nesnesi
+            return sys.getsizeof(self._digests) + self.count * sys.getsizeof(
+                b'12345678')
+
+    def stats(self):
+        memory = self.memory_bytes()
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "items": self.count,
+                "memory_bytes": memory,
+                "negatives_in_memory": self.negatives,
+                "possible_positives": self.possible_positives,
+            }
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Makale sayfalarının sadece <head> kısmını okuyup meta tag'leri çıkarır."""
+
+import re
+from html.parser import HTMLParser
+
+_HEAD_END_RE = re.compile(rb'</head\s*>|<body[\s>]', re.IGNORECASE)
+
+
+def read_until_head_end(chunks, max_bytes):
+    """Parça parça gelen yanıtı </head> (veya <body>) görülene kadar okur.
+
+    (okunan_baytlar, head_sonu_bulundu_mu) döner. max_bytes aşılırsa okuma
+    durur. `chunks` bir iterator olmalı; çağıran taraf kalan gövdeyi aynı
+    iterator'dan okumaya devam edebilir.
+    """
+    buffer = bytearray()
+    for chunk in chunks:
+        if not chunk:
+            continue
+        search_from = max(0, len(buffer) - 16)  # Parça sınırına denk gelen tag
+        buffer.extend(chunk)
+        if _HEAD_END_RE.search(buffer, search_from):
+            return bytes(buffer), True
+        if len(buffer) >= max_bytes:
+            break
+    return bytes(buffer), False
+
+
+class HeadMetaParser(HTMLParser):
+    """<meta> tag'lerinin özniteliklerini toplayan hafif ayrıştırıcı."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta_tags = []
+        self._done = False
+
+    def handle_starttag(self, tag, attrs):
+        if self._done:
+            return
+        if tag == 'meta':
+            self.meta_tags.append({k: v for k, v in attrs if v is not None})
+        elif tag == 'body':
+            self._done = True
+
+    def find(self, attrs):
+        """BeautifulSoup'taki find('meta', attrs=...) ile aynı eşleşme."""
+        for meta in self.meta_tags:
+            if all(meta.get(k) == v for k, v in attrs.items()):
+                return meta
+        return None
+
+
+def parse_head_meta(html_text):
+    parser = HeadMetaParser()
+    try:
+        parser.feed(html_text)
+        parser.close()
+    except Exception:
+        pass  # Bozuk HTML: o ana kadar toplanan tag'lerle devam et
+    return parser
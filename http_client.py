@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Tüm dış HTTP istekleri için ortak, bağlantı havuzlu requests.Session."""
+
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+DEFAULT_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept-Language': 'en-US,en;q=0.9,tr;q=0.8',
+}
+HTML_ACCEPT = 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8'
+
+
+def build_session(pool_connections=10,
+                  pool_maxsize=20,
+                  max_retries=3,
+                  backoff_factor=0.5):
+    """Host başına bağlantı havuzu ve GET/HEAD için tekrar deneme ayarlı Session.
+
+    pool_connections: havuzu tutulacak farklı host sayısı,
+    pool_maxsize: host başına açık tutulacak en fazla bağlantı.
+    Sadece idempotent istekler (GET/HEAD) bağlantı hatası ve geçici 5xx
+    yanıtlarında üstel beklemeyle tekrar denenir. 429 tekrar denenmez; uzun
+    Retry-After süreleri thread'i bekletmesin.
+    """
+    retry = Retry(total=max_retries,
+                  connect=max_retries,
+                  read=max_retries,
+                  status=max_retries,
+                  backoff_factor=backoff_factor,
+                  status_forcelist=(500, 502, 503, 504),
+                  allowed_methods=frozenset(['GET', 'HEAD']),
+                  raise_on_status=False)  # Son yanıtı raise_for_status değerlendirsin
+    adapter = HTTPAdapter(pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize,
+                          max_retries=retry)
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def read_body(response, deadline, chunk_size=64 * 1024):
+    """stream=True ile açılmış yanıtın gövdesini en geç `deadline`'a kadar okur.
+
+    deadline time.monotonic() cinsindendir. Okuma zaman aşımı her parça
+    için ayrı işlediğinden yavaş akan bir sunucu bağlantıyı süresiz tutabilir;
+    süre dolarsa requests.exceptions.Timeout yükselir.
+    """
+    buffer = bytearray()
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        buffer.extend(chunk)
+        if time.monotonic() > deadline:
+            raise requests.exceptions.Timeout(
+                f"Yanıt süresinde indirilemedi ({len(buffer)} bayt okundu): "
+                f"{response.url}")
+    return bytes(buffer)
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""Kuyruk üzerinden yazan, JSON ya da metin biçimli yapılandırılmış loglama."""
+
+import atexit
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+LOGGER_NAME = 'tweetbot'
+LOG_QUEUE_SIZE = 10000  # Dolarsa yeni kayıtlar beklemeden düşürülür
+
+# LogRecord'un kendi alanları; bunların dışındakiler extra={...} ile gelir
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def get_logger(name):
+    """Botun log ağacındaki (tweetbot.<name>) logger'ı döndürür."""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def record_fields(record):
+    """Kayda extra={...} ile eklenen yapılandırılmış alanlar."""
+    return {
+        key: value
+        for key, value in record.__dict__.items()
+        if key not in _RECORD_ATTRS and not key.startswith('_')
+    }
+
+
+class JsonFormatter(logging.Formatter):
+    """Her kaydı tek satırlık bir JSON nesnesine çevirir.
+
+    Sabit alanlar (time, level, logger, message, thread) ile kayda eklenen
+    source, link, stage, duration gibi alanlar üst düzeyde yer alır; hata
+    kayıtlarında traceback "exc" alanındadır.
+    """
+
+    def format(self, record):
+        data = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc)
+            .isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        data.update(record_fields(record))
+        if record.exc_info:
+            data['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data['exc'] = record.exc_text
+        if record.stack_info:
+            data['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Kuyruk doluysa çağıran thread'i bekletmek yerine kaydı düşürür.
+
+    Mesaj biçimlendirme (ve traceback metni) yazıcı thread'inde yapılır;
+    log çağrısı sadece kaydı kuyruğa koyar.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _QueueListener(QueueListener):
+
+    def enqueue_sentinel(self):
+        # Kuyruk doluysa yazıcı thread'i yer açana kadar bekle; kayıt düşmesin
+        self.queue.put(self._sentinel)
+
+
+class LogConfig:
+    """setup_logging'in kurduğu kuyruk, dinleyici ve ayarlar."""
+
+    def __init__(self, level, fmt, handler, listener):
+        self.level = level
+        self.fmt = fmt
+        self.handler = handler
+        self.listener = listener
+
+    def stats(self):
+        return {
+            "level": logging.getLevelName(self.level),
+            "format": self.fmt,
+            "queued": self.handler.queue.qsize(),
+            "dropped": self.handler.dropped,
+        }
+
+    def stop(self):
+        """Kuyruktaki kayıtları yazıp dinleyici thread'ini durdurur."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+
+def setup_logging(level='INFO', fmt='json', stream=None,
+                  queue_size=LOG_QUEUE_SIZE):
+    """Bot logger'ını kuyruk + arka plan yazıcı thread'iyle yapılandırır.
+
+    level botun kendi logger'ları için geçerlidir; kütüphaneler WARNING ve
+    üstünü yazar. fmt 'json' (log toplayıcılar için) ya da 'text' olabilir.
+    Çıkışta kuyrukta kalan kayıtlar yazılır.
+    """
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+    if fmt == 'text':
+        formatter = logging.Formatter(
+            '%(asctime)s %(levelname)s %(message)s', '%Y-%m-%d %H:%M:%S')
+    else:
+        fmt = 'json'
+        formatter = JsonFormatter()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(formatter)
+    handler = _DroppingQueueHandler(queue.Queue(queue_size))
+    listener = _QueueListener(handler.queue, output)
+    listener.start()
+
+    root = logging.getLogger()
+    root.setLevel(logging.WARNING)
+    root.handlers[:] = [handler]
+    logging.getLogger(LOGGER_NAME).setLevel(level)
+
+    config = LogConfig(level, fmt, handler, listener)
+    atexit.register(config.stop)
+    return config
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from flask import Flask
+from flask import Flask, Response
+import atexit
+import io
 import os
 import re
 import random
@@ -12,102 +14,247 @@ import feedparser
 import tweepy
 from dotenv import load_dotenv
 from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
 import sqlite3
 import requests
 from bs4 import BeautifulSoup
 from unidecode import unidecode
-import traceback
+from functools import lru_cache, partial
 from urllib.parse import urljoin  # Görsel URL'leri için
+from accounts import TwitterAccount, parse_account_specs
+from candidates import CandidateQueue
+from dedup_index import SeenIndex
+from html_head import parse_head_meta, read_until_head_end
+from http_client import HTML_ACCEPT, build_session, read_body
+from logs import get_logger, setup_logging
+from media import ImageTooLargeError, MediaCache, prepare_image
+from metrics import MetricsRegistry
+from polling import AdaptivePoller
+from prefetch import Prefetcher
+from rate_limit import RateGovernor
+from scheduler import Scheduler
+from similarity import TitleIndex
+from sources import SourceRegistry
+from storage import DEFAULT_ACCOUNT, Database
+from translation_cache import TranslationCache, TranslatorPool
+from tweet_text import compose_tweet
 
 # Flask uygulamasını başlat
 app = Flask(__name__)
 load_dotenv()
 
+# Loglar kuyruğa yazılır, ayrı bir thread stdout'a basar. LOG_FORMAT=json
+# (varsayılan) log toplayıcılar için satır başına bir JSON kaydı, text ise
+# okunabilir çıktı üretir. DEBUG kayıtları kapalıyken biçimlendirilmez.
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')
+log_config = setup_logging(LOG_LEVEL, LOG_FORMAT)
+log = get_logger('main')
+
+# İzleme: aşama süreleri ve sayaçlar /metrics'te Prometheus biçiminde sunulur
+metrics = MetricsRegistry()
+STAGE_SECONDS = metrics.histogram('tweetbot_stage_seconds',
+                                  'Hat aşamalarının süresi (sn)', ['stage'])
+FEED_FETCH_SECONDS = metrics.histogram('tweetbot_feed_fetch_seconds',
+                                       'Kaynak başına RSS indirme süresi (sn)',
+                                       ['source'])
+SKIPS = metrics.counter('tweetbot_skips_total',
+                        'Atlanan haber ve istek sayısı', ['reason'])
+ERRORS = metrics.counter('tweetbot_errors_total', 'Aşama başına hata sayısı',
+                         ['stage'])
+TWEETS = metrics.counter('tweetbot_tweets_total', 'Hesap başına tweet denemeleri',
+                         ['account', 'result'])
+SCHEDULED_WAIT_SECONDS = metrics.histogram(
+    'tweetbot_scheduled_wait_seconds',
+    'İşlerin bir sonraki çalışmaya kadar bekleme süresi (sn)', ['job', 'reason'],
+    buckets=(60, 300, 600, 1800, 3600, 7200, 14400, 43200, 86400))
+
 # --- KONFİGÜRASYON ---
-# Twitter API v2 (Tweet atmak için)
-try:
-    client = tweepy.Client(
-        consumer_key=os.getenv('CONSUMER_KEY'),
-        consumer_secret=os.getenv('CONSUMER_SECRET'),
-        access_token=os.getenv('ACCESS_TOKEN'),
-        access_token_secret=os.getenv('ACCESS_TOKEN_SECRET'),
-        wait_on_rate_limit=True)
-    print("✅ Twitter API v2 başarıyla yapılandırıldı")
-except Exception as e:
-    print(f"❌ Twitter API v2 hatası: {str(e)}")
-    client = None
+PRIMARY_ACCOUNT_LANG = 'tr'  # Ortam değişkenlerindeki ana hesabın dili
+# Ek dil hesapları (fan-out): "ad:dil" çiftleri, ör. "en:en,de:de". Haberler bir
+# kez çekilir, her hesabın diline çevrilip o hesaptan paylaşılır. Hesabın
+# anahtarları EN_CONSUMER_KEY, EN_CONSUMER_SECRET, EN_ACCESS_TOKEN,
+# EN_ACCESS_TOKEN_SECRET gibi AD_ önekli değişkenlerden okunur.
+FANOUT_ACCOUNTS = os.getenv('FANOUT_ACCOUNTS', '')
+
+
+def create_twitter_clients(env_prefix='', label='ana hesap'):
+    """Önekli ortam değişkenlerinden (API v2 istemcisi, API v1.1) çifti kurar."""
+    keys = [
+        os.getenv(f'{env_prefix}{key}')
+        for key in ('CONSUMER_KEY', 'CONSUMER_SECRET', 'ACCESS_TOKEN',
+                    'ACCESS_TOKEN_SECRET')
+    ]
+    # Twitter API v2 (Tweet atmak için)
+    try:
+        client = tweepy.Client(
+            consumer_key=keys[0],
+            consumer_secret=keys[1],
+            access_token=keys[2],
+            access_token_secret=keys[3],
+            wait_on_rate_limit=False)  # Limitleri rate_governor planlar, thread bloklanmaz
+        log.info("✅ Twitter API v2 başarıyla yapılandırıldı (%s)", label)
+    except Exception as e:
+        log.error("❌ Twitter API v2 hatası (%s): %s", label, e)
+        client = None
 
-# Twitter API v1.1 (Medya yüklemek için)
+    # Twitter API v1.1 (Medya yüklemek için)
+    try:
+        auth = tweepy.OAuth1UserHandler(*keys)
+        api_v1 = tweepy.API(auth)
+        log.info("✅ Twitter API v1.1 (medya için) başarıyla yapılandırıldı (%s)",
+                 label)
+    except Exception as e:
+        log.error("❌ Twitter API v1.1 hatası (%s): %s", label, e)
+        api_v1 = None
+    return client, api_v1
+
+
+accounts = [
+    TwitterAccount(DEFAULT_ACCOUNT, PRIMARY_ACCOUNT_LANG,
+                   *create_twitter_clients())
+]
+for _name, _lang in parse_account_specs(FANOUT_ACCOUNTS):
+    if _name == DEFAULT_ACCOUNT or any(a.name == _name for a in accounts):
+        log.warning("⚠️ Hesap adı tekrar ediyor, atlanıyor: %s", _name)
+        continue
+    accounts.append(
+        TwitterAccount(_name, _lang,
+                       *create_twitter_clients(f"{_name.upper()}_", _name)))
+
+# Haber kaynakları: feed URL'si, entry limiti, yoklama aralığı, görsel seçicileri
+# ve istek başlıkları bu dosyadan okunur; dosya değişince bot durmadan
+# yeniden yüklenir.
+SOURCES_PATH = os.getenv('SOURCES_FILE', 'sources.json')
+SOURCES_RELOAD_INTERVAL = 60  # Kaynak dosyasının değişikliğe bakılma sıklığı (sn)
+source_registry = SourceRegistry(SOURCES_PATH)
 try:
-    auth = tweepy.OAuth1UserHandler(os.getenv('CONSUMER_KEY'),
-                                    os.getenv('CONSUMER_SECRET'),
-                                    os.getenv('ACCESS_TOKEN'),
-                                    os.getenv('ACCESS_TOKEN_SECRET'))
-    api_v1 = tweepy.API(auth)
-    print("✅ Twitter API v1.1 (medya için) başarıyla yapılandırıldı")
+    source_registry.load()
+    log.info("✅ %d haber kaynağı yüklendi (%s)", len(source_registry),
+             SOURCES_PATH)
 except Exception as e:
-    print(f"❌ Twitter API v1.1 hatası: {str(e)}")
-    api_v1 = None
+    log.error("❌ Haber kaynakları yüklenemedi (%s): %s", SOURCES_PATH, e)
+
+# Ortak HTTP oturumu (host başına bağlantı havuzu + GET tekrar denemeleri)
+HTTP_POOL_CONNECTIONS = 10  # Havuzu tutulacak farklı host sayısı
+HTTP_POOL_MAXSIZE = 20  # Host başına en fazla açık bağlantı
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+http_session = build_session(pool_connections=HTTP_POOL_CONNECTIONS,
+                             pool_maxsize=HTTP_POOL_MAXSIZE,
+                             max_retries=HTTP_MAX_RETRIES,
+                             backoff_factor=HTTP_BACKOFF_FACTOR)
+# RSS istekleri tekrar denenmez: başarısız yoklamayı AdaptivePoller zaten
+# yeniden zamanlar; tekrar denemeler yanıt başlıklarından önceki beklemeyi
+# FEED_DEADLINE'ın dışında katlardı
+feed_session = build_session(pool_connections=HTTP_POOL_CONNECTIONS,
+                             pool_maxsize=HTTP_POOL_MAXSIZE,
+                             max_retries=0)
 
 # Veritabanı
 DB_PATH = 'tweets.db'  # Render için: os.path.join(os.environ.get('RENDER_DISK_MOUNT_PATH', '.'), 'tweets.db')
+SEEN_INDEX_MAX_SET_ITEMS = 500_000  # Bu sayının üstünde Bloom filtresine geçilir
+# Thread başına uzun ömürlü bağlantı, WAL modu; tekrar kontrolü önce bellekte
+db = Database(DB_PATH,
+              seen_index=SeenIndex(max_set_items=SEEN_INDEX_MAX_SET_ITEMS))
 
 
 def init_db():
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute('''CREATE TABLE IF NOT EXISTS tweets
-                    (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    link TEXT UNIQUE NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
-        conn.commit()
-        conn.close()
-        print(f"✅ Veritabanı ({DB_PATH}) başarıyla kuruldu/kontrol edildi")
+        db.init_schema()
+        db.load_seen_index()
+        log.info("✅ Veritabanı (%s) başarıyla kuruldu/kontrol edildi", DB_PATH)
     except Exception as e:
-        print(f"❌ Veritabanı hatası: {str(e)}")
+        log.error("❌ Veritabanı hatası: %s", e)
 
 
 init_db()
 
+# Farklı kaynaklardan gelen aynı haberi yakalamak için başlık benzerliği
+NEAR_DUP_THRESHOLD = 0.6  # Jaccard benzerliği bu değeri geçerse haber atlanır
+NEAR_DUP_WINDOW = 3 * 24 * 60 * 60  # Karşılaştırılacak son paylaşımların süresi
+for account in accounts:
+    account.title_index = TitleIndex(threshold=NEAR_DUP_THRESHOLD,
+                                     window=NEAR_DUP_WINDOW)
+    try:
+        account.title_index.load(
+            db.recent_titles(NEAR_DUP_WINDOW, account.name))
+    except Exception as e:
+        log.error("❌ Başlık benzerlik indeksi kurulamadı (%s): %s",
+                  account.name, e)
+
+# Twitter hız limitleri: {uç_nokta: {pencere: (limit, süre_sn, burst)}}
+# Varsayılanlar ücretsiz API planına göre; hesabın planına göre ayarlayın.
+TWITTER_RATE_LIMITS = {
+    'tweet_create': {
+        '15m': (10, 15 * 60, 2),
+        '24h': (17, 24 * 60 * 60, 2),
+    },
+    'media_upload': {
+        '15m': (30, 15 * 60, 5),
+        '24h': (100, 24 * 60 * 60, 5),
+    },
+}
+# 429 yanıtında x-rate-limit-reset başlığı yoksa 15 dakikalık pencere bu
+# kadar süre kilitlenir
+RATE_LIMIT_FALLBACK_WAIT = 15 * 60
+for account in accounts:
+    # Ana hesabın kayıtları eski anahtarlarla (önek olmadan) kalır
+    account.rate_governor = RateGovernor(
+        db,
+        TWITTER_RATE_LIMITS,
+        namespace='' if account.name == DEFAULT_ACCOUNT else account.name)
+    for _twitter_api in (account.client, account.api_v1):
+        if _twitter_api is not None:
+            account.rate_governor.attach(_twitter_api.session)  # x-rate-limit-* başlıklarını izle
+
+# Çeviri önbelleği (SQLite + bellek içi LRU)
+TRANSLATION_CACHE_MAX_ITEMS = 2000  # Bellekte tutulacak en fazla çeviri
+TRANSLATION_CACHE_MAX_ROWS = 20000  # Veritabanında tutulacak en fazla çeviri
+TRANSLATION_CACHE_TTL = 7 * 24 * 60 * 60  # 7 gün
+translation_cache = TranslationCache(db,
+                                     max_memory_items=TRANSLATION_CACHE_MAX_ITEMS,
+                                     max_db_rows=TRANSLATION_CACHE_MAX_ROWS,
+                                     ttl_seconds=TRANSLATION_CACHE_TTL)
+translation_cache.prune()
+
 
 # --- YARDIMCI FONKSİYONLAR ---
+# clean_title_text için önceden derlenmiş tablolar
+# Tipografik tırnak/tire ve üç nokta karakterleri tek str.translate geçişinde
+# ASCII karşılıklarına çevrilir.
+_TITLE_CHAR_MAP = str.maketrans({
+    "–": "-",
+    "—": "-",
+    "‘": "'",
+    "’": "'",
+    "“": '"',
+    "”": '"',
+    "…": "...",
+})
+_TITLE_UNWANTED_RE = re.compile(r'[^\w\s.,!?$%&\'():/\-]')
+CLEAN_TITLE_CACHE_SIZE = 4096  # Aynı başlıklar her yoklamada tekrar geliyor
+
+
 def clean_title_text(text_input):
     """Metni temizle: HTML entity'leri ve özel karakterleri kaldır.
     Bu fonksiyon özellikle başlıkları temizlemek için daha agresif olabilir.
     """
     if not text_input or not isinstance(text_input, str):
         return ""
+    return _clean_title_cached(text_input)
 
-    text = text_input
-
-    # 1. Temel HTML entity'leri
-    replacements = {
-        " ": " ",
-        "&": "&",
-        "\"": '"',
-        "'": "'",
-        "'": "'",
-        "<": "<",
-        ">": ">",
-        "«": "«",
-        "»": "»",
-        "–": "-",
-        "—": "—",
-        "‘": "'",
-        "’": "'",
-        "“": '"',
-        "”": '"',
-        "…": "...",
-    }
-    for entity, char in replacements.items():
-        text = text.replace(entity, char)
 
-    # 2. Unicode kıvrımlı tırnakları ve diğerlerini düzelt
-    text = re.sub(r'[“”]', '"', text)
-    text = re.sub(r'[‘’]', "'", text)
-    text = re.sub(r'[–—]', "-", text)  # En dash, em dash
+@lru_cache(maxsize=CLEAN_TITLE_CACHE_SIZE)
+def _clean_title_cached(text):
+    # Süre sadece önbellek ıskalarında ölçülür; isabetler lru_cache'ten sayılır
+    with STAGE_SECONDS.time(stage='clean'):
+        return _clean_title(text)
+
+
+def _clean_title(text):
+    # 1-2. Tırnak, tire ve üç nokta karakterlerini tek geçişte düzelt
+    text = text.translate(_TITLE_CHAR_MAP)
 
     # 3. Unidecode (dikkatli kullanılmalı, çeviriyi etkileyebilir)
     try:
@@ -118,103 +265,219 @@ def clean_title_text(text_input):
                            ) / 2:  # Eğer yarısından fazlası ? değilse kullan
             text = text_unidecoded
     except Exception as e:
-        print(f"⚠️ Unidecode hatası: {e} - Metin: {text[:50]}")
-        pass  # Unidecode başarısız olursa orijinal metinle devam et
+        # Unidecode başarısız olursa orijinal metinle devam et
+        log.warning("⚠️ Unidecode hatası: %s - Metin: %s", e, text[:50])
 
     # 4. Kalan istenmeyen karakterleri temizle (çeviriye uygun hale getirme)
-    text = re.sub(r'[^\w\s.,!?$%&\'():/\-]', ' ',
-                  text)  # Ek olarak / ve - karakterlerine izin verildi.
+    text = _TITLE_UNWANTED_RE.sub(' ', text)  # Ek olarak / ve - karakterlerine izin verildi.
 
     # 5. Fazla boşlukları ve satır başı/sonu boşluklarını temizle
-    text = ' '.join(text.split())
-    return text.strip()
+    return ' '.join(text.split())
 
 
-def translate_text_robust(text_to_translate, target_lang='tr'):
-     # <<< HATA DÜZELTİLDİ: ''' yerine """ kullanıldı
-    if not text_to_translate or not isinstance(text_to_translate, str):
-        return ""  # Boş veya string olmayan girdi için boş döndür
+# Yoklama işleri paralel çalışır; her thread kendi GoogleTranslator örneğini kullanır
+translators = TranslatorPool(
+    lambda target_lang: GoogleTranslator(source='auto', target=target_lang))
 
-    cleaned_text = clean_title_text(text_to_translate)  # Önce temizle
-    if not cleaned_text:  # Temizleme sonrası boşsa
-        return ""
 
+def get_translator(target_lang):
+    return translators.get(target_lang)
+
+
+def _translate_uncached(cleaned_text, target_lang):
     try:
         # GoogleTranslator API'sinin karakter limiti olabilir, 4500 makul bir üst sınır.
-        translated = GoogleTranslator(
-            source='auto', target=target_lang).translate(cleaned_text[:4500])
-        return translated if translated and isinstance(translated,
-                                                       str) else cleaned_text
+        with STAGE_SECONDS.time(stage='translate'):
+            translated = get_translator(target_lang).translate(cleaned_text[:4500])
+        if translated and isinstance(translated, str):
+            translation_cache.put(cleaned_text, target_lang, translated)
+            return translated
+        return cleaned_text
     except Exception as e:
-        print(
-            f"❌ Çeviri hatası ({target_lang}): {str(e)} - Orijinal (temizlenmiş): {cleaned_text[:100]}"
-        )
+        ERRORS.inc(stage='translate')
+        log.error("❌ Çeviri hatası (%s): %s - Orijinal (temizlenmiş): %s",
+                  target_lang, e, cleaned_text[:100],
+                  extra={'stage': 'translate'})
         return cleaned_text  # Hata durumunda temizlenmiş orijinal metni döndür
 
 
+TRANSLATION_CHAR_LIMIT = 4500  # Tek istekte gönderilecek en fazla karakter
+# Temizlenmiş başlıklar satır sonu içermez, bu yüzden satır sonu güvenli bir ayraç
+TRANSLATION_BATCH_DELIMITER = "\n"
+
+
+def _pack_translation_batches(texts):
+    """Metinleri ayraçla birleştirildiğinde karakter limitini aşmayacak gruplara böler."""
+    batches = []
+    current = []
+    current_len = 0
+    for text in texts:
+        extra = len(text) + (len(TRANSLATION_BATCH_DELIMITER) if current else 0)
+        if current and current_len + extra > TRANSLATION_CHAR_LIMIT:
+            batches.append(current)
+            current = []
+            current_len = 0
+            extra = len(text)
+        current.append(text)
+        current_len += extra
+    if current:
+        batches.append(current)
+    return batches
+
+
+def translate_batch(texts_to_translate, target_lang='tr'):
+    """Birden fazla metni mümkün olan en az istekle çevirir.
+
+    Botun tek çeviri yoludur. Sonuçlar girdi sırasıyla döner; boş girdi ""
+    olur, çevrilemeyen metin temizlenmiş haliyle döner. Ayraç çeviri
+    sırasında bozulursa ilgili grup tek tek çevrilir.
+    """
+    results = [""] * len(texts_to_translate)
+    pending = {}  # temizlenmiş metin -> sonuç indeksleri
+    for index, text in enumerate(texts_to_translate):
+        if not text or not isinstance(text, str):
+            continue
+        cleaned_text = clean_title_text(text)[:TRANSLATION_CHAR_LIMIT]
+        if not cleaned_text:
+            continue
+        cached = translation_cache.get(cleaned_text, target_lang)
+        if cached is not None:
+            results[index] = cached
+        else:
+            pending.setdefault(cleaned_text, []).append(index)
+
+    for batch in _pack_translation_batches(list(pending)):
+        translations = None
+        if len(batch) > 1:
+            try:
+                with STAGE_SECONDS.time(stage='translate'):
+                    translated = get_translator(target_lang).translate(
+                        TRANSLATION_BATCH_DELIMITER.join(batch))
+                if translated and isinstance(translated, str):
+                    parts = [
+                        part.strip()
+                        for part in translated.split(TRANSLATION_BATCH_DELIMITER)
+                    ]
+                    if len(parts) == len(batch) and all(parts):
+                        translations = parts
+                if translations is None:
+                    log.warning(
+                        "⚠️ Toplu çeviride ayraç bozuldu (%s, %d metin). Tek tek çevrilecek.",
+                        target_lang, len(batch), extra={'stage': 'translate'})
+            except Exception as e:
+                ERRORS.inc(stage='translate')
+                log.error(
+                    "❌ Toplu çeviri hatası (%s, %d metin): %s. Tek tek çevrilecek.",
+                    target_lang, len(batch), e, extra={'stage': 'translate'})
+
+        if translations is None:
+            translations = [
+                _translate_uncached(text, target_lang) for text in batch
+            ]
+        else:
+            for text, translated in zip(batch, translations):
+                translation_cache.put(text, target_lang, translated)
+
+        for text, translated in zip(batch, translations):
+            for index in pending[text]:
+                results[index] = translated
+    return results
+
+
+ARTICLE_HEAD_MAX_BYTES = 256 * 1024  # <head> bulunamazsa okunacak en fazla bayt
+ARTICLE_MAX_BYTES = 3 * 1024 * 1024  # Tam sayfa ayrıştırması için üst sınır
+
+# Öncelikli meta tag'ler
+IMAGE_META_SELECTORS = [
+    {
+        'property': 'og:image:secure_url'
+    },
+    {
+        'property': 'og:image'
+    },
+    {
+        'name': 'twitter:image:src'
+    },  # Bazen :src eklenir
+    {
+        'name': 'twitter:image'
+    },
+    {
+        'itemprop': 'image'
+    }
+]
+
+
+def _decode_html(raw, encoding):
+    return raw.decode(encoding or 'utf-8', errors='replace')
+
+
+def _is_transient_http_error(error):
+    """Tekrar denenince düzelebilecek hata mı: bağlantı, zaman aşımı, 5xx, 408/429.
+
+    SSL sertifika sorunları ve diğer 4xx yanıtları kalıcı sayılır.
+    """
+    if isinstance(error, requests.exceptions.SSLError):
+        return False
+    if isinstance(error, requests.exceptions.HTTPError):
+        status = error.response.status_code if error.response is not None else 0
+        return status >= 500 or status in (408, 429)
+    return isinstance(error, requests.exceptions.RequestException)
+
+
 def get_article_image(url):
-    try:
-        headers = {
-            'User-Agent':
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept':
-            'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9,tr;q=0.8',
-        }
-        response = requests.get(url,
-                                headers=headers,
-                                timeout=20,
-                                allow_redirects=True)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
+    with STAGE_SECONDS.time(stage='article_scrape'):
+        return _find_article_image(url)
 
-        # Öncelikli meta tag'ler
-        selectors = [
-            {
-                'property': 'og:image:secure_url'
-            },
-            {
-                'property': 'og:image'
-            },
-            {
-                'name': 'twitter:image:src'
-            },  # Bazen :src eklenir
-            {
-                'name': 'twitter:image'
-            },
-            {
-                'itemprop': 'image'
-            }
-        ]
-        for sel_attrs in selectors:
+
+def _find_article_image(url):
+    """Makale görselinin URL'sini bulur.
+
+    Sayfa parça parça okunur ve </head> görülünce durulur; og:image /
+    twitter:image meta tag'leri hafif bir ayrıştırıcıyla çıkarılır. Sadece
+    meta tag bulunamazsa ve kaynağa özel img seçicileri varsa sayfanın kalanı
+    (ARTICLE_MAX_BYTES'a kadar) okunup BeautifulSoup ile ayrıştırılır.
+    Geçici ağ/sunucu hataları yükseltilir; "görsel yok" sonucu önbelleğe
+    girerken bunlar girmez.
+    """
+    try:
+        with http_session.get(url,
+                              headers={'Accept': HTML_ACCEPT},
+                              timeout=20,
+                              allow_redirects=True,
+                              stream=True) as response:
+            response.raise_for_status()
+            chunks = response.iter_content(chunk_size=16 * 1024)
+            head_raw, _ = read_until_head_end(chunks, ARTICLE_HEAD_MAX_BYTES)
+            head_meta = parse_head_meta(_decode_html(head_raw,
+                                                     response.encoding))
+
+            for sel_attrs in IMAGE_META_SELECTORS:
+                tag = head_meta.find(sel_attrs)
+                if tag and tag.get('content') and tag['content'].strip():
+                    img_url = tag['content'].strip()
+                    return urljoin(url, img_url)  # Göreceli URL'leri düzelt
+
+            # Kaynağa özel img tag seçicileri (sources.json)
+            img_tag_selectors = source_registry.image_selectors_for(url)
+            if not img_tag_selectors:
+                return None
+
+            # Yedek: sayfanın kalanını okuyup tam ayrıştırma yap
+            body_raw = bytearray(head_raw)
+            for chunk in chunks:
+                body_raw.extend(chunk)
+                if len(body_raw) >= ARTICLE_MAX_BYTES:
+                    break
+            soup = BeautifulSoup(_decode_html(bytes(body_raw),
+                                              response.encoding),
+                                 'html.parser')
+
+        # <body> içindeki meta tag'ler (ör. itemprop=image) de kontrol edilsin
+        for sel_attrs in IMAGE_META_SELECTORS:
             tag = soup.find('meta', attrs=sel_attrs)
             if tag and tag.get('content') and tag['content'].strip():
                 img_url = tag['content'].strip()
-                return urljoin(url, img_url)  # Göreceli URL'leri düzelt
-
-        # Kaynağa özel img tag seçicileri
-        img_tag_selectors = []
-        if "cointelegraph.com" in url:
-            img_tag_selectors.extend([
-                {
-                    'class_': 'post-cover__image'
-                },
-                {
-                    'class_': 'article__header-image'
-                }  # Cointelegraph yeni class
-            ])
-        elif "coindesk.com" in url:
-            img_tag_selectors.extend([
-                {
-                    'class_': ['hero__image-img', 'Box-sc-1hpkeeg-0']
-                },  # Coindesk yeni class'lar
-                {
-                    'class_': 'magnifier-image'
-                },
-                {
-                    'class_': 'wp-post-image'
-                }  # Wordpress genel
-            ])
+                return urljoin(url, img_url)
 
         for sel_attrs in img_tag_selectors:
             tag = soup.find('img', attrs=sel_attrs)
@@ -224,141 +487,253 @@ def get_article_image(url):
                     return urljoin(url, img_url)
         return None
     except requests.exceptions.RequestException as e:
-        print(f"❌ Görsel çekme (request) hatası ({url}): {str(e)}")
+        ERRORS.inc(stage='article_scrape')
+        log.error("❌ Görsel çekme (request) hatası (%s): %s", url, e,
+                  extra={'stage': 'article_scrape', 'link': url})
+        if _is_transient_http_error(e):
+            raise
     except Exception as e:
-        print(f"❌ Görsel çekme (parsing) hatası ({url}): {str(e)}")
+        ERRORS.inc(stage='article_scrape')
+        log.error("❌ Görsel çekme (parsing) hatası (%s): %s", url, e,
+                  extra={'stage': 'article_scrape', 'link': url})
     return None
 
 
 # --- ÇEKİRDEK FONKSİYONLAR ---
-def get_latest_news():
-    sources = {
-        "CoinDesk": "https://www.coindesk.com/arc/outboundfeeds/rss/",
-        "Cointelegraph": "https://cointelegraph.com/rss",
-    }
-    all_news = []
-    for name, url in sources.items():
-        try:
-            print(f"🔍 {name} kaynağından haberler çekiliyor ({url})...")
-            feed = feedparser.parse(
-                url,
-                agent=
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            )
-
-            if feed.bozo:
-                bozo_exception_str = "Bilinmeyen RSS ayrıştırma sorunu"
-                if hasattr(feed, 'bozo_exception') and feed.bozo_exception:
-                    try:
-                        bozo_exception_str = repr(feed.bozo_exception)
-                    except Exception:
-                        bozo_exception_str = f"Bozo exception (repr alınamadı): {type(feed.bozo_exception).__name__}"
-                print(
-                    f"⚠️ {name} RSS'i 'bozo' olarak işaretlendi: {bozo_exception_str}. Entry'ler yine de kontrol edilecek."
-                )
-
-            if not feed.entries:
-                print(
-                    f"ℹ️ {name} kaynağından hiç entry (haber başlığı) bulunamadı."
-                )
-                continue
+FEED_TIMEOUT = 20  # Kaynak başına bağlantı/okuma zaman aşımı (saniye)
+FEED_DEADLINE = 60  # Tek bir feed'in indirilmesi için toplam süre (saniye)
 
-            print(f"ℹ️ {name} için {len(feed.entries)} entry bulundu.")
-
-            for i, entry in enumerate(feed.entries[:7]):
-                if not (hasattr(entry, 'title') and entry.title and isinstance(
-                        entry.title, str) and hasattr(entry, 'link')
-                        and entry.link and isinstance(entry.link, str)):
-                    print(
-                        f"⏩ {name} kaynağından eksik veya geçersiz tipte bilgi içeren haber atlanıyor (Entry index: {i})."
-                    )
-                    continue
-
-                # Başlık temizleme ve çeviri
-                original_title = clean_title_text(entry.title)
-                if not original_title:
-                    print(
-                        f"⏩ {name} kaynağından başlık temizleme sonrası boş kaldı (Entry index: {i})."
-                    )
-                    continue
-
-                translated_title = translate_text_robust(original_title)
-                if not translated_title:
-                    print(
-                        f"⏩ {name} kaynağından çeviri sonrası başlık boş kaldı, orijinal temizlenmiş başlık kullanılacak (Entry index: {i})."
-                    )
-                    translated_title = original_title
-
-                link_to_use = entry.link.split('?')[0].strip()
-
-                published_time = None
-                if hasattr(entry,
-                           'published_parsed') and entry.published_parsed:
-                    published_time = datetime.fromtimestamp(time.mktime(
-                        entry.published_parsed),
-                                                            tz=timezone.utc)
-                elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                    published_time = datetime.fromtimestamp(time.mktime(
-                        entry.updated_parsed),
-                                                            tz=timezone.utc)
-                else:
-                    published_time = datetime.now(timezone.utc)
-
-                all_news.append({
-                    'source': name,
-                    'original_title': original_title,
-                    'title': translated_title,
-                    'link': link_to_use,
-                    'published': published_time
-                })
-        except Exception as e:
-            error_type_name = type(e).__name__
-            error_repr = repr(e)
-            print(
-                f"❌ {name} haber çekme hatası (ana try-except). Tip: {error_type_name}, Detaylar (repr): {error_repr}"
-            )
-            print("--- TRACEBACK BAŞLANGICI (get_latest_news) ---")
-            traceback.print_exc()
-            print("--- TRACEBACK SONU (get_latest_news) ---")
-
-    if not all_news:
-        print("ℹ️ Döngü sonunda hiçbir kaynaktan haber çekilemedi.")
-        return None
 
-    all_news.sort(key=lambda x: x['published'], reverse=True)
-    print(f"📰 Toplam {len(all_news)} adet haber işlendi ve sıralandı.")
-    return all_news
+def get_feed_validators(url):
+    try:
+        return db.get_feed_validators(url)
+    except Exception as e:
+        log.error("❌ Veritabanı okuma hatası (get_feed_validators): %s", e)
+        return None, None
 
 
-def is_already_tweeted(link):
+def save_feed_validators(url, etag, last_modified):
+    try:
+        db.save_feed_validators(url, etag, last_modified)
+    except Exception as e:
+        log.error("❌ Veritabanı yazma hatası (save_feed_validators): %s", e)
+
+
+def fetch_feed(source):
+    """Tek bir RSS kaynağını zaman aşımıyla indirip feedparser ile ayrıştırır.
+
+    Önceki yanıtın ETag / Last-Modified değerleriyle koşullu istek atılır;
+    kaynak değişmediyse (304) ayrıştırma yapılmadan None döner. Aksi halde
+    (feed, doğrulayıcılar) döner; doğrulayıcılar değiştiyse (etag,
+    last_modified), değişmediyse None'dır. Çağıran bunları haberleri
+    kaydettikten sonra save_feed_validators ile yazar; haberler işlenmeden
+    yazılırsa kaynak değişene kadar aynı haberlere bir daha bakılmaz. Gövde
+    FEED_DEADLINE içinde inmezse requests Timeout hatası yükselir; yavaş
+    akan bir kaynak yoklama işçisini süresiz tutamaz. İstek tekrar
+    denenmediğinden yanıt başlıkları en geç bağlantı + okuma zaman aşımı
+    kadar beklenir (FEED_DEADLINE'dan kısa).
+    """
+    name, url = source.name, source.url
+    log.debug("🔍 %s kaynağından haberler çekiliyor (%s)...", name, url,
+              extra={'source': name})
+    request_headers = dict(source.headers)  # Kaynağa özel başlıklar
+    etag, last_modified = get_feed_validators(url)
+    if etag:
+        request_headers['If-None-Match'] = etag
+    if last_modified:
+        request_headers['If-Modified-Since'] = last_modified
+
+    deadline = time.monotonic() + FEED_DEADLINE
+    with FEED_FETCH_SECONDS.time(source=name), feed_session.get(
+            url, headers=request_headers, timeout=FEED_TIMEOUT,
+            stream=True) as response:
+        if response.status_code == 304:
+            SKIPS.inc(reason='feed_unchanged')
+            log.debug("♻️ %s değişmemiş (304, önbellek isabeti). Atlanıyor.",
+                      name, extra={'source': name})
+            return None
+        response.raise_for_status()
+        content = read_body(response, deadline)
+    # feedparser başlık anahtarlarını küçük harf bekler
+    response_headers = {k.lower(): v for k, v in response.headers.items()}
+    response_headers.setdefault('content-location', response.url)
+    with STAGE_SECONDS.time(stage='parse'):
+        feed = feedparser.parse(content, response_headers=response_headers)
+
+    validators = (response.headers.get('ETag'),
+                  response.headers.get('Last-Modified'))
+    if validators == (etag, last_modified):
+        validators = None
+    return feed, validators
+
+
+def parse_feed_entries(source, feed):
+    """Ayrıştırılmış bir feed'den çevrilmemiş haber adaylarını üretir."""
+    name = source.name
+    news = []
+    if feed.bozo:
+        log.warning(
+            "⚠️ %s RSS'i 'bozo' olarak işaretlendi: %r. Entry'ler yine de kontrol edilecek.",
+            name, getattr(feed, 'bozo_exception', None)
+            or "Bilinmeyen RSS ayrıştırma sorunu",
+            extra={'source': name, 'stage': 'parse'})
+
+    if not feed.entries:
+        log.info("ℹ️ %s kaynağından hiç entry (haber başlığı) bulunamadı.", name,
+                 extra={'source': name})
+        return news
+
+    log.debug("ℹ️ %s için %d entry bulundu.", name, len(feed.entries),
+              extra={'source': name})
+
+    for i, entry in enumerate(feed.entries[:source.entry_limit]):
+        if not (hasattr(entry, 'title') and entry.title and isinstance(
+                entry.title, str) and hasattr(entry, 'link')
+                and entry.link and isinstance(entry.link, str)):
+            SKIPS.inc(reason='invalid_entry')
+            log.debug(
+                "⏩ %s kaynağından eksik veya geçersiz tipte bilgi içeren haber atlanıyor (Entry index: %d).",
+                name, i, extra={'source': name})
+            continue
+
+        # Başlık temizleme (çeviri, tekrar kontrolünden sonra yapılır)
+        original_title = clean_title_text(entry.title)
+        if not original_title:
+            SKIPS.inc(reason='empty_title')
+            log.debug(
+                "⏩ %s kaynağından başlık temizleme sonrası boş kaldı (Entry index: %d).",
+                name, i, extra={'source': name})
+            continue
+
+        link_to_use = entry.link.split('?')[0].strip()
+
+        published_time = None
+        if hasattr(entry, 'published_parsed') and entry.published_parsed:
+            published_time = datetime.fromtimestamp(time.mktime(
+                entry.published_parsed),
+                                                    tz=timezone.utc)
+        elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+            published_time = datetime.fromtimestamp(time.mktime(
+                entry.updated_parsed),
+                                                    tz=timezone.utc)
+        else:
+            published_time = datetime.now(timezone.utc)
+
+        news.append({
+            'source': name,
+            'original_title': original_title,
+            'link': link_to_use,
+            'published': published_time
+        })
+    return news
+
+
+def filter_untweeted(account, news):
+    """Tekrarlanan ve hesapta tweetlenmiş haberleri tek sorguda eler."""
+    candidates = {}
+    for news_item in news:
+        candidates.setdefault(news_item['link'], news_item)
+    unseen_links = filter_unseen_links(account, list(candidates))
+    skipped_count = len(news) - len(unseen_links)
+    if skipped_count:
+        SKIPS.inc(skipped_count, reason='already_tweeted')
+        log.debug("⏩ %d haber daha önce tweetlendiği için çevrilmeden atlandı.",
+                  skipped_count, extra={'account': account.name})
+    return [candidates[link] for link in unseen_links]
+
+
+def translate_candidates(account, news):
+    """Haber başlıklarını hesabın diline toplu olarak çevirir.
+
+    Aynı haberler birden fazla hesaba gittiği için girdi sözlükleri
+    değiştirilmez; 'title' eklenmiş kopyalar döner.
+    """
+    if not news:
+        return []
+
+    translated_titles = translate_batch(
+        [news_item['original_title'] for news_item in news], account.lang)
+    prepared = []
+    for news_item, translated_title in zip(news, translated_titles):
+        if not translated_title:
+            log.warning(
+                "⏩ %s kaynağından çeviri sonrası başlık boş kaldı, orijinal temizlenmiş başlık kullanılacak (%s).",
+                news_item['source'], news_item['link'],
+                extra={'source': news_item['source'], 'link': news_item['link'],
+                       'account': account.name})
+            translated_title = news_item['original_title']
+        prepared.append(dict(news_item, title=translated_title))
+    return prepared
+
+
+def is_already_tweeted(account, link):
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("SELECT 1 FROM tweets WHERE link=?", (link, ))
-        exists = c.fetchone() is not None
-        conn.close()
-        return exists
+        with STAGE_SECONDS.time(stage='dedup'):
+            return db.is_seen(link, account.name)
     except Exception as e:
-        print(f"❌ Veritabanı okuma hatası (is_already_tweeted): {e}")
+        log.error("❌ Veritabanı okuma hatası (is_already_tweeted): %s", e,
+                  extra={'link': link, 'stage': 'dedup'})
         return True
 
 
-def save_tweeted(title, link):
+def filter_unseen_links(account, links):
+    """Verilen linklerden hesabın paylaşmadıklarını (sırayı koruyarak) döndürür."""
+    try:
+        with STAGE_SECONDS.time(stage='dedup'):
+            return db.filter_unseen(links, account.name)
+    except Exception as e:
+        log.error("❌ Veritabanı okuma hatası (filter_unseen_links): %s", e,
+                  extra={'stage': 'dedup'})
+        return []
+
+
+def find_near_duplicate(account, news_item):
+    """Haber hesapta yakın zamanda paylaşılan bir başlığa çok benziyorsa o linki döndürür."""
+    with STAGE_SECONDS.time(stage='dedup'):
+        match = account.title_index.find_similar(news_item['original_title'],
+                                                 exclude_link=news_item['link'])
+    if match is None:
+        return None
+    SKIPS.inc(reason='near_duplicate')
+    log.info("♊ Benzer haber zaten paylaşılmış (benzerlik %.2f): %s ~ %s",
+             match[1], news_item['link'], match[0],
+             extra={'source': news_item['source'], 'link': news_item['link'],
+                    'account': account.name})
+    return match[0]
+
+
+def save_tweeted(account, title, link, tweet_id=None):
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("INSERT INTO tweets (title, link) VALUES (?, ?)",
-                  (title, link))
-        conn.commit()
-        conn.close()
-        print(f"💾 Veritabanına kaydedildi: {link}")
+        db.save(title, link, account.name)
+        account.title_index.add(link, title)
+        log.info("💾 Veritabanına kaydedildi (%s): %s", account.name, link,
+                 extra={'account': account.name, 'link': link})
     except sqlite3.IntegrityError:
-        print(f"⚠️ Bu haber zaten kayıtlı (IntegrityError): {link}")
+        log.warning("⚠️ Bu haber zaten kayıtlı (IntegrityError): %s", link,
+                    extra={'account': account.name, 'link': link})
     except Exception as e:
-        print(f"❌ Veritabanı yazma hatası (save_tweeted): {e}")
+        log.error("❌ Veritabanı yazma hatası (save_tweeted): %s", e,
+                  extra={'account': account.name, 'link': link})
+        return
+    # İş tweets tablosuna yazıldıktan sonra kapanır; arada süreç durursa
+    # posting_slot is_already_tweeted ile görüp yine 'posted' yapar
+    try:
+        account.candidate_queue.mark_posted(link, tweet_id)
+    except Exception as e:
+        log.error("❌ Aday durumu güncellenemedi (save_tweeted): %s", e,
+                  extra={'account': account.name, 'link': link})
+
+
+TWEET_TITLE_MAX_WEIGHT = 190  # Ön ek + başlık + emoji için ağırlıklı üst sınır
+
 
+def create_tweet_text(news_item, rng=random):
+    """Haber için tweet metni üretir.
 
-def create_tweet_text(news_item):
+    Etiket, ön ek ve emoji seçimleri `rng` ile yapılır (tekrarlanabilir çıktı
+    için random.Random(seed) verilebilir); yerleşim tweet_text.compose_tweet
+    ile Twitter'ın ağırlıklı uzunluk kurallarına göre tek geçişte yapılır.
+    """
     source_tags_map = {
         "CoinDesk": ["#CoinDesk", "#KriptoHaber", "#KriptoPara"],
         "Cointelegraph": ["#Cointelegraph", "#BlockchainHaberleri", "#Kripto"],
@@ -369,145 +744,278 @@ def create_tweet_text(news_item):
         "#Teknoloji", "#Altcoin"
     ]
 
-    num_source_tags = random.randint(1, min(
+    num_source_tags = rng.randint(1, min(
         2, len(source_tags))) if source_tags else 0
-    num_general_tags = random.randint(1, min(3, len(general_tags)))
+    num_general_tags = rng.randint(1, min(3, len(general_tags)))
 
-    chosen_source_tags = random.sample(source_tags, num_source_tags)
-    chosen_general_tags = random.sample(general_tags, num_general_tags)
+    chosen_source_tags = rng.sample(source_tags, num_source_tags)
+    chosen_general_tags = rng.sample(general_tags, num_general_tags)
 
-    all_tags = list(set(chosen_source_tags + chosen_general_tags))
+    # set() yerine sıralı tekilleştirme: çıktı hash tohumuna bağlı olmasın
+    all_tags = list(dict.fromkeys(chosen_source_tags + chosen_general_tags))
     if len(all_tags) > 4:
-        all_tags = random.sample(all_tags, 4)
-    random.shuffle(all_tags)
+        all_tags = rng.sample(all_tags, 4)
+    rng.shuffle(all_tags)
 
     title_prefixes = ["", "📰 ", "⚡️ ", "💡 ", "🚀 ", "🔔 ", "📢 "]
     news_emojis = ["📉", "📈", "📊", "🧐", "📌", "🔍", "🌐", "🔥", "✨"]
 
-    chosen_prefix = random.choice(title_prefixes)
-    chosen_emoji = random.choice(news_emojis)
-
-    display_title = news_item['title']
-
-    max_title_len = 190
-
-    full_title_part = f"{chosen_prefix}{display_title} {chosen_emoji}"
-    if len(full_title_part) > max_title_len:
-        cut_amount = len(full_title_part) - (max_title_len - 3)
-        display_title_cut = display_title[:len(
-            display_title) - cut_amount] if len(
-                display_title) - cut_amount > 0 else display_title[:10]
-        full_title_part = f"{chosen_prefix}{display_title_cut}... {chosen_emoji}"
-
-    tweet_text = (f"{full_title_part}\n\n"
-                  f"🔗 {news_item['link']}\n\n"
-                  f"{' '.join(all_tags)}")
-
-    while len(tweet_text) > 280:
-        if len(all_tags) > 1:
-            tweet_text = tweet_text.replace(" " + all_tags.pop(), "", 1)
-        elif len(display_title) > 30:
-            current_title_len = len(display_title)
-            new_title_len = current_title_len - (len(tweet_text) - 280) - 5
-            if new_title_len < 20:
-                new_title_len = 20
-            display_title = display_title[:new_title_len] + "..."
-            full_title_part = f"{chosen_prefix}{display_title} {chosen_emoji}"
-            tweet_text = (f"{full_title_part}\n\n"
-                          f"🔗 {news_item['link']}\n\n"
-                          f"{' '.join(all_tags)}")
-        else:
-            break
+    chosen_prefix = rng.choice(title_prefixes)
+    chosen_emoji = rng.choice(news_emojis)
+
+    return compose_tweet(news_item['title'],
+                         news_item['link'],
+                         all_tags,
+                         prefix=chosen_prefix,
+                         emoji=chosen_emoji,
+                         max_title_weight=TWEET_TITLE_MAX_WEIGHT)
+
+
+TWITTER_IMAGE_MAX_BYTES = 5 * 1024 * 1024  # Twitter görsel limiti (yaklaşık)
+IMAGE_DOWNLOAD_MAX_BYTES = 20 * 1024 * 1024  # Küçültülecek görseller için indirme sınırı
+MEDIA_ID_TTL = 23 * 60 * 60  # Yüklenen medya ~24 saat geçerli, pay bırakıldı
+PREFETCH_COUNT = 4  # Hesap başına önceden (paralel) hazırlanacak haber sayısı
+# Sayfa tarama, görsel indirme ve Pillow işlemi ağ beklemesi ağırlıklı; Pillow
+# da işlem sırasında GIL'i bıraktığından thread havuzu çekirdeklerle ölçeklenir
+ENRICH_WORKERS = min(16, 4 * (os.cpu_count() or 1))
+PREFETCH_UPLOAD_MEDIA = True  # Sıradaki ilk haberin görseli ön hazırlıkta yüklensin mi
+ARTICLE_MEDIA_CACHE_SIZE = 16  # Hesaplar arasında paylaşılan hazır görsel sayısı
+# Aynı haber birden fazla hesaba gider; sayfa ve görsel bir kez işlenir
+article_media = MediaCache(max_items=ARTICLE_MEDIA_CACHE_SIZE)
+# Tüm hesapların ön hazırlıkları bu havuzu paylaşır; paylaşımı ise her hesabın
+# tek posting_slot işi sırayla ve rate_governor sınırları içinde yapar
+enrich_pool = ThreadPoolExecutor(max_workers=ENRICH_WORKERS,
+                                 thread_name_prefix='enrich')
+
+
+def upload_prepared_media(account, prepared):
+    """Hazırlanmış görseli hesaba yükler, media_id ve geçerlilik süresini kaydeder.
+
+    Medya yükleme hakkı yoksa yükleme yapılmaz ve False döner.
+    """
+    image_bytes, media_filename = prepared['image']
+    prepared['media_id'] = None
+    quota_wait = account.rate_governor.time_until('media_upload')
+    if quota_wait > 0:
+        SKIPS.inc(reason='media_quota')
+        log.warning("⏳ Medya yükleme limiti dolu (~%d dk). Görsel yüklenmedi.",
+                    int(quota_wait) // 60, extra={'account': account.name})
+        return False
+    account.rate_governor.consume('media_upload')
+    with STAGE_SECONDS.time(stage='media_upload'):
+        media = account.api_v1.media_upload(filename=media_filename,
+                                            file=io.BytesIO(image_bytes))
+    expires_after = getattr(media, 'expires_after_secs', None) or MEDIA_ID_TTL
+    prepared['media_id'] = media.media_id_string
+    prepared['media_expires_at'] = time.time() + min(expires_after,
+                                                     MEDIA_ID_TTL)
+    log.debug("🖼️ Görsel Twitter'a yüklendi, Media ID: %s", prepared['media_id'],
+              extra={'account': account.name,
+                     'link': prepared['news_item']['link']})
+    return True
+
+
+def prepare_article_media(link):
+    """Haberin görselini bulur, indirir ve hazırlar: (baytlar, dosya adı) ya da None.
+
+    None kesin sonuçtur (görsel yok, çok büyük, işlenemiyor) ve article_media
+    önbelleğinde saklanır. Geçici ağ/sunucu hataları requests istisnası
+    olarak yükselir; önbelleğe girmez, sonraki denemede tekrar indirilir.
+    """
+    image_url = get_article_image(link)
+    if not image_url:
+        log.debug("🖼️ Görsel bulunamadı veya uygun değil, sadece metin tweeti.",
+                  extra={'link': link})
+        return None
+
+    log.debug("🖼️ Görsel bulundu: %s", image_url, extra={'link': link})
+    try:
+        # Görsel bellekte indirilir, gerekirse küçültülüp yeniden sıkıştırılır
+        with STAGE_SECONDS.time(stage='image_download'):
+            media_file, media_filename = prepare_image(
+                http_session, image_url, IMAGE_DOWNLOAD_MAX_BYTES,
+                TWITTER_IMAGE_MAX_BYTES)
+        return media_file.getvalue(), media_filename
+    except requests.exceptions.SSLError as ssl_err:
+        ERRORS.inc(stage='image_download')
+        log.warning("⚠️ Görsel SSL hatası (%s): %s. Sadece metin.", image_url,
+                    ssl_err, extra={'link': link, 'stage': 'image_download'})
+    except ImageTooLargeError as size_err:
+        SKIPS.inc(reason='image_too_large')
+        log.warning("⚠️ %s. Atlanıyor, sadece metin.", size_err,
+                    extra={'link': link, 'stage': 'image_download'})
+    except requests.exceptions.RequestException as e:
+        ERRORS.inc(stage='image_download')
+        log.warning("⚠️ Görsel indirme hatası (%s): %s. Sadece metin.",
+                    image_url, e, extra={'link': link, 'stage': 'image_download'})
+        if _is_transient_http_error(e):
+            raise
+    except Exception as e:
+        ERRORS.inc(stage='image_download')
+        log.warning("⚠️ Görsel işleme hatası (%s): %s. Sadece metin.", image_url,
+                    e, extra={'link': link, 'stage': 'image_download'})
+    return None
 
-    return tweet_text[:280]
 
+def prepare_tweet(account, news_item, upload_media=True):
+    """Tweet metnini oluşturur, görseli bulup bellekte hazırlar.
 
-def post_tweet(news_item):
-    if not client or not api_v1:
-        print("❌ Twitter API bağlantısı (v1 veya v2) eksik.")
-        return False
+    Görsel hesaplar arasında paylaşılan article_media önbelleğinden gelir.
+    upload_media True ise görsel hesabın Twitter'ına da yüklenir. Dönen
+    sözlük publish_tweet'e verilir; metin oluşturulamazsa None döner.
+
+    Kuyruktan kaldığı yerden gelen işin kayıtlı metni ve süresi geçmemiş
+    media_id'si yeniden kullanılır; aynı metinle tekrar denenen tweet zaten
+    atılmışsa Twitter duplicate olarak reddeder. Hazırlık işe yazılır.
+    """
+    tweet_text_content = news_item.get('tweet_text') or create_tweet_text(news_item)
+    if not tweet_text_content:
+        log.error("❌ Tweet metni oluşturulamadı.",
+                  extra={'link': news_item['link'], 'stage': 'create_tweet'})
+        return None
+
+    link = news_item['link']
+    prepared = {
+        'news_item': news_item,
+        'text': tweet_text_content,
+        'image': None,  # (baytlar, dosya adı)
+        'media_id': news_item.get('media_id'),
+        'media_expires_at': news_item.get('media_expires_at') or 0,
+    }
+    if not prepared['media_id'] or time.time() >= prepared['media_expires_at']:
+        prepared['media_id'] = None
+        try:
+            prepared['image'] = article_media.get_or_prepare(
+                link, lambda: prepare_article_media(link))
+        except requests.exceptions.RequestException:
+            # Geçici hata (loglandı): bu deneme sadece metin, sonraki tekrar dener
+            prepared['image'] = None
+    if prepared['image'] and upload_media:
+        try:
+            upload_prepared_media(account, prepared)
+        except Exception as e:
+            ERRORS.inc(stage='media_upload')
+            prepared['image'] = None
+            log.warning("⚠️ Görsel yükleme hatası (%s): %s. Sadece metin.",
+                        account.name, e,
+                        extra={'account': account.name, 'link': link,
+                               'stage': 'media_upload'})
+    account.candidate_queue.mark_media_ready(link, tweet_text_content,
+                                             prepared['media_id'],
+                                             prepared['media_expires_at'])
+    return prepared
+
+
+def _prefetch_prepare(account, news_item):
+    if not account.ready or is_already_tweeted(account, news_item['link']):
+        return None
+    log.debug("🧺 Ön hazırlık (%s): %s", account.name, news_item['link'],
+              extra={'account': account.name, 'link': news_item['link']})
+    # Görsel sadece sırası gelen haber için yüklenir; pencerenin gerisi
+    # paylaşılmadan düşebilir, onların görseli publish_tweet'te yüklenir
+    next_due = account.candidate_queue.peek(1)
+    upload_media = (PREFETCH_UPLOAD_MEDIA and bool(next_due)
+                    and next_due[0]['link'] == news_item['link'])
+    return prepare_tweet(account, news_item, upload_media=upload_media)
+
+
+for account in accounts:
+    account.prefetcher = Prefetcher(partial(_prefetch_prepare, account),
+                                    enrich_pool,
+                                    max_items=PREFETCH_COUNT)
+
+
+# post_tweet / publish_tweet sonuçları
+POST_OK = 'posted'  # Tweet atıldı
+POST_DROP = 'drop'  # Kesin sonuç (duplicate, yasaklı, metin yok): aday kapatılır
+POST_RETRY = 'retry'  # Limit, ağ/sunucu hatası, hazır olmayan hesap: aday sırada kalır
+
+
+def post_tweet(account, news_item):
+    """Haberi hazırlayıp paylaşır; POST_OK, POST_DROP ya da POST_RETRY döndürür."""
+    if not account.ready:
+        log.error("❌ Twitter API bağlantısı (v1 veya v2) eksik (%s).",
+                  account.name, extra={'account': account.name})
+        return POST_RETRY
     try:
-        if is_already_tweeted(news_item['link']):
-            print(f"⏩ Daha önce tweetlenmiş (veritabanı): {news_item['link']}")
-            return False
+        if is_already_tweeted(account, news_item['link']):
+            log.debug("⏩ Daha önce tweetlenmiş (veritabanı): %s",
+                      news_item['link'],
+                      extra={'account': account.name,
+                             'link': news_item['link']})
+            return POST_DROP
+
+        prepared = account.prefetcher.take(news_item['link'])
+        if prepared is not None:
+            log.debug("⚡ Önceden hazırlanmış tweet kullanılıyor.",
+                      extra={'account': account.name,
+                             'link': news_item['link']})
+        else:
+            prepared = prepare_tweet(account, news_item)
+        if prepared is None:
+            return POST_DROP
+    except Exception as e:
+        ERRORS.inc(stage='prepare_tweet')
+        log.exception("❌ Tweet hazırlanırken beklenmeyen genel hata: %s", e,
+                      extra={'account': account.name,
+                             'link': news_item['link'],
+                             'stage': 'prepare_tweet'})
+        return POST_DROP
+    return publish_tweet(account, prepared)
 
-        tweet_text_content = create_tweet_text(news_item)
-        if not tweet_text_content:
-            print("❌ Tweet metni oluşturulamadı.")
-            return False
 
-        print(
-            f"\nℹ️ Tweet denemesi ({datetime.now().strftime('%H:%M:%S')}):\n{tweet_text_content}"
-        )
+def publish_tweet(account, prepared):
+    """Hazırlanmış tweet'i hesaptan tek bir create_tweet çağrısıyla paylaşır.
 
-        media_id_str = None
-        image_url = get_article_image(news_item['link'])
+    Tweet atıldıysa POST_OK, haber bir daha denenmemeliyse POST_DROP; limit,
+    Twitter 5xx ve ağ hatalarında (haberle ilgisiz, sonra tekrar denenebilir)
+    POST_RETRY döner.
+    """
+    news_item = prepared['news_item']
+    tweet_text_content = prepared['text']
+    fields = {
+        'account': account.name,
+        'source': news_item['source'],
+        'link': news_item['link'],
+    }
+    try:
+        log.debug("ℹ️ Tweet denemesi (%s):\n%s", account.name,
+                  tweet_text_content, extra=fields)
 
-        if image_url:
-            print(f"🖼️ Görsel bulundu: {image_url}")
+        media_id_str = None
+        if prepared['image'] and (not prepared['media_id'] or
+                                  time.time() >= prepared['media_expires_at']):
             try:
-                img_response = requests.get(image_url, timeout=30, stream=True)
-                img_response.raise_for_status()
-
-                temp_filename = "temp_media_twitter"
-                content_type = img_response.headers.get('content-type',
-                                                        '').lower()
-                if 'jpeg' in content_type or 'jpg' in content_type:
-                    temp_filename += ".jpg"
-                elif 'png' in content_type:
-                    temp_filename += ".png"
-                elif 'gif' in content_type:
-                    temp_filename += ".gif"
-                elif 'webp' in content_type:
-                    temp_filename += ".webp"
-                else:
-                    temp_filename += ".jpg" # Varsayılan
-
-                # Render gibi ortamlarda /tmp genellikle yazılabilir bir geçici dizindir
-                temp_media_path = os.path.join('/tmp', temp_filename) 
-
-                with open(temp_media_path, 'wb') as f:
-                    for chunk in img_response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-
-                file_size = os.path.getsize(temp_media_path)
-                if file_size > 5 * 1024 * 1024: # Twitter görsel limiti (yaklaşık)
-                    print(
-                        f"⚠️ Görsel boyutu çok büyük ({file_size / (1024*1024):.2f} MB). Yüklenemeyebilir. Atlanıyor."
-                    )
-                    media_id_str = None
-                    os.remove(temp_media_path)
-                else:
-                    media = api_v1.media_upload(filename=temp_media_path)
-                    media_id_str = media.media_id_string
-                    print(
-                        f"🖼️ Görsel Twitter'a yüklendi, Media ID: {media_id_str}"
-                    )
-                    os.remove(temp_media_path)
-            except requests.exceptions.SSLError as ssl_err:
-                print(
-                    f"⚠️ Görsel SSL hatası ({image_url}): {ssl_err}. Sadece metin."
-                )
+                upload_prepared_media(account, prepared)
             except Exception as e:
-                print(
-                    f"⚠️ Görsel işleme/yükleme hatası ({image_url}): {str(e)}. Sadece metin."
-                )
-        else:
-            print(
-                "🖼️ Görsel bulunamadı veya uygun değil, sadece metin tweeti.")
-
-        if media_id_str:
-            response = client.create_tweet(text=tweet_text_content,
-                                           media_ids=[media_id_str])
-        else:
-            response = client.create_tweet(text=tweet_text_content)
+                ERRORS.inc(stage='media_upload')
+                log.warning("⚠️ Görsel yükleme hatası: %s. Sadece metin.", e,
+                            extra=dict(fields, stage='media_upload'))
+        if prepared['media_id'] and time.time() < prepared['media_expires_at']:
+            media_id_str = prepared['media_id']
+
+        # Niyet create_tweet'ten önce yazılır: süreç burada durursa iş aynı
+        # metinle tekrarlanır ve atılmış tweet duplicate olarak kapanır
+        account.candidate_queue.mark_posting(news_item['link'],
+                                             tweet_text_content, media_id_str,
+                                             prepared['media_expires_at'])
+        account.rate_governor.consume('tweet_create')
+        started = time.perf_counter()
+        with STAGE_SECONDS.time(stage='create_tweet'):
+            if media_id_str:
+                response = account.client.create_tweet(
+                    text=tweet_text_content, media_ids=[media_id_str])
+            else:
+                response = account.client.create_tweet(text=tweet_text_content)
+        fields['duration'] = round(time.perf_counter() - started, 3)
 
         if response and response.data and response.data.get('id'):
-            print(
-                f"✅ Tweet atıldı! ID: {response.data['id']} - {news_item['link']}"
-            )
-            save_tweeted(news_item['original_title'], news_item['link'])
-            return True
+            log.info("✅ Tweet atıldı (%s)! ID: %s - %s", account.name,
+                     response.data['id'], news_item['link'], extra=fields)
+            save_tweeted(account, news_item['original_title'], news_item['link'],
+                         tweet_id=str(response.data['id']))
+            TWEETS.inc(account=account.name, result='posted')
+            return POST_OK
         else:
             error_msg = "Bilinmeyen API hatası."
             if response and response.errors:
@@ -517,154 +1025,451 @@ def post_tweet(news_item):
                                   dict) and (error.get("code") == 187 # v1.1 duplicate error
                                              or "duplicate" in error.get( # v2 duplicate error
                                                  "message", "").lower()):
-                        print(
-                            "🐦 API tarafından duplicate olarak işaretlendi. Veritabanına kaydediliyor."
-                        )
-                        save_tweeted(news_item['original_title'],
+                        log.warning(
+                            "🐦 API tarafından duplicate olarak işaretlendi. Veritabanına kaydediliyor.",
+                            extra=fields)
+                        save_tweeted(account, news_item['original_title'],
                                      news_item['link'])
                         # Duplicate durumunda da başarılı sayılabilir (amaç tekrar denememek)
                         # Ancak ana döngü için False dönmek daha iyi olabilir ki bir sonraki habere geçsin.
                         # Bu botun mantığına göre duplicate'i false dönmek doğru.
                         break 
-            print(f"❌ Tweet atılamadı. {error_msg}")
-            return False
+            TWEETS.inc(account=account.name, result='failed')
+            log.error("❌ Tweet atılamadı. %s", error_msg,
+                      extra=dict(fields, stage='create_tweet'))
+            return POST_DROP
 
     except tweepy.TweepyException as e:
-        print(f"❌ Twitter API Hatası (tweepy.TweepyException): {e}")
+        ERRORS.inc(stage='create_tweet')
+        TWEETS.inc(account=account.name, result='failed')
+        fields['stage'] = 'create_tweet'
+        log.error("❌ Twitter API Hatası (tweepy.TweepyException): %s", e,
+                  extra=fields)
+        outcome = POST_DROP
         if e.response is not None:
             status_code = e.response.status_code
-            print(f"API Hata Kodu: {status_code}")
+            fields['status_code'] = status_code
+            if status_code in (401, 429) or status_code >= 500:
+                # Limit, hesap yetkisi ya da Twitter tarafı: hata haberle
+                # ilgili değil, haber sırada kalır
+                outcome = POST_RETRY
+            if status_code == 429:
+                # Yanıt kancası başlıkları işlemiş olsa da olmasa da pencere
+                # kilitlenir; başlıksız 429'da slot bir sonraki adayla yine
+                # limite çarpmaz
+                reset_at = e.response.headers.get('x-rate-limit-reset')
+                account.rate_governor.block(
+                    'tweet_create', '15m',
+                    float(reset_at) if reset_at else time.time() + RATE_LIMIT_FALLBACK_WAIT)
             try:
                 error_details = e.response.json()
-                print(f"API Hata Detayları: {error_details}")
+                log.error("API Hata Detayları: %s", error_details, extra=fields)
                 detail_msg = error_details.get('detail', '').lower()
                 title_error = error_details.get('title', '').lower() # Bazı v2 hatalarında
 
                 # Duplicate content (API v2)
                 if status_code == 403 and ("duplicate" in detail_msg or "duplicate" in title_error or "You are not allowed to create a Tweet with duplicate content" in detail_msg):
-                    print(
-                        "🐦 Zaten tweetlenmiş (API 403 Duplicate). Veritabanına kaydediliyor."
-                    )
-                    save_tweeted(news_item['original_title'],
+                    log.warning(
+                        "🐦 Zaten tweetlenmiş (API 403 Duplicate). Veritabanına kaydediliyor.",
+                        extra=fields)
+                    save_tweeted(account, news_item['original_title'],
                                  news_item['link'])
                 elif status_code == 403 and ("User is over daily status update limit" in detail_msg or "tweet limit" in detail_msg):
-                     print("🚫 Günlük tweet limiti aşıldı (API 403). Uzun süre beklenecek.")
-                     time.sleep(random.randint(7200, 10800)) # 2-3 saat bekle
+                     log.warning("🚫 Günlük tweet limiti aşıldı (API 403). Uzun süre beklenecek.",
+                                 extra=fields)
+                     # Başlıkta sıfırlanma zamanı yoksa 2-3 saat bekle
+                     reset_at = e.response.headers.get('x-user-limit-24hour-reset')
+                     account.rate_governor.block(
+                         'tweet_create', '24h',
+                         float(reset_at) if reset_at else time.time() + random.randint(7200, 10800))
+                     outcome = POST_RETRY
                 elif status_code == 403: # Diğer 403 hataları
-                    print(f"🚫 Yasaklı işlem (API 403): {error_details}. Bu haber atlanıyor ve kaydediliyor.")
-                    save_tweeted(news_item['original_title'], news_item['link'])
+                    log.warning("🚫 Yasaklı işlem (API 403): %s. Bu haber atlanıyor ve kaydediliyor.",
+                                error_details, extra=fields)
+                    save_tweeted(account, news_item['original_title'], news_item['link'])
                 elif status_code == 429: # Rate limit
-                    print(
-                        "🚫 Rate limit aşıldı (API 429). Client'in otomatik beklemesi (wait_on_rate_limit=True) devrede olmalı."
-                    )
-                    # Ekstra bekleme eklenebilir, ama client halletmeli
+                    # Pencere yukarıda kilitlendi; paylaşım slotu hak açılana
+                    # kadar bekler
+                    log.warning(
+                        "🚫 Rate limit aşıldı (API 429). ~%d dakika sonra tekrar denenecek.",
+                        int(account.rate_governor.time_until('tweet_create')) // 60,
+                        extra=fields)
             except requests.exceptions.JSONDecodeError:
                 # API'den JSON olmayan bir yanıt gelirse (nadiren)
-                print(f"API Hata Detayı (Non-JSON): {e.response.text}")
+                log.error("API Hata Detayı (Non-JSON): %s", e.response.text,
+                          extra=fields)
                 if "duplicate content" in e.response.text.lower(): # Metin içinde arama
-                    print("🐦 Zaten tweetlenmiş (API 403 Duplicate - text match). Veritabanına kaydediliyor.")
-                    save_tweeted(news_item['original_title'], news_item['link'])
+                    log.warning("🐦 Zaten tweetlenmiş (API 403 Duplicate - text match). Veritabanına kaydediliyor.",
+                                extra=fields)
+                    save_tweeted(account, news_item['original_title'], news_item['link'])
         # Duplicate content (API v1.1)
         elif hasattr(e, 'api_codes') and 187 in e.api_codes: # Status is a duplicate
-            print("🐦 Zaten tweetlenmiş (API V1 Kod 187). Veritabanına kaydediliyor.")
-            save_tweeted(news_item['original_title'], news_item['link'])
+            log.warning("🐦 Zaten tweetlenmiş (API V1 Kod 187). Veritabanına kaydediliyor.",
+                        extra=fields)
+            save_tweeted(account, news_item['original_title'], news_item['link'])
         # Genel duplicate mesajı kontrolü
         elif "duplicate" in str(e).lower():
-            print("🐦 Zaten tweetlenmiş (Genel Hata Metni). Veritabanına kaydediliyor.")
-            save_tweeted(news_item['original_title'], news_item['link'])
-        return False # Hata durumunda False dön
+            log.warning("🐦 Zaten tweetlenmiş (Genel Hata Metni). Veritabanına kaydediliyor.",
+                        extra=fields)
+            save_tweeted(account, news_item['original_title'], news_item['link'])
+        else:
+            # Yanıt yok: istek gönderilemedi (API v1 ağ hataları)
+            outcome = POST_RETRY
+        return outcome
+    except requests.exceptions.RequestException as e:
+        # tweepy.Client ağ hatalarını sarmadan yükseltir; haber sırada kalır
+        ERRORS.inc(stage='create_tweet')
+        TWEETS.inc(account=account.name, result='failed')
+        log.error("❌ Twitter bağlantı hatası (%s): %s", type(e).__name__, e,
+                  extra=dict(fields, stage='create_tweet'))
+        return POST_RETRY
     except Exception as e:
-        print(f"❌ Tweet atma sırasında beklenmeyen genel hata: {str(e)}")
-        print("--- TRACEBACK BAŞLANGICI (post_tweet) ---")
-        traceback.print_exc()
-        print("--- TRACEBACK SONU (post_tweet) ---")
-        return False
+        ERRORS.inc(stage='create_tweet')
+        TWEETS.inc(account=account.name, result='failed')
+        log.exception("❌ Tweet atma sırasında beklenmeyen genel hata: %s", e,
+                      extra=dict(fields, stage='create_tweet'))
+        return POST_DROP
 
 
 # --- BOT ANA DÖNGÜSÜ ---
 TWEET_SUCCESS_WAIT_MIN = 45 * 60
 TWEET_SUCCESS_WAIT_MAX = 80 * 60
-TWEET_FAIL_WAIT_MIN = 30 * 60  # Bir sonraki habere geçmeden önceki bekleme
-TWEET_FAIL_WAIT_MAX = 50 * 60
+TWEET_FAIL_WAIT_MIN = 5 * 60  # Bir sonraki habere geçmeden önceki bekleme
+TWEET_FAIL_WAIT_MAX = 10 * 60
 NO_NEWS_WAIT_MIN = 55 * 60
 NO_NEWS_WAIT_MAX = 75 * 60
+POLL_INTERVAL_FLOOR = 10 * 60  # Kaynak başına uyarlanan yoklama aralığı sınırları
+POLL_INTERVAL_CEILING = 2 * 60 * 60
+POLL_TARGET_NEW_ITEMS = 1.0  # Yoklama başına beklenen yeni haber sayısı hedefi
 CRITICAL_ERROR_WAIT_MIN = 60 * 60
 CRITICAL_ERROR_WAIT_MAX = 100 * 60
-
-
-def run_bot():
-    print(f"🤖 Bot başlatıldı ({datetime.now().strftime('%d.%m.%Y %H:%M:%S')})")
-    tweet_counter = 0
-    max_tweets_per_cycle = 2 # Ana döngü başına atılacak maksimum tweet sayısı
-
-    while True:
-        try:
-            current_time_str = datetime.now().strftime('%d.%m.%Y %H:%M:%S')
-            print(f"\n🔄 {current_time_str} - Haberler kontrol ediliyor...")
-
-            all_available_news = get_latest_news()
-
-            if not all_available_news:
-                wait_time = random.randint(NO_NEWS_WAIT_MIN, NO_NEWS_WAIT_MAX)
-                print(
-                    f"⚠️ Haber bulunamadı. {wait_time//60} dakika bekleniyor..."
-                )
-                time.sleep(wait_time)
+NEWS_RETRY_WAIT = 5 * 60  # Aday haber yokken paylaşım slotunun tekrar bakma süresi
+CANDIDATE_MAX_AGE = 12 * 60 * 60  # Bundan eski adaylar paylaşılmaz
+CANDIDATE_HALF_LIFE = 2 * 60 * 60  # Önceliğin yarıya indiği haber yaşı
+# Başlıkta geçen kelime başına öncelik bonusu (küçük harf, tam kelime)
+KEYWORD_BOOSTS = {"bitcoin": 0.5, "btc": 0.5, "etf": 0.3, "sec": 0.3, "hack": 0.4}
+TWEET_FAIL_RETRIES_PER_SLOT = 3  # Bir slotta art arda denenecek en fazla aday
+POLL_WARMUP_DELAY = 60  # İlk paylaşımdan önce kaynakların yoklanması için süre
+MAINTENANCE_INTERVAL = 6 * 60 * 60
+SCHEDULER_WORKERS = 4  # Kaynak yoklama, çeviri ve bakım işleri
+# Paylaşım slotları ayrı havuzda (hesap başına bir işçi): takılan feed'ler
+# yoklama işçilerini doldursa da paylaşım beklemez
+POST_POOL = 'post'
+SCHEDULER_POOLS = {POST_POOL: max(1, len(accounts))}
+
+scheduler = Scheduler(max_workers=SCHEDULER_WORKERS, pools=SCHEDULER_POOLS)
+# Hesap başına kalıcı aday kuyruğu; yoklama işleri ekler, paylaşım slotu tüketir
+for account in accounts:
+    account.candidate_queue = CandidateQueue(db,
+                                             source_weights=source_registry.weights(),
+                                             keyword_boosts=KEYWORD_BOOSTS,
+                                             half_life=CANDIDATE_HALF_LIFE,
+                                             max_age=CANDIDATE_MAX_AGE,
+                                             account=account.name)
+source_poller = AdaptivePoller(floor=POLL_INTERVAL_FLOOR,
+                               ceiling=POLL_INTERVAL_CEILING,
+                               initial=(NO_NEWS_WAIT_MIN + NO_NEWS_WAIT_MAX) / 2,
+                               target_new_items=POLL_TARGET_NEW_ITEMS)
+
+
+def enqueue_news(account, news):
+    """Haberleri kaydedip hesabın diline çevirir ve aday kuyruğuna ekler; eklenen sayıyı döndürür."""
+    # Kuyrukta zaten olan (veya başarısız) haberler yeniden çevrilmez
+    news = account.candidate_queue.unknown(news)
+    # Başka kaynaktan zaten paylaşılmış haberler çeviri öncesi elenir ve
+    # başarısız olarak kaydedilir; sonraki yoklamalarda yeniden bakılmaz
+    duplicates = {
+        item['link'] for item in news if find_near_duplicate(account, item)
+    }
+    if duplicates:
+        account.candidate_queue.reject(
+            [item for item in news if item['link'] in duplicates])
+        news = [item for item in news if item['link'] not in duplicates]
+    # Çeviriden önce kaydedilir: süreç çeviri sırasında durursa haberler
+    # başlangıçta resume_jobs ile kaldığı yerden çevrilir
+    news = account.candidate_queue.push_fetched(filter_untweeted(account, news))
+    return queue_translated(account, news)
+
+
+def queue_translated(account, news):
+    """Kayıtlı haberleri çevirip paylaşım sırasına alır; eklenen sayıyı döndürür."""
+    added = account.candidate_queue.mark_translated(
+        translate_candidates(account, news))
+    if added:
+        # Görseller paylaşım slotunu beklemeden havuzda hazırlanmaya başlar
+        account.prefetcher.start(account.candidate_queue.peek(PREFETCH_COUNT))
+    if added and account.waiting_for_news and account.ready:
+        # Haber bekleyen paylaşım slotunu hemen uyandır
+        account.waiting_for_news = False
+        scheduler.schedule(account.post_job_key, 0, posting_slot, account,
+                           pool=POST_POOL)
+    return added
+
+
+def resume_jobs(account):
+    """Çevirisi yarıda kalmış haberleri (ör. yeniden başlatma sonrası) sıraya alır."""
+    news = account.candidate_queue.fetched()
+    if not news:
+        return 0
+    added = queue_translated(account, news)
+    log.info("♻️ Çevirisi yarım kalan %d haber sıraya alındı (%s).", added,
+             account.name, extra={'account': account.name})
+    return added
+
+
+def poll_source(name):
+    """Tek bir kaynağı bir kez yoklar, yeni haberleri her hesabın kuyruğuna ekler."""
+    source = source_registry.get(name)
+    if source is None:
+        log.info("ℹ️ %s kaynak listesinden çıkarılmış, yoklama durduruldu.", name,
+                 extra={'source': name})
+        return
+    added = 0
+    unchanged = False
+    started = time.perf_counter()
+    try:
+        fetched = fetch_feed(source)
+        if fetched is None:
+            unchanged = True
+        else:
+            feed, validators = fetched
+            news = parse_feed_entries(source, feed)
+            for account in accounts:
+                account_added = enqueue_news(account, news)
+                if account_added:
+                    log.info("📰 %s: %d yeni aday haber eklendi (%s).", name,
+                             account_added, account.name,
+                             extra={'source': name, 'account': account.name})
+                # Yoklama aralığı kaynağın yayın hızına göre: hesap sayısı etkilemez
+                added = max(added, account_added)
+            # Haberler tüm hesapların kuyruğuna yazıldıktan sonra; arada hata
+            # olursa bir sonraki yoklama eski doğrulayıcılarla yapılır ve aynı
+            # haberler yeniden gelir
+            if validators is not None:
+                save_feed_validators(source.url, *validators)
+    except Exception as e:
+        ERRORS.inc(stage='feed_fetch')
+        log.exception("❌ %s haber çekme hatası. Tip: %s, Detaylar (repr): %r",
+                      name, type(e).__name__, e,
+                      extra={'source': name, 'stage': 'feed_fetch'})
+    finally:
+        # Yoklama sürerken kaynak dosyadan silinmiş olabilir
+        if not scheduler.stopping and source_registry.get(name) is not None:
+            # Hareketli kaynaklar daha sık, sessizler daha seyrek yoklanır;
+            # sources.json'da poll_interval verilen kaynak sabit aralıkla
+            wait_time = source_poller.record(name, added, unchanged=unchanged)
+            wait_reason = 'adaptive'
+            if source.poll_interval:
+                wait_time = source.poll_interval
+                wait_reason = 'fixed'
+            SCHEDULED_WAIT_SECONDS.observe(wait_time, job='poll',
+                                           reason=wait_reason)
+            log.info("⏳ %s ~%d dakika sonra tekrar yoklanacak.", name,
+                     int(wait_time) // 60,
+                     extra={'source': name, 'stage': 'poll', 'added': added,
+                            'duration': round(time.perf_counter() - started, 3)})
+            scheduler.schedule(f"poll:{name}", wait_time, poll_source, name)
+
+
+def reload_sources():
+    """sources.json değiştiyse yeniden yükler ve yoklama işlerini günceller."""
+    try:
+        changes = source_registry.reload_if_changed()
+        if changes:
+            added, removed, changed = changes
+            for name in removed:
+                scheduler.cancel(f"poll:{name}")
+            # Yeni ve ayarı değişen kaynaklar hemen (yeni ayarlarla) yoklanır
+            for i, name in enumerate(added + changed):
+                scheduler.schedule(f"poll:{name}", i * 2, poll_source, name)
+            weights = source_registry.weights()
+            for account in accounts:
+                account.candidate_queue.source_weights = weights
+            log.info(
+                "🔄 Kaynaklar yeniden yüklendi: %d eklendi, %d çıkarıldı, %d güncellendi.",
+                len(added), len(removed), len(changed))
+    except Exception as e:
+        log.error("❌ Kaynak dosyası yeniden yüklenemedi (%s): %s", SOURCES_PATH, e)
+    finally:
+        if not scheduler.stopping:
+            scheduler.schedule('sources', SOURCES_RELOAD_INTERVAL,
+                               reload_sources)
+
+
+def posting_slot(account):
+    """Hesabın sıradaki haberini paylaşır ve bir sonraki slotu zamanlar."""
+    if not account.ready:
+        # Bağlantısı kurulamamış hesap paylaşmaz; adayları kuyrukta kalır
+        log.error("❌ Twitter API bağlantısı (v1 veya v2) eksik (%s). Paylaşım slotu durduruldu.",
+                  account.name, extra={'account': account.name})
+        return
+    wait_time = 0
+    wait_reason = 'fail'
+    try:
+        quota_wait = account.rate_governor.time_until('tweet_create')
+        if quota_wait > 0:
+            # Limite çarpmak yerine hak açılacağı ana kadar bekle
+            wait_time = quota_wait
+            wait_reason = 'quota'
+            log.info(
+                "⏳ Tweet limiti için ~%d dakika bekleniyor (%s, rate_governor).",
+                int(wait_time) // 60, account.name,
+                extra={'account': account.name})
+            return
+
+        failures = 0
+        while True:
+            news_item_data = account.candidate_queue.pop()
+            if news_item_data is None:
+                account.waiting_for_news = True
+                wait_time = NEWS_RETRY_WAIT
+                wait_reason = 'no_news'
+                log.info(
+                    "ℹ️ Paylaşılacak aday haber yok (%s). En geç ~%d dakika sonra tekrar bakılacak.",
+                    account.name, wait_time // 60,
+                    extra={'account': account.name})
+                return
+            if is_already_tweeted(account, news_item_data['link']):
+                # Tweetlenmiş haber bekleme maliyeti olmadan atlanır; kayıttan
+                # sonra süreç durmuşsa iş burada kapanır
+                account.candidate_queue.mark_posted(news_item_data['link'])
+                SKIPS.inc(reason='already_tweeted')
+                log.debug("⏩ Daha önce tweetlenmiş (veritabanı): %s",
+                          news_item_data['link'],
+                          extra={'account': account.name,
+                                 'link': news_item_data['link']})
                 continue
+            if find_near_duplicate(account, news_item_data):
+                # Kuyruktayken başka kaynaktan benzeri paylaşılmış olabilir
+                account.candidate_queue.mark_failed(news_item_data['link'])
+                continue
+
+            log.debug("📰 Kontrol ediliyor: %.60s... (%s)",
+                      news_item_data.get('title', 'Başlık Yok'),
+                      news_item_data.get('link', 'Link Yok'),
+                      extra={'account': account.name,
+                             'link': news_item_data.get('link')})
+            outcome = post_tweet(account, news_item_data)
+            if outcome == POST_OK:
+                account.tweet_counter += 1
+                # Başarılı tweet sonrası, bir sonraki tweet denemesi için uzun bekleme;
+                # günlük bütçe rate_governor tarafından ayrıca paylaştırılır
+                wait_time = random.randint(TWEET_SUCCESS_WAIT_MIN,
+                                           TWEET_SUCCESS_WAIT_MAX)
+                wait_reason = 'success'
+                log.info(
+                    "✅ Başarılı tweet #%d (%s). Bir sonraki paylaşım için ~%d dakika bekleniyor...",
+                    account.tweet_counter, account.name, wait_time // 60,
+                    extra={'account': account.name})
+                break
+            if outcome == POST_RETRY:
+                # Geçici hata: haber kaldığı durumla sıraya döner, slot biter;
+                # limit varsa bekleme aşağıda hak açılana kadar uzatılır
+                account.candidate_queue.requeue(news_item_data)
+                wait_time = random.randint(TWEET_FAIL_WAIT_MIN,
+                                           TWEET_FAIL_WAIT_MAX)
+                log.warning(
+                    "🔁 Tweet geçici bir hatayla atılamadı (%s). Haber sırada, ~%d dakika sonra tekrar denenecek.",
+                    account.name, wait_time // 60,
+                    extra={'account': account.name,
+                           'link': news_item_data['link']})
+                break
+
+            account.candidate_queue.mark_failed(news_item_data['link'])
+            failures += 1
+            if (failures >= TWEET_FAIL_RETRIES_PER_SLOT
+                    or account.rate_governor.time_until('tweet_create') > 0):
+                # Art arda hatalar: API'yi boğmamak için kısa bekleme
+                wait_time = random.randint(TWEET_FAIL_WAIT_MIN,
+                                           TWEET_FAIL_WAIT_MAX)
+                log.warning("🔻 %d tweet denemesi başarısız. ~%d dakika bekleniyor...",
+                            failures, wait_time // 60,
+                            extra={'account': account.name})
+                break
+            log.info("🔻 Tweet atılamadı. Sıradaki habere hemen geçiliyor.",
+                     extra={'account': account.name})
+
+        # Bekleme süresince sıradaki haberleri önceden hazırla
+        account.prefetcher.start(account.candidate_queue.peek(PREFETCH_COUNT))
+    except Exception as e:
+        ERRORS.inc(stage='posting_slot')
+        log.exception("🔴 Kritik hata paylaşım slotunda (posting_slot, %s): %s",
+                      account.name, e,
+                      extra={'account': account.name, 'stage': 'posting_slot'})
+        wait_time = random.randint(CRITICAL_ERROR_WAIT_MIN,
+                                   CRITICAL_ERROR_WAIT_MAX)
+        wait_reason = 'critical_error'
+        log.warning("💣 Kritik hata sonrası ~%d dakika bekleniyor...",
+                    wait_time // 60, extra={'account': account.name})
+    finally:
+        if not scheduler.stopping:
+            # Günlük limit / 429 gibi durumlarda hak açılana kadar bekle
+            quota_wait = account.rate_governor.time_until('tweet_create')
+            if quota_wait > wait_time:
+                wait_time = quota_wait
+                wait_reason = 'quota'
+                log.info(
+                    "⏸️ Paylaşım limit nedeniyle durduruldu (%s). ~%d dakika sonra devam edilecek.",
+                    account.name, int(wait_time) // 60,
+                    extra={'account': account.name})
+            SCHEDULED_WAIT_SECONDS.observe(wait_time, job='post',
+                                           reason=wait_reason)
+            scheduler.schedule(account.post_job_key, wait_time, posting_slot,
+                               account, pool=POST_POOL)
+
+
+def maintenance():
+    translation_cache.prune()
+    for account in accounts:
+        account.title_index.prune()
+        expired = account.candidate_queue.expire()
+        if expired:
+            log.info("🧹 %d eski aday kuyruktan silindi (%s).", expired,
+                     account.name, extra={'account': account.name})
+        # Artık aday olmayan haberlerin ön hazırlıklarını bırak
+        account.prefetcher.retain(account.candidate_queue.links())
+        if not scheduler.stopping:
+            # Çevirisi hata yüzünden yarım kalanlar tekrar denenir
+            scheduler.schedule(f"resume:{account.name}", 0, resume_jobs,
+                               account)
+    if not scheduler.stopping:
+        scheduler.schedule('maintenance', MAINTENANCE_INTERVAL, maintenance)
 
-            posted_in_this_cycle_count = 0
-            for news_item_data in all_available_news:
-                if posted_in_this_cycle_count >= max_tweets_per_cycle:
-                    print(
-                        f"🌀 Bu döngü için tweet atma limiti ({max_tweets_per_cycle}) doldu. Bir sonraki ana döngü bekleniyor."
-                    )
-                    break # İç döngüden çık, ana döngü beklemesine git
-
-                print(
-                    f"📰 Kontrol ediliyor: {news_item_data.get('title', 'Başlık Yok')[:60]}... ({news_item_data.get('link', 'Link Yok')})"
-                )
-
-                tweet_successful = post_tweet(news_item_data)
-
-                if tweet_successful:
-                    tweet_counter += 1
-                    posted_in_this_cycle_count += 1
-                    # Başarılı tweet sonrası, bir sonraki tweet denemesi için uzun bekleme
-                    wait_time = random.randint(TWEET_SUCCESS_WAIT_MIN,
-                                               TWEET_SUCCESS_WAIT_MAX)
-                    print(
-                        f"✅ Başarılı tweet #{tweet_counter}. Bir sonraki işlem için ~{wait_time//60} dakika bekleniyor..."
-                    )
-                    time.sleep(wait_time)
-                else:
-                    # Başarısız/atlanan tweet sonrası, bir sonraki habere geçmeden önce kısa bekleme
-                    # Bu, API'yi boğmamak veya aynı hatayı tekrar tekrar yaşamamak için
-                    fail_wait_time = random.randint(5 * 60, 10 * 60) # 5-10 dk
-                    print(
-                        f"🔻 Tweet atılamadı/atlandı. Bir sonraki habere geçmeden önce ~{fail_wait_time//60} dakika bekleniyor..."
-                    )
-                    time.sleep(fail_wait_time)
-
-            # Tüm haberler işlendikten veya max_tweets_per_cycle dolduktan sonra
-            # bir sonraki ana haber kontrol döngüsü için bekleme
-            if posted_in_this_cycle_count < max_tweets_per_cycle:
-                print(f"ℹ️ Bu döngüde ({posted_in_this_cycle_count}/{max_tweets_per_cycle}) tweet atıldı. Mevcut haberler bitti veya atlandı.")
-
-            overall_cycle_wait = random.randint(NO_NEWS_WAIT_MIN, NO_NEWS_WAIT_MAX)
-            print(f"⏳ Ana döngü tamamlandı. ~{overall_cycle_wait//60} dakika sonra tekrar haber kontrol edilecek.")
-            time.sleep(overall_cycle_wait)
 
-        except Exception as e:
-            print(f"🔴 Kritik hata ana döngüde (run_bot): {str(e)}")
-            print("--- TRACEBACK BAŞLANGICI (run_bot) ---")
-            traceback.print_exc()
-            print("--- TRACEBACK SONU (run_bot) ---")
-            critical_wait_time = random.randint(CRITICAL_ERROR_WAIT_MIN,
-                                                CRITICAL_ERROR_WAIT_MAX)
-            print(
-                f"💣 Kritik hata sonrası ~{critical_wait_time//60} dakika bekleniyor..."
-            )
-            time.sleep(critical_wait_time)
+def run_bot():
+    global scheduler
+    log.info("🤖 Bot başlatıldı")
+    scheduler = Scheduler(max_workers=SCHEDULER_WORKERS, pools=SCHEDULER_POOLS)
+    # Her kaynak kendi takviminde yoklanır; başlangıçta biraz aralıklı başlat
+    for i, name in enumerate(source_registry.sources()):
+        scheduler.schedule(f"poll:{name}", i * 2, poll_source, name)
+    scheduler.schedule('sources', SOURCES_RELOAD_INTERVAL, reload_sources)
+    for account in accounts:
+        # Önceki çalıştırmadan kalan işler kaldıkları durumdan devam eder
+        jobs = account.candidate_queue.state_counts()
+        if jobs:
+            log.info("♻️ Kayıtlı işler (%s): %s", account.name, jobs,
+                     extra={'account': account.name, 'jobs': jobs})
+        scheduler.schedule(f"resume:{account.name}", 0, resume_jobs, account)
+        if not account.ready:
+            log.error("❌ Twitter API bağlantısı (v1 veya v2) eksik (%s). Bu hesaptan paylaşım yapılmayacak.",
+                      account.name, extra={'account': account.name})
+            continue
+        scheduler.schedule(account.post_job_key, POLL_WARMUP_DELAY,
+                           posting_slot, account, pool=POST_POOL)
+    scheduler.schedule('maintenance', MAINTENANCE_INTERVAL, maintenance)
+    scheduler.run_forever()
+    log.info("🛑 Bot durduruldu")
+
+
+def stop_bot():
+    """Zamanlayıcıyı durdurur; süren işler biter, bekleyenler iptal edilir."""
+    for account in accounts:
+        account.prefetcher.stop()
+    scheduler.stop()
+
+
+atexit.register(stop_bot)
 
 
 # --- FLASK ENDPOINT'LERİ ---
@@ -679,32 +1484,81 @@ def home():
 @app.route('/start_bot_manual')
 def start_bot_endpoint():
     if not hasattr(app, 'bot_thread') or not app.bot_thread.is_alive():
-        print("⚙️ /start_bot_manual endpoint'i üzerinden bot başlatılıyor...")
+        log.info("⚙️ /start_bot_manual endpoint'i üzerinden bot başlatılıyor...")
         app.bot_thread = Thread(target=run_bot, daemon=True)
         app.bot_thread.start()
         return "🟢 Bot başlatıldı!"
     return "⚠️ Bot zaten çalışıyor."
 
 
+@app.route('/stop_bot_manual')
+def stop_bot_endpoint():
+    if hasattr(app, 'bot_thread') and app.bot_thread.is_alive():
+        log.info("⚙️ /stop_bot_manual endpoint'i üzerinden bot durduruluyor...")
+        stop_bot()
+        return "🔴 Bot durduruluyor."
+    return "⚠️ Bot zaten çalışmıyor."
+
+
+def _cache_lookup_counts():
+    clean = _clean_title_cached.cache_info()
+    translation = translation_cache.stats()
+    media = article_media.stats()
+    return {
+        ('clean_title', 'hit'): clean.hits,
+        ('clean_title', 'miss'): clean.misses,
+        ('translation', 'memory_hit'): translation['memory_hits'],
+        ('translation', 'db_hit'): translation['db_hits'],
+        ('translation', 'miss'): translation['misses'],
+        ('article_media', 'hit'): media['hits'],
+        ('article_media', 'miss'): media['misses'],
+    }
+
+
+# Diğer bileşenlerin kendi tuttuğu sayaçlar okunma anında aktarılır
+metrics.callback('tweetbot_cache_lookups_total', 'Önbellek sorguları',
+                 ['cache', 'result'], _cache_lookup_counts,
+                 type_name='counter')
+metrics.callback('tweetbot_pending_candidates',
+                 'Hesap başına paylaşılmayı bekleyen aday sayısı', ['account'],
+                 lambda: {account.name: len(account.candidate_queue)
+                          for account in accounts})
+metrics.callback('tweetbot_jobs',
+                 'Hesap ve durum başına kayıtlı paylaşım işi sayısı',
+                 ['account', 'state'],
+                 lambda: {(account.name, state): count
+                          for account in accounts
+                          for state, count in
+                          account.candidate_queue.state_counts().items()})
+metrics.callback(
+    'tweetbot_rate_limit_wait_seconds',
+    'Uç noktada hak açılana kadar kalan süre (sn)', ['account', 'endpoint'],
+    lambda: {(account.name, endpoint): account.rate_governor.time_until(endpoint)
+             for account in accounts for endpoint in TWITTER_RATE_LIMITS})
+metrics.callback('tweetbot_log_records_dropped_total',
+                 'Log kuyruğu dolu olduğu için yazılmayan kayıtlar', [],
+                 lambda: {(): log_config.handler.dropped},
+                 type_name='counter')
+
+
+@app.route('/metrics')
+def metrics_endpoint():
+    return Response(metrics.render(), content_type=metrics.content_type)
+
+
 @app.route('/debug_info')
 def debug_info():
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("SELECT COUNT(*) FROM tweets")
-        tweet_db_count = c.fetchone()[0]
-        c.execute(
-            "SELECT title, link, created_at FROM tweets ORDER BY created_at DESC LIMIT 5"
-        )
-        last_tweets_raw = c.fetchall()
-        conn.close()
+        tweet_db_count = db.count_tweets()
+        last_tweets_raw = db.last_tweets(5)
 
         last_tweets_formatted = []
         for t_row in last_tweets_raw:
             last_tweets_formatted.append({
                 "title": t_row[0],
                 "link": t_row[1],
-                "time": t_row[2]
+                "time": t_row[2],
+                "account": t_row[3]
             })
 
         return {
@@ -713,6 +1567,34 @@ def debug_info():
             and app.bot_thread.is_alive() else "Durdu",
             "total_tweets_in_db":
             tweet_db_count,
+            "translation_cache":
+            translation_cache.stats(),
+            "seen_index":
+            db.seen_index.stats(),
+            "article_media_cache":
+            article_media.stats(),
+            "accounts": {
+                account.name: {
+                    "lang": account.lang,
+                    "ready": account.ready,
+                    "tweets_in_db": db.count_tweets(account.name),
+                    "tweets_this_run": account.tweet_counter,
+                    "pending_candidates": len(account.candidate_queue),
+                    "prefetch": account.prefetcher.stats(),
+                    "jobs": account.candidate_queue.state_counts(),
+                    "near_duplicate_index": account.title_index.stats(),
+                    "rate_limits": account.rate_governor.stats(),
+                }
+                for account in accounts
+            },
+            "sources":
+            source_registry.stats(),
+            "source_polling":
+            source_poller.stats(),
+            "scheduled_jobs_in_seconds":
+            scheduler.snapshot(),
+            "logging":
+            log_config.stats(),
             "last_5_tweets_in_db":
             last_tweets_formatted,
             "current_server_time_utc":
@@ -725,10 +1607,10 @@ def debug_info():
 # --- UYGULAMA BAŞLATMA ---
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 10000))
-    print(f"🌐 Uygulama {port} portunda başlatılıyor...")
+    log.info("🌐 Uygulama %d portunda başlatılıyor...", port)
     if not (hasattr(app, 'bot_thread') and app.bot_thread.is_alive()):
-        print("⚙️ Ana uygulama başlatılırken bot da başlatılıyor...")
+        log.info("⚙️ Ana uygulama başlatılırken bot da başlatılıyor...")
         app.bot_thread = Thread(target=run_bot, daemon=True)
         app.bot_thread.start()
-        print("🟢 Bot arka planda çalışmaya başladı.")
+        log.info("🟢 Bot arka planda çalışmaya başladı.")
     app.run(host="0.0.0.0", port=port, debug=False)
\ No newline at end of file
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""Bellek içi görsel hattı: sınırlı indirme, format tespiti, küçültme/sıkıştırma."""
+
+import io
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+# Dosya imzası (magic bytes) -> (format adı, dosya uzantısı)
+_SIGNATURES = [
+    (b'\xff\xd8\xff', ('jpeg', 'jpg')),
+    (b'\x89PNG\r\n\x1a\n', ('png', 'png')),
+    (b'GIF87a', ('gif', 'gif')),
+    (b'GIF89a', ('gif', 'gif')),
+]
+
+JPEG_QUALITY_STEPS = (85, 75, 65, 55, 45)
+MAX_DIMENSION = 4096  # Twitter'ın kabul ettiği makul en büyük kenar
+DOWNSCALE_STEP = 0.75  # Sığmadığında her adımda kenarları bu oranla küçült
+
+
+class ImageTooLargeError(ValueError):
+    pass
+
+
+def detect_image_format(data):
+    """content-type yerine dosya imzasına göre (format, uzantı) döndürür."""
+    for signature, fmt in _SIGNATURES:
+        if data.startswith(signature):
+            return fmt
+    if len(data) >= 12 and data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'webp', 'webp'
+    return None
+
+
+def download_image(session, url, max_bytes, timeout=30):
+    """Görseli en fazla max_bytes'lık bir tampona indirir."""
+    with session.get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        declared = response.headers.get('content-length')
+        if declared and declared.isdigit() and int(declared) > max_bytes:
+            raise ImageTooLargeError(
+                f"Görsel çok büyük ({int(declared) / (1024 * 1024):.2f} MB)")
+        buffer = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            buffer.extend(chunk)
+            if len(buffer) > max_bytes:
+                raise ImageTooLargeError(
+                    f"Görsel {max_bytes / (1024 * 1024):.0f} MB indirme sınırını aşıyor")
+        return bytes(buffer)
+
+
+def _to_rgb(image):
+    # JPEG saydamlık desteklemez: saydam pikselleri beyaz zemine oturt
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P'
+                                        and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def fit_image(data, max_bytes):
+    """Görseli max_bytes'a sığdırır; (baytlar, uzantı) döndürür.
+
+    Zaten sığan ve tanınan görseller olduğu gibi döner. Sığmayanlar JPEG'e
+    çevrilip önce kalite, sonra boyut düşürülerek yeniden sıkıştırılır.
+    """
+    fmt = detect_image_format(data)
+    if fmt is None:
+        raise ValueError("Tanınmayan görsel formatı")
+    if len(data) <= max_bytes:
+        return data, fmt[1]
+
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()  # Animasyonlu GIF/WebP ise sadece ilk kare kullanılır
+        image = _to_rgb(image)
+
+    if max(image.size) > MAX_DIMENSION:
+        image.thumbnail((MAX_DIMENSION, MAX_DIMENSION), Image.LANCZOS)
+
+    while True:
+        for quality in JPEG_QUALITY_STEPS:
+            output = io.BytesIO()
+            image.save(output, format='JPEG', quality=quality, optimize=True)
+            if output.tell() <= max_bytes:
+                return output.getvalue(), 'jpg'
+        width, height = image.size
+        if min(width, height) < 64:
+            raise ImageTooLargeError("Görsel hedef boyuta sıkıştırılamadı")
+        image = image.resize((max(1, int(width * DOWNSCALE_STEP)),
+                              max(1, int(height * DOWNSCALE_STEP))),
+                             Image.LANCZOS)
+
+
+def prepare_image(session, url, max_download_bytes, max_upload_bytes):
+    """Görseli indirip yüklemeye hazırlar: (dosya nesnesi, dosya adı)."""
+    data = download_image(session, url, max_download_bytes)
+    image_bytes, extension = fit_image(data, max_upload_bytes)
+    return io.BytesIO(image_bytes), f"media.{extension}"
+
+
+class MediaCache:
+    """Haber linki başına hazırlanmış görselin küçük LRU önbelleği.
+
+    Aynı haber birden fazla hesapta paylaşılırken sayfa ve görsel bir kez
+    indirilip işlenir. Aynı anahtar için eşzamanlı çağrılar ilk hazırlığın
+    bitmesini bekler; "görsel yok" (None) sonucu da saklanır, hatalar saklanmaz.
+    """
+
+    def __init__(self, max_items=8):
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._pending = set()
+        self._cond = threading.Condition()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_prepare(self, key, prepare_fn):
+        with self._cond:
+            while key in self._pending:
+                self._cond.wait()
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self._pending.add(key)
+            self.misses += 1
+        try:
+            value = prepare_fn()
+        except BaseException:
+            with self._cond:
+                self._pending.discard(key)
+                self._cond.notify_all()
+            raise
+        with self._cond:
+            self._pending.discard(key)
+            self._items[key] = value
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+            self._cond.notify_all()
+        return value
+
+    def stats(self):
+        with self._cond:
+            return {
+                "items": len(self._items),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
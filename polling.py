@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""Kaynak başına, gözlenen yayın hızına göre uyarlanan yoklama aralıkları."""
+
+import random
+import time
+from threading import Lock
+
+
+class SourcePollStats:
+    __slots__ = ('polls', 'unchanged', 'new_items', 'last_poll_at',
+                 'rate_per_hour', 'interval')
+
+    def __init__(self, interval):
+        self.polls = 0
+        self.unchanged = 0  # 304 ya da hiç yeni haber yok
+        self.new_items = 0
+        self.last_poll_at = None
+        self.rate_per_hour = None  # Yeni haber gelme hızının EWMA tahmini
+        self.interval = interval
+
+
+class AdaptivePoller:
+    """Her kaynağın ne sıklıkla yeni haber yayınladığını izler.
+
+    Yeni haber hızı (haber/saat) üstel hareketli ortalamayla tahmin edilir ve
+    bir sonraki yoklama, ortalama `target_new_items` yeni haber birikecek
+    zamana ayarlanır. Değişmeyen / boş yoklamalar hızı düşürür, böylece sessiz
+    kaynaklar adım adım (en fazla max_growth katı) tavana, hareketli kaynaklar
+    tabana yaklaşır.
+    """
+
+    def __init__(self, floor, ceiling, initial, target_new_items=1.0,
+                 smoothing=0.3, max_growth=1.5, jitter=0.1):
+        self.floor = floor
+        self.ceiling = ceiling
+        self.initial = initial
+        self.target_new_items = target_new_items
+        self.smoothing = smoothing
+        self.max_growth = max_growth
+        self.jitter = jitter
+        self._stats = {}
+        self._lock = Lock()
+
+    def _clamp(self, seconds):
+        return max(self.floor, min(self.ceiling, seconds))
+
+    def record(self, source, new_items, unchanged=False, now=None):
+        """Bir yoklamanın sonucunu kaydeder; sonraki aralığı (sn) döndürür."""
+        now = time.time() if now is None else now
+        with self._lock:
+            stats = self._stats.get(source)
+            if stats is None:
+                stats = self._stats[source] = SourcePollStats(self.initial)
+            stats.polls += 1
+            stats.new_items += new_items
+            if unchanged or not new_items:
+                stats.unchanged += 1
+
+            if stats.last_poll_at is not None:
+                elapsed_hours = max(now - stats.last_poll_at, 1.0) / 3600
+                observed = new_items / elapsed_hours
+                if stats.rate_per_hour is None:
+                    stats.rate_per_hour = observed
+                else:
+                    stats.rate_per_hour += self.smoothing * (
+                        observed - stats.rate_per_hour)
+                # Aralık bir adımda en fazla max_growth katına çıkar
+                grown = stats.interval * self.max_growth
+                if stats.rate_per_hour > 0:
+                    target = self.target_new_items / stats.rate_per_hour * 3600
+                    stats.interval = self._clamp(min(target, grown))
+                else:
+                    stats.interval = self._clamp(grown)
+            stats.last_poll_at = now
+            interval = stats.interval
+
+        # Kaynakların aynı anda yoklanmaması için küçük rastgele sapma
+        spread = interval * self.jitter
+        return self._clamp(interval + random.uniform(-spread, spread))
+
+    def stats(self):
+        with self._lock:
+            return {
+                source: {
+                    "polls": s.polls,
+                    "unchanged_ratio": round(s.unchanged / s.polls, 3)
+                    if s.polls else 0.0,
+                    "new_items": s.new_items,
+                    "rate_per_hour": round(s.rate_per_hour, 3)
+                    if s.rate_per_hour is not None else None,
+                    "interval_minutes": round(s.interval / 60, 1),
+                }
+                for source, s in self._stats.items()
+            }
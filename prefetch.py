@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Sıradaki haberlerin tweet'lerini ortak işçi havuzunda önceden hazırlayan yardımcı."""
+
+import threading
+
+from logs import get_logger
+
+log = get_logger(__name__)
+
+
+class Prefetcher:
+    """Sıradaki adaylar için prepare_fn'i paylaşılan bir havuzda paralel çalıştırır.
+
+    prepare_fn(news_item) hazırlanmış tweet'i ya da None döndürmelidir.
+    Her aday havuza ayrı bir iş olarak verilir; executor (ör.
+    ThreadPoolExecutor) tüm hesaplar arasında paylaşılır ve eşzamanlılığı
+    sınırlar. take(link) hazırlık sürüyorsa bitmesini bekler, böylece aynı
+    haber iki kez hazırlanmaz (ve görseli iki kez yüklenmez).
+    """
+
+    def __init__(self, prepare_fn, executor, max_items=2):
+        self.prepare_fn = prepare_fn
+        self.executor = executor
+        self.max_items = max_items
+        self._prepared = {}
+        self._pending = set()
+        self._cond = threading.Condition()
+        self._stop = False
+
+    def start(self, news_items):
+        """İlk max_items adayı havuzda hazırlar; pencereden çıkanları bırakır.
+
+        Bırakılan hazırlıkların metni ve media_id'si aday kuyruğunda
+        kayıtlı kaldığından yeniden hazırlamak ucuzdur.
+        """
+        window = news_items[:self.max_items]
+        links = {item['link'] for item in window}
+        with self._cond:
+            self._stop = False
+            for link in list(self._prepared):
+                if link not in links:
+                    del self._prepared[link]
+            items = [
+                item for item in window
+                if item['link'] not in self._prepared
+                and item['link'] not in self._pending
+            ]
+            self._pending.update(item['link'] for item in items)
+        for item in items:
+            try:
+                self.executor.submit(self._prepare, item)
+            except RuntimeError:  # Havuz kapatılmış (uygulama kapanıyor)
+                self._finish(item['link'], None)
+        return bool(items)
+
+    def _prepare(self, item):
+        with self._cond:
+            stopped = self._stop
+        prepared = None
+        if not stopped:
+            try:
+                prepared = self.prepare_fn(item)
+            except Exception as e:
+                log.warning("⚠️ Ön hazırlık hatası (%s): %s", item.get('link'), e,
+                            extra={'link': item.get('link'), 'stage': 'prefetch'})
+        self._finish(item['link'], prepared)
+
+    def _finish(self, link, prepared):
+        with self._cond:
+            if prepared is not None:
+                self._prepared[link] = prepared
+            self._pending.discard(link)
+            self._cond.notify_all()
+
+    def take(self, link):
+        """Hazırlanmış tweet'i döndürür ve önbellekten çıkarır; yoksa None."""
+        with self._cond:
+            while link in self._pending:
+                self._cond.wait()
+            return self._prepared.pop(link, None)
+
+    def stop(self):
+        """Havuzda sırası gelmemiş hazırlıkları iptal eder (sürenler tamamlanır)."""
+        with self._cond:
+            self._stop = True
+
+    def retain(self, links):
+        """Verilen linkler dışındaki hazırlıkları (ve görsel baytlarını) bırakır."""
+        links = set(links)
+        with self._cond:
+            for link in list(self._prepared):
+                if link not in links:
+                    del self._prepared[link]
+
+    def stats(self):
+        with self._cond:
+            return {
+                "prepared": len(self._prepared),
+                "in_progress": len(self._pending),
+            }
+
+    def __len__(self):
+        with self._cond:
+            return len(self._prepared)
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""Twitter paylaşım yolu için kalıcı token-bucket hız yöneticisi."""
+
+import time
+from threading import Lock
+from urllib.parse import urlparse
+
+from logs import get_logger
+
+log = get_logger(__name__)
+
+# Yanıt başlığı öneki -> pencere adı
+_HEADER_WINDOWS = (
+    ('x-rate-limit', '15m'),
+    ('x-user-limit-24hour', '24h'),
+    ('x-app-limit-24hour', '24h'),
+)
+
+
+class TokenBucket:
+    """`period` saniyede en fazla `limit` isteğe izin veren kova.
+
+    Kapasite `burst` ile sınırlıdır ve kova (limit - burst) / period hızında
+    dolar; böylece herhangi bir `period` aralığında toplam istek limit'i
+    geçmez. API başlıkları kalan hakkın sıfırlandığını söylerse kova
+    blocked_until'e kadar kilitlenir.
+    """
+
+    def __init__(self, limit, period, burst=1):
+        self.limit = limit
+        self.period = period
+        self.capacity = max(1, min(burst, limit))
+        self.refill_rate = max(limit - self.capacity, 1) / period
+        self.tokens = float(self.capacity)
+        self.updated_at = time.time()
+        self.blocked_until = 0.0
+
+    def _refill(self, now):
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity,
+                          self.tokens + elapsed * self.refill_rate)
+        self.updated_at = now
+
+    def time_until_available(self, now=None):
+        now = time.time() if now is None else now
+        self._refill(now)
+        wait = max(0.0, (1 - self.tokens) / self.refill_rate)
+        return max(wait, self.blocked_until - now)
+
+    def consume(self, now=None):
+        now = time.time() if now is None else now
+        self._refill(now)
+        self.tokens = max(self.tokens - 1, -self.capacity)
+
+    def observe(self, remaining, reset_at, now=None):
+        """API'nin bildirdiği kalan hak ve sıfırlanma zamanını uygular."""
+        now = time.time() if now is None else now
+        self._refill(now)
+        self.tokens = min(self.tokens, float(remaining))
+        if remaining <= 0 and reset_at:
+            self.blocked_until = max(self.blocked_until, reset_at)
+
+
+class RateGovernor:
+    """Uç nokta başına (ör. tweet_create, media_upload) pencere kovaları.
+
+    limits: {uç_nokta: {pencere: (limit, süre_sn, burst)}}. Durum
+    storage.Database üzerinden saklanır, yeniden başlatmada kaldığı yerden
+    devam eder. Birden fazla hesap varsa her hesabın kendi yöneticisi olur;
+    `namespace` kayıtları tabloda birbirinden ayırır.
+    """
+
+    def __init__(self, db, limits, namespace=''):
+        self.db = db
+        self.namespace = namespace
+        self._lock = Lock()
+        self._buckets = {
+            endpoint: {
+                window: TokenBucket(limit, period, burst)
+                for window, (limit, period, burst) in windows.items()
+            }
+            for endpoint, windows in limits.items()
+        }
+        self._load()
+
+    def _load(self):
+        try:
+            for key, window, tokens, updated_at, blocked_until in self.db.load_rate_limits():
+                namespace, _, endpoint = key.rpartition('/')
+                if namespace != self.namespace:
+                    continue
+                bucket = self._buckets.get(endpoint, {}).get(window)
+                if bucket is not None:
+                    bucket.tokens = min(bucket.capacity, tokens)
+                    bucket.updated_at = updated_at
+                    bucket.blocked_until = blocked_until
+        except Exception as e:
+            log.error("❌ Hız limiti durumu okunamadı: %s", e)
+
+    def _save(self, endpoint):
+        try:
+            key = f"{self.namespace}/{endpoint}" if self.namespace else endpoint
+            self.db.save_rate_limits([
+                (key, window, bucket.tokens, bucket.updated_at,
+                 bucket.blocked_until)
+                for window, bucket in self._buckets[endpoint].items()
+            ])
+        except Exception as e:
+            log.error("❌ Hız limiti durumu yazılamadı: %s", e)
+
+    def time_until(self, endpoint):
+        """Uç noktanın tüm pencerelerinde hak açılana kadar kalan süre (sn)."""
+        with self._lock:
+            buckets = self._buckets.get(endpoint, {})
+            now = time.time()
+            return max((b.time_until_available(now) for b in buckets.values()),
+                       default=0.0)
+
+    def consume(self, endpoint):
+        with self._lock:
+            if endpoint not in self._buckets:
+                return
+            now = time.time()
+            for bucket in self._buckets[endpoint].values():
+                bucket.consume(now)
+            self._save(endpoint)
+
+    def block(self, endpoint, window, until):
+        """Pencereyi verilen zamana (epoch) kadar kilitler."""
+        with self._lock:
+            bucket = self._buckets.get(endpoint, {}).get(window)
+            if bucket is None:
+                return
+            bucket.observe(0, until)
+            self._save(endpoint)
+
+    @staticmethod
+    def endpoint_for(method, url):
+        path = urlparse(url).path
+        if method == 'POST' and path.rstrip('/').endswith('/2/tweets'):
+            return 'tweet_create'
+        if 'media/upload' in path:
+            return 'media_upload'
+        return None
+
+    def observe_response(self, response, *args, **kwargs):
+        """requests yanıt kancası: x-rate-limit-* başlıklarını kovalara işler."""
+        try:
+            request = response.request
+            endpoint = self.endpoint_for(request.method, request.url)
+            if endpoint is None or endpoint not in self._buckets:
+                return
+            headers = response.headers
+            changed = False
+            with self._lock:
+                for prefix, window in _HEADER_WINDOWS:
+                    remaining = headers.get(f'{prefix}-remaining')
+                    bucket = self._buckets[endpoint].get(window)
+                    if remaining is None or bucket is None:
+                        continue
+                    reset = headers.get(f'{prefix}-reset')
+                    bucket.observe(int(remaining),
+                                   float(reset) if reset else None)
+                    changed = True
+                if changed:
+                    self._save(endpoint)
+        except Exception as e:
+            log.warning("⚠️ Hız limiti başlıkları işlenemedi: %s", e)
+
+    def attach(self, session):
+        """Verilen requests.Session'ın yanıtlarını izlemeye başlar."""
+        session.hooks['response'].append(self.observe_response)
+
+    def stats(self):
+        with self._lock:
+            now = time.time()
+            return {
+                endpoint: {
+                    window: {
+                        "tokens": round(bucket.tokens, 2),
+                        "limit": bucket.limit,
+                        "wait_seconds": round(bucket.time_until_available(now)),
+                    }
+                    for window, bucket in windows.items()
+                }
+                for endpoint, windows in self._buckets.items()
+            }
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""Zamanlanmış işler için öncelik kuyruklu, iptal edilebilir zamanlayıcı."""
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from logs import get_logger
+
+log = get_logger(__name__)
+
+# Aynı anahtarlı iş hâlâ çalışıyorsa yeni çalıştırma bu kadar ertelenir
+BUSY_RETRY_DELAY = 1.0
+
+
+class Job:
+    __slots__ = ('key', 'fn', 'args', 'due', 'cancelled', 'pool')
+
+    def __init__(self, key, fn, args, due, pool=None):
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.due = due
+        self.cancelled = False
+        self.pool = pool
+
+
+class Scheduler:
+    """Anahtarlı işleri zamanı gelince bir thread havuzunda çalıştırır.
+
+    Her anahtar için en fazla bir bekleyen iş vardır; aynı anahtarla tekrar
+    schedule() çağrılırsa önceki iptal edilir. Aynı anahtarlı iki iş asla
+    aynı anda çalışmaz. pools ile ayrı işçi havuzları tanımlanabilir
+    (ör. {'post': 2}); schedule(..., pool='post') ile verilen işler o havuzda
+    çalışır, varsayılan havuzdaki uzun süren işler onları bekletmez.
+    """
+
+    def __init__(self, max_workers=4, pools=None):
+        self.max_workers = max_workers
+        self.pools = dict(pools or {})
+        self._heap = []
+        self._jobs = {}
+        self._running = set()
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stopping = threading.Event()
+
+    @property
+    def stopping(self):
+        return self._stopping.is_set()
+
+    def schedule(self, key, delay, fn, *args, pool=None):
+        """fn(*args)'ı `delay` saniye sonra çalıştırır; aynı anahtarlı işi değiştirir."""
+        if pool is not None and pool not in self.pools:
+            raise ValueError(f"Tanımsız işçi havuzu: {pool}")
+        with self._cond:
+            old = self._jobs.get(key)
+            if old is not None:
+                old.cancelled = True
+            job = Job(key, fn, args, time.monotonic() + max(0.0, delay), pool)
+            self._jobs[key] = job
+            heapq.heappush(self._heap, (job.due, next(self._seq), job))
+            self._cond.notify()
+            return job
+
+    def cancel(self, key):
+        with self._cond:
+            job = self._jobs.pop(key, None)
+            if job is not None:
+                job.cancelled = True
+
+    def snapshot(self):
+        with self._cond:
+            now = time.monotonic()
+            return {
+                key: round(max(0.0, job.due - now))
+                for key, job in sorted(self._jobs.items(),
+                                       key=lambda kv: kv[1].due)
+            }
+
+    def stop(self):
+        self._stopping.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    def run_forever(self):
+        """stop() çağrılana kadar işleri çalıştırır (çağıran thread'i bloklar)."""
+        executors = {
+            None: ThreadPoolExecutor(max_workers=self.max_workers,
+                                     thread_name_prefix='scheduler')
+        }
+        for name, workers in self.pools.items():
+            executors[name] = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix=f'scheduler-{name}')
+        try:
+            while not self._stopping.is_set():
+                with self._cond:
+                    while self._heap and self._heap[0][2].cancelled:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0][0] - time.monotonic()
+                    if delay > 0:
+                        self._cond.wait(delay)
+                        continue
+                    _, _, job = heapq.heappop(self._heap)
+                    if job.key in self._running:
+                        job.due = time.monotonic() + BUSY_RETRY_DELAY
+                        heapq.heappush(self._heap,
+                                       (job.due, next(self._seq), job))
+                        continue
+                    if self._jobs.get(job.key) is job:
+                        del self._jobs[job.key]
+                    self._running.add(job.key)
+                executors[job.pool].submit(self._run_job, job)
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run_job(self, job):
+        try:
+            job.fn(*job.args)
+        except Exception as e:
+            log.exception("🔴 Zamanlanmış iş hatası (%s): %s", job.key, e,
+                          extra={'job': job.key})
+        finally:
+            with self._cond:
+                self._running.discard(job.key)
+                self._cond.notify()
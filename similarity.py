@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""Farklı kaynaklardaki aynı haberi yakalamak için başlık benzerlik indeksi."""
+
+import re
+import time
+from threading import Lock
+
+_WORD_RE = re.compile(r"[a-z0-9$]+")
+_STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or over
+says said than that the this to up was were will with after amid new report
+""".split())
+
+
+def title_tokens(title):
+    """Başlığı karşılaştırma için anlamlı kelime kümesine çevirir."""
+    tokens = set()
+    for word in _WORD_RE.findall(title.lower()):
+        if word in _STOPWORDS or len(word) < 2:
+            continue
+        # Basit çoğul eki normalizasyonu: "prices" -> "price"
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        tokens.add(word)
+    return frozenset(tokens)
+
+
+class TitleIndex:
+    """Son paylaşılan başlıklar üzerinde ters indeksli Jaccard benzerliği.
+
+    Her kelime için o kelimeyi içeren linkler tutulur; yeni bir başlık sadece
+    en az bir kelimeyi paylaştığı başlıklarla karşılaştırılır, bu yüzden
+    sorgu maliyeti tablo boyutuna değil ortak kelime sayısına bağlıdır.
+    Kaynak verisi tweets tablosudur (title = orijinal başlık); indeks
+    başlangıçta son `window` saniyelik kayıtlardan kurulur.
+    """
+
+    def __init__(self, threshold=0.6, window=3 * 24 * 60 * 60):
+        self.threshold = threshold
+        self.window = window
+        self._docs = {}  # link -> (kelimeler, eklenme zamanı)
+        self._postings = {}  # kelime -> {link}
+        self._lock = Lock()
+        self.lookups = 0
+        self.matches = 0
+
+    def load(self, rows):
+        """(link, başlık, eklenme_zamanı_epoch) satırlarından indeksi kurar."""
+        with self._lock:
+            self._docs.clear()
+            self._postings.clear()
+        for link, title, created_at in rows:
+            self.add(link, title, created_at)
+
+    def add(self, link, title, created_at=None):
+        tokens = title_tokens(title or "")
+        if not tokens:
+            return
+        created_at = time.time() if created_at is None else created_at
+        with self._lock:
+            self._remove_locked(link)
+            self._docs[link] = (tokens, created_at)
+            for token in tokens:
+                self._postings.setdefault(token, set()).add(link)
+
+    def _remove_locked(self, link):
+        doc = self._docs.pop(link, None)
+        if doc is None:
+            return
+        for token in doc[0]:
+            links = self._postings.get(token)
+            if links is not None:
+                links.discard(link)
+                if not links:
+                    del self._postings[token]
+
+    def find_similar(self, title, exclude_link=None):
+        """Eşiği geçen en benzer (link, skor) çiftini döndürür; yoksa None."""
+        tokens = title_tokens(title or "")
+        if not tokens:
+            return None
+        with self._lock:
+            self.lookups += 1
+            overlaps = {}
+            for token in tokens:
+                for link in self._postings.get(token, ()):
+                    overlaps[link] = overlaps.get(link, 0) + 1
+            best = None
+            for link, shared in overlaps.items():
+                if link == exclude_link:
+                    continue
+                other = self._docs[link][0]
+                score = shared / (len(tokens) + len(other) - shared)
+                if score >= self.threshold and (best is None
+                                                or score > best[1]):
+                    best = (link, score)
+            if best is not None:
+                self.matches += 1
+            return best
+
+    def prune(self):
+        """window'dan eski başlıkları indeksten çıkarır."""
+        cutoff = time.time() - self.window
+        with self._lock:
+            old = [link for link, (_, created_at) in self._docs.items()
+                   if created_at < cutoff]
+            for link in old:
+                self._remove_locked(link)
+        return len(old)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "titles": len(self._docs),
+                "tokens": len(self._postings),
+                "lookups": self.lookups,
+                "near_duplicates": self.matches,
+                "threshold": self.threshold,
+            }
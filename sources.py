@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""JSON dosyasından yüklenen, bot durmadan yeniden okunabilen haber kaynakları."""
+
+import json
+import os
+from threading import Lock
+from urllib.parse import urlparse
+
+DEFAULT_ENTRY_LIMIT = 7  # Kaynak başına işlenecek en yeni entry sayısı
+
+
+def _host(url):
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class Source:
+    """Tek bir RSS kaynağının ayarları.
+
+    poll_interval (sn) verilirse kaynak sabit aralıkla, verilmezse yayın
+    hızına göre uyarlanan aralıkla yoklanır. image_selectors makale
+    sayfasında meta tag bulunamazsa denenecek <img> öznitelikleridir ve
+    article_hosts'taki (varsayılan: feed'in alan adı) linkler için geçerlidir.
+    """
+
+    __slots__ = ('name', 'url', 'entry_limit', 'poll_interval', 'weight',
+                 'headers', 'article_hosts', 'image_selectors')
+
+    def __init__(self, name, url, entry_limit=DEFAULT_ENTRY_LIMIT,
+                 poll_interval=None, weight=1.0, headers=None,
+                 article_hosts=None, image_selectors=None):
+        self.name = name
+        self.url = url
+        self.entry_limit = entry_limit
+        self.poll_interval = poll_interval
+        self.weight = weight
+        self.headers = dict(headers or {})
+        self.article_hosts = tuple(
+            h.lower() for h in (article_hosts or [_host(url)]))
+        self.image_selectors = list(image_selectors or [])
+
+    @classmethod
+    def from_config(cls, data):
+        name = data.get('name')
+        url = data.get('url')
+        if not name or not url:
+            raise ValueError(f"Kaynak tanımında 'name' ve 'url' zorunlu: {data}")
+        entry_limit = int(data.get('entry_limit', DEFAULT_ENTRY_LIMIT))
+        poll_interval = data.get('poll_interval')
+        if entry_limit < 1:
+            raise ValueError(f"{name}: entry_limit en az 1 olmalı")
+        if poll_interval is not None and float(poll_interval) <= 0:
+            raise ValueError(f"{name}: poll_interval pozitif olmalı")
+        return cls(name,
+                   url,
+                   entry_limit=entry_limit,
+                   poll_interval=float(poll_interval)
+                   if poll_interval is not None else None,
+                   weight=float(data.get('weight', 1.0)),
+                   headers=data.get('headers'),
+                   article_hosts=data.get('article_hosts'),
+                   image_selectors=data.get('image_selectors'))
+
+    def matches_article(self, url):
+        host = _host(url)
+        return any(host == h or host.endswith('.' + h)
+                   for h in self.article_hosts)
+
+    def _key(self):
+        return (self.url, self.entry_limit, self.poll_interval, self.weight,
+                sorted(self.headers.items()), self.article_hosts,
+                self.image_selectors)
+
+    def __eq__(self, other):
+        return isinstance(other, Source) and (self.name, self._key()) == (
+            other.name, other._key())
+
+    def __repr__(self):
+        return f"Source({self.name!r}, {self.url!r})"
+
+
+class SourceRegistry:
+    """Kaynak listesini JSON dosyasından okur ve değiştikçe yeniden yükler.
+
+    Dosya biçimi: {"sources": [{"name": ..., "url": ..., ...}, ...]}.
+    "enabled": false olan kaynaklar atlanır. Hatalı bir dosya yüklenmez;
+    önceki geçerli liste kullanılmaya devam eder.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._sources = {}
+        self._mtime = None
+        self._lock = Lock()
+        self.last_error = None
+
+    def _read(self):
+        with open(self.path, encoding='utf-8') as f:
+            config = json.load(f)
+        sources = {}
+        for data in config.get('sources', []):
+            if not data.get('enabled', True):
+                continue
+            source = Source.from_config(data)
+            if source.name in sources:
+                raise ValueError(f"Kaynak adı tekrar ediyor: {source.name}")
+            sources[source.name] = source
+        return sources
+
+    def load(self):
+        """Dosyayı okur; (eklenen, silinen, değişen) kaynak adlarını döndürür."""
+        mtime = os.path.getmtime(self.path)
+        try:
+            sources = self._read()
+        except Exception as e:
+            self._mtime = mtime  # Aynı hatalı dosya tekrar tekrar okunmasın
+            self.last_error = str(e)
+            raise
+        with self._lock:
+            old = self._sources
+            self._sources = sources
+            self._mtime = mtime
+            self.last_error = None
+        added = [name for name in sources if name not in old]
+        removed = [name for name in old if name not in sources]
+        changed = [
+            name for name in sources if name in old and old[name] != sources[name]
+        ]
+        return added, removed, changed
+
+    def reload_if_changed(self):
+        """Dosya değiştiyse yeniden yükler; değişmediyse None döndürür."""
+        if os.path.getmtime(self.path) == self._mtime:
+            return None
+        return self.load()
+
+    def get(self, name):
+        with self._lock:
+            return self._sources.get(name)
+
+    def sources(self):
+        """Ad -> Source sözlüğünün (dosyadaki sırayla) bir kopyası."""
+        with self._lock:
+            return dict(self._sources)
+
+    def weights(self):
+        with self._lock:
+            return {name: s.weight for name, s in self._sources.items()}
+
+    def image_selectors_for(self, url):
+        """Makale linkinin ait olduğu kaynağın <img> seçicileri."""
+        with self._lock:
+            for source in self._sources.values():
+                if source.image_selectors and source.matches_article(url):
+                    return source.image_selectors
+        return []
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sources)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "path": self.path,
+                "sources": list(self._sources),
+                "last_error": self.last_error,
+            }
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""tweets.db erişim katmanı: thread başına uzun ömürlü SQLite bağlantısı."""
+
+import sqlite3
+import threading
+
+# SQLite'ın parametre limitine takılmamak için IN sorgularındaki parça boyu
+IN_QUERY_CHUNK = 500
+# Hesap sütunu eklenmeden önceki kayıtların ait olduğu (birincil) hesap
+DEFAULT_ACCOUNT = 'default'
+
+
+def _seen_key(account, link):
+    # Tekrar indeksi hesap başına ayrı tutulmaz; anahtar (hesap, link) çiftidir
+    return f"{account}\n{link}"
+
+
+class Database:
+    """Thread başına tek bağlantı açan, WAL modunda çalışan SQLite katmanı.
+
+    Flask istek thread'leri ile bot thread'i aynı dosyayı paylaşır; WAL modu
+    okuyucuların yazarı (ve yazarın okuyucuları) bekletmesini engeller.
+    Sorgular sabit SQL metinleriyle çalıştırılır, böylece sqlite3'ün bağlantı
+    başına hazırlanmış ifade önbelleğinden faydalanılır.
+    """
+
+    def __init__(self, db_path, timeout=30, seen_index=None):
+        self.db_path = db_path
+        self.timeout = timeout
+        self._local = threading.local()
+        # dedup_index.SeenIndex: olumsuz yanıtlar bellekten verilir
+        self.seen_index = seen_index
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path,
+                                   timeout=self.timeout,
+                                   cached_statements=256)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Çağıran thread'in bağlantısını kapatır."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def init_schema(self):
+        conn = self.connection()
+        with conn:
+            conn.execute('''CREATE TABLE IF NOT EXISTS tweets
+                        (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        account TEXT NOT NULL DEFAULT 'default',
+                        title TEXT NOT NULL,
+                        link TEXT NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        UNIQUE (account, link))''')
+            self._migrate_tweets_account(conn)
+            # RSS kaynakları için koşullu GET (ETag / Last-Modified) önbelleği
+            conn.execute('''CREATE TABLE IF NOT EXISTS feed_cache
+                        (url TEXT PRIMARY KEY,
+                        etag TEXT,
+                        last_modified TEXT,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+            # Twitter uç noktaları için token-bucket durumları
+            conn.execute('''CREATE TABLE IF NOT EXISTS rate_limits
+                        (endpoint TEXT NOT NULL,
+                        window TEXT NOT NULL,
+                        tokens REAL NOT NULL,
+                        updated_at REAL NOT NULL,
+                        blocked_until REAL NOT NULL DEFAULT 0,
+                        PRIMARY KEY (endpoint, window))''')
+
+    def _migrate_tweets_account(self, conn):
+        """Eski şemadaki (link UNIQUE) tabloyu hesap başına tekilliğe taşır."""
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(tweets)")]
+        if 'account' in columns:
+            return
+        # SQLite UNIQUE kısıtını değiştiremediği için tablo tek işlemde
+        # yeniden kurulur
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        conn.execute("ALTER TABLE tweets RENAME TO tweets_old")
+        conn.execute('''CREATE TABLE tweets
+                    (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    account TEXT NOT NULL DEFAULT 'default',
+                    title TEXT NOT NULL,
+                    link TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE (account, link))''')
+        conn.execute(
+            "INSERT INTO tweets (id, account, title, link, created_at) "
+            "SELECT id, ?, title, link, created_at FROM tweets_old",
+            (DEFAULT_ACCOUNT, ))
+        conn.execute("DROP TABLE tweets_old")
+
+    # --- tweets ---
+    def load_seen_index(self):
+        """Bellek içi indeksi tweets tablosundan (yeniden) kurar."""
+        if self.seen_index is None:
+            return
+        rows = self.connection().execute("SELECT account, link FROM tweets")
+        self.seen_index.load(_seen_key(account, link) for account, link in rows)
+
+    def _index_added(self, account, links):
+        if self.seen_index is None:
+            return
+        for link in links:
+            self.seen_index.add(_seen_key(account, link))
+        if self.seen_index.needs_rebuild():
+            self.load_seen_index()
+
+    def is_seen(self, link, account=DEFAULT_ACCOUNT):
+        if self.seen_index is not None and not self.seen_index.might_contain(
+                _seen_key(account, link)):
+            return False
+        row = self.connection().execute(
+            "SELECT 1 FROM tweets WHERE account=? AND link=?",
+            (account, link)).fetchone()
+        return row is not None
+
+    def filter_unseen(self, links, account=DEFAULT_ACCOUNT):
+        """Verilen linklerden hesabın tablosunda olmayanları (sırayı koruyarak) döndürür."""
+        if not links:
+            return []
+        # Sadece indeksin "olabilir" dediği linkler veritabanından doğrulanır
+        if self.seen_index is not None:
+            candidates = [
+                link for link in links
+                if self.seen_index.might_contain(_seen_key(account, link))
+            ]
+        else:
+            candidates = links
+        conn = self.connection()
+        seen = set()
+        for start in range(0, len(candidates), IN_QUERY_CHUNK):
+            chunk = candidates[start:start + IN_QUERY_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            seen.update(row[0] for row in conn.execute(
+                f"SELECT link FROM tweets WHERE account=? AND link IN ({placeholders})",
+                [account] + chunk))
+        return [link for link in links if link not in seen]
+
+    def save(self, title, link, account=DEFAULT_ACCOUNT):
+        """Tek kayıt ekler; hesapta link zaten varsa sqlite3.IntegrityError fırlatır."""
+        conn = self.connection()
+        with conn:
+            conn.execute(
+                "INSERT INTO tweets (account, title, link) VALUES (?, ?, ?)",
+                (account, title, link))
+        self._index_added(account, [link])
+
+    def save_many(self, rows, account=DEFAULT_ACCOUNT):
+        """(title, link) çiftlerini tek işlemde ekler, var olanları atlar.
+
+        Eklenen satır sayısını döndürür.
+        """
+        rows = list(rows)
+        conn = self.connection()
+        with conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO tweets (account, title, link) VALUES (?, ?, ?)",
+                [(account, title, link) for title, link in rows])
+            inserted = conn.total_changes - before
+        self._index_added(account, (link for _, link in rows))
+        return inserted
+
+    def count_tweets(self, account=None):
+        """Toplam (account verilirse sadece o hesabın) tweet sayısı."""
+        if account is None:
+            return self.connection().execute(
+                "SELECT COUNT(*) FROM tweets").fetchone()[0]
+        return self.connection().execute(
+            "SELECT COUNT(*) FROM tweets WHERE account=?",
+            (account, )).fetchone()[0]
+
+    def last_tweets(self, limit=5):
+        return self.connection().execute(
+            "SELECT title, link, created_at, account FROM tweets ORDER BY created_at DESC LIMIT ?",
+            (limit, )).fetchall()
+
+    def recent_titles(self, window_seconds, account=DEFAULT_ACCOUNT):
+        """Hesabın son window_seconds içindeki (link, başlık, epoch) satırları."""
+        return self.connection().execute(
+            "SELECT link, title, CAST(strftime('%s', created_at) AS REAL) FROM tweets "
+            "WHERE account=? AND created_at >= datetime('now', ?)",
+            (account, f'-{int(window_seconds)} seconds')).fetchall()
+
+    # --- feed_cache ---
+    def get_feed_validators(self, url):
+        row = self.connection().execute(
+            "SELECT etag, last_modified FROM feed_cache WHERE url=?",
+            (url, )).fetchone()
+        return row if row else (None, None)
+
+    def save_feed_validators(self, url, etag, last_modified):
+        conn = self.connection()
+        with conn:
+            conn.execute(
+                """INSERT INTO feed_cache (url, etag, last_modified, updated_at)
+                   VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                   ON CONFLICT(url) DO UPDATE SET etag=excluded.etag,
+                   last_modified=excluded.last_modified,
+                   updated_at=excluded.updated_at""",
+                (url, etag, last_modified))
+
+    # --- rate_limits ---
+    def load_rate_limits(self):
+        return self.connection().execute(
+            "SELECT endpoint, window, tokens, updated_at, blocked_until FROM rate_limits"
+        ).fetchall()
+
+    def save_rate_limits(self, rows):
+        conn = self.connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO rate_limits "
+                "(endpoint, window, tokens, updated_at, blocked_until) VALUES (?, ?, ?, ?, ?)",
+                rows)
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""Testler depo kökündeki modülleri doğrudan içe aktarır."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import Database  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Geçici dizinde şeması kurulmuş boş bir tweets.db."""
+    database = Database(str(tmp_path / 'tweets.db'))
+    database.init_schema()
+    yield database
+    database.close()
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""candidates.CandidateQueue testleri."""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+from candidates import CandidateQueue
+
+WEIGHTS = {'major': 2.0, 'minor': 0.5}
+BOOSTS = {'bitcoin': 0.5}
+
+
+def make_news(link, source='major', title='Market update', minutes_ago=0):
+    return {
+        'source': source,
+        'original_title': title,
+        'link': link,
+        'published': datetime.now(timezone.utc) - timedelta(minutes=minutes_ago),
+    }
+
+
+def make_queue(db, account='default'):
+    return CandidateQueue(db, source_weights=WEIGHTS, keyword_boosts=BOOSTS,
+                          half_life=60 * 60, max_age=12 * 60 * 60,
+                          account=account)
+
+
+def enqueue(queue, news):
+    """Haberleri main.enqueue_news gibi kaydedip çevrilmiş olarak sıraya alır."""
+    fetched = queue.push_fetched(news)
+    return queue.mark_translated([dict(item, title=item['original_title'])
+                                  for item in fetched])
+
+
+def drain(queue):
+    links = []
+    while True:
+        item = queue.pop()
+        if item is None:
+            return links
+        links.append(item['link'])
+
+
+NEWS = [
+    make_news('old-major', 'major', minutes_ago=180),
+    make_news('fresh-minor', 'minor', minutes_ago=0),
+    make_news('fresh-major', 'major', minutes_ago=5),
+    make_news('boosted-minor', 'minor', 'Bitcoin rallies', minutes_ago=30),
+    make_news('mid-major', 'major', minutes_ago=60),
+]
+# log(ağırlık * (1 + bonus)) + yayın_zamanı / τ; τ = 1 saat / ln 2
+EXPECTED_ORDER = ['fresh-major', 'mid-major', 'boosted-minor', 'fresh-minor',
+                  'old-major']
+
+
+def test_pop_order_follows_weight_boost_and_freshness(db):
+    queue = make_queue(db)
+    assert enqueue(queue, NEWS) == len(NEWS)
+    assert drain(queue) == EXPECTED_ORDER
+
+
+def test_order_survives_restart(db):
+    enqueue(make_queue(db), NEWS)
+    restarted = make_queue(db)
+    assert len(restarted) == len(NEWS)
+    assert [item['link'] for item in restarted.peek(2)] == EXPECTED_ORDER[:2]
+    assert drain(restarted) == EXPECTED_ORDER
+
+
+def test_popped_and_failed_items_are_not_requeued(db):
+    queue = make_queue(db)
+    enqueue(queue, NEWS)
+    first = queue.pop()
+    queue.mark_failed(first['link'])
+    assert queue.unknown(NEWS) == []
+    assert enqueue(queue, NEWS) == 0
+    assert drain(make_queue(db)) == EXPECTED_ORDER[1:]
+
+
+def test_accounts_have_separate_queues(db):
+    enqueue(make_queue(db, 'default'), NEWS[:2])
+    english = make_queue(db, 'en')
+    assert len(english) == 0
+    assert enqueue(english, NEWS) == len(NEWS)
+    assert len(make_queue(db, 'default')) == 2
+
+
+def test_items_older_than_max_age_are_skipped_and_expired(db):
+    queue = make_queue(db)
+    assert enqueue(queue, [make_news('ancient', minutes_ago=13 * 60)]) == 0
+    enqueue(queue, [make_news('recent')])
+    db.connection().execute(
+        "UPDATE candidates SET published = published - 13 * 3600")
+    db.connection().commit()
+    assert queue.expire() == 1
+    assert queue.unknown([make_news('recent')]) != []
+
+
+def test_expire_keeps_posting_jobs_until_resolved(db):
+    queue = make_queue(db)
+    enqueue(queue, [make_news('stale-posting'), make_news('stale-queued')])
+    item = queue.pop()
+    queue.mark_posting(item['link'], "tweet text", None, 0)
+    db.connection().execute(
+        "UPDATE candidates SET published = published - 13 * 3600")
+    db.connection().commit()
+    assert queue.expire() == 1
+    assert queue.state_counts() == {'posting': 1}
+
+    # Yeniden başlatmada aynı metinle tekrar denenmek üzere sıraya girer
+    restarted = make_queue(db)
+    assert restarted.expire() == 0
+    retried = restarted.pop()
+    assert retried['link'] == item['link']
+    assert retried['tweet_text'] == "tweet text"
+    restarted.mark_posted(retried['link'], '42')
+    assert restarted.expire() == 1
+    assert restarted.state_counts() == {}
+
+
+def test_posting_job_with_saved_tweet_is_resolved_on_restart(db):
+    queue = make_queue(db)
+    enqueue(queue, [make_news('saved'), make_news('unsaved')])
+    for _ in range(2):
+        item = queue.pop()
+        queue.mark_posting(item['link'], "text", None, 0)
+    db.save("Market update", 'saved', 'default')
+    restarted = make_queue(db)
+    assert restarted.state_counts() == {'posted': 1, 'posting': 1}
+    assert restarted.links() == ['unsaved']
+
+
+def test_transitions_are_idempotent(db):
+    queue = make_queue(db)
+    enqueue(queue, [make_news('story')])
+    assert enqueue(queue, [make_news('story')]) == 0
+    item = queue.pop()
+    assert queue.pop() is None
+    queue.mark_media_ready('story', "first text", 'm1', 100)
+    queue.mark_media_ready('story', "second text", 'm2', 200)
+    queue.mark_posting('story', "first text", 'm2', 200)
+    queue.mark_posting('story', "first text", 'm2', 200)
+    queue.mark_posted(item['link'], '42')
+    queue.mark_posted(item['link'])
+    queue.mark_failed(item['link'])
+    queue.mark_media_ready('story', "late text", 'm3', 300)
+    row = db.connection().execute(
+        "SELECT state, tweet_text, media_id, tweet_id FROM candidates "
+        "WHERE link='story'").fetchone()
+    assert row == ('posted', "first text", 'm2', '42')
+    assert len(make_queue(db)) == 0
+
+
+def test_popped_job_is_requeued_after_restart(db):
+    queue = make_queue(db)
+    enqueue(queue, [make_news('story')])
+    queue.pop()
+    assert make_queue(db).pop()['link'] == 'story'
+
+
+def test_legacy_schema_is_migrated(db):
+    conn = db.connection()
+    with conn:
+        conn.execute("DROP TABLE IF EXISTS candidates")
+        # Hesap ve iş sütunlarından önceki tablo
+        conn.execute('''CREATE TABLE candidates
+                     (link TEXT PRIMARY KEY,
+                     source TEXT NOT NULL,
+                     original_title TEXT NOT NULL,
+                     title TEXT NOT NULL,
+                     published REAL NOT NULL,
+                     priority REAL NOT NULL,
+                     state TEXT NOT NULL DEFAULT 'pending',
+                     added_at REAL NOT NULL)''')
+        now = time.time()
+        conn.executemany(
+            "INSERT INTO candidates VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [('pending-link', 'major', 'Old title', 'Eski başlık', now, 1.0,
+              'pending', now),
+             ('taken-link', 'major', 'Taken title', 'Alınmış', now, 2.0,
+              'taken', now),
+             ('posted-link', 'major', 'Posted title', 'Paylaşılmış', now, 3.0,
+              'posted', now)])
+    queue = make_queue(db)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(candidates)")}
+    assert {'account', 'tweet_text', 'media_id', 'media_expires_at',
+            'tweet_id', 'updated_at'} <= columns
+    assert queue.state_counts() == {'translated': 1, 'failed': 1, 'posted': 1}
+    item = queue.pop()
+    assert (item['link'], item['title']) == ('pending-link', 'Eski başlık')
+    assert queue.pop() is None
+    assert len(make_queue(db, 'en')) == 0
+
+
+def test_job_columns_are_added_to_account_table(db):
+    conn = db.connection()
+    with conn:
+        conn.execute("DROP TABLE IF EXISTS candidates")
+        conn.execute('''CREATE TABLE candidates
+                     (account TEXT NOT NULL DEFAULT 'default',
+                     link TEXT NOT NULL,
+                     source TEXT NOT NULL,
+                     original_title TEXT NOT NULL,
+                     title TEXT NOT NULL,
+                     published REAL NOT NULL,
+                     priority REAL NOT NULL,
+                     state TEXT NOT NULL DEFAULT 'pending',
+                     added_at REAL NOT NULL,
+                     PRIMARY KEY (account, link))''')
+        conn.execute(
+            "INSERT INTO candidates VALUES ('en', 'link', 'major', 'Title', "
+            "'Title', ?, 1.0, 'pending', ?)", (time.time(), time.time()))
+    queue = make_queue(db, 'en')
+    item = queue.pop()
+    queue.mark_media_ready(item['link'], "text", 'm1', 100)
+    assert conn.execute(
+        "SELECT state, media_id FROM candidates").fetchone() == (
+            'media_ready', 'm1')
+
+
+def test_requeue_restores_job_and_its_text(db):
+    queue = make_queue(db)
+    enqueue(queue, NEWS)
+    item = queue.pop()
+    queue.mark_media_ready(item['link'], "tweet text", 'm1', time.time() + 60)
+    queue.mark_posting(item['link'], "tweet text", 'm1', time.time() + 60)
+    assert queue.requeue(item)
+    assert queue.unknown(NEWS) == []
+    assert queue.state_counts() == {'translated': 4, 'media_ready': 1}
+    retried = queue.pop()
+    assert retried['link'] == item['link']
+    assert (retried['tweet_text'], retried['media_id']) == ("tweet text", 'm1')
+
+
+def test_requeue_without_prepared_text_stays_translated(db):
+    queue = make_queue(db)
+    enqueue(queue, NEWS[:1])
+    item = queue.pop()
+    assert queue.requeue(item)
+    assert queue.requeue(item) is False  # Zaten sırada
+    assert queue.state_counts() == {'translated': 1}
+    assert 'tweet_text' not in queue.pop()
+
+
+def test_closed_jobs_are_not_requeued(db):
+    queue = make_queue(db)
+    enqueue(queue, NEWS[:2])
+    posted, failed = queue.pop(), queue.pop()
+    queue.mark_posted(posted['link'], '42')
+    queue.mark_failed(failed['link'])
+    assert not queue.requeue(posted)
+    assert not queue.requeue(failed)
+    assert queue.pop() is None
+
+
+def test_rejected_news_is_remembered(db):
+    queue = make_queue(db)
+    rejected = NEWS[:2]  # old-major, fresh-minor
+    assert queue.reject(rejected) == 2
+    assert queue.reject(rejected) == 0
+    assert queue.unknown(NEWS) == NEWS[2:]
+    assert enqueue(queue, NEWS) == 3
+    restarted = make_queue(db)
+    assert restarted.unknown(NEWS) == []
+    assert restarted.state_counts() == {'failed': 2, 'translated': 3}
+    assert drain(restarted) == ['fresh-major', 'mid-major', 'boosted-minor']
+
+
+def test_unknown_skips_news_older_than_max_age(db):
+    queue = make_queue(db)
+    stale = make_news('stale', minutes_ago=13 * 60)
+    fresh = make_news('fresh')
+    assert queue.unknown([stale, fresh]) == [fresh]
+    assert queue.reject([stale]) == 0
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""http_client.read_body testleri."""
+
+import time
+
+import pytest
+import requests
+
+from http_client import read_body
+
+
+class SlowResponse:
+    """Her parçayı `delay` saniye arayla veren sahte akış yanıtı."""
+
+    url = 'http://feed.invalid/rss'
+
+    def __init__(self, chunks, delay=0.0):
+        self.chunks = chunks
+        self.delay = delay
+
+    def iter_content(self, chunk_size=1):
+        for chunk in self.chunks:
+            time.sleep(self.delay)
+            yield chunk
+
+
+def test_reads_whole_body_before_deadline():
+    response = SlowResponse([b'<rss>', b'</rss>'])
+    assert read_body(response, time.monotonic() + 5) == b'<rss></rss>'
+
+
+def test_trickling_body_stops_at_deadline():
+    response = SlowResponse([b'x'] * 1000, delay=0.01)
+    started = time.monotonic()
+    with pytest.raises(requests.exceptions.Timeout):
+        read_body(response, started + 0.05)
+    assert time.monotonic() - started < 1
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""media.MediaCache testleri."""
+
+import pytest
+
+from media import MediaCache
+
+
+def test_definitive_miss_is_cached():
+    cache = MediaCache(max_items=4)
+    calls = []
+
+    def no_image():
+        calls.append(1)
+        return None
+
+    assert cache.get_or_prepare('link', no_image) is None
+    assert cache.get_or_prepare('link', no_image) is None
+    assert len(calls) == 1
+    assert cache.stats() == {"items": 1, "hits": 1, "misses": 1}
+
+
+def test_errors_are_not_cached():
+    cache = MediaCache(max_items=4)
+
+    def flaky():
+        raise ConnectionError("geçici")
+
+    with pytest.raises(ConnectionError):
+        cache.get_or_prepare('link', flaky)
+    # Hata saklanmadı: sonraki deneme gerçekten hazırlar
+    assert cache.get_or_prepare('link', lambda: (b'img', 'media.jpg')) == (
+        b'img', 'media.jpg')
+
+
+def test_least_recently_used_item_is_evicted():
+    cache = MediaCache(max_items=2)
+    cache.get_or_prepare('a', lambda: 'A')
+    cache.get_or_prepare('b', lambda: 'B')
+    cache.get_or_prepare('a', lambda: 'X')  # a en son kullanılan olur
+    cache.get_or_prepare('c', lambda: 'C')
+    assert cache.get_or_prepare('a', lambda: 'X') == 'A'
+    assert cache.get_or_prepare('b', lambda: 'B2') == 'B2'
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""rate_limit.TokenBucket ve RateGovernor testleri."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from rate_limit import RateGovernor, TokenBucket
+
+LIMITS = {
+    'tweet_create': {'15m': (10, 900, 2), '24h': (17, 86400, 1)},
+    'media_upload': {'15m': (50, 900, 5)},
+}
+
+
+def test_refill_rate_keeps_any_period_under_limit():
+    bucket = TokenBucket(limit=10, period=100, burst=2)
+    bucket.updated_at = now = 1000.0
+    assert bucket.capacity == 2
+    assert bucket.refill_rate == pytest.approx(0.08)  # (10 - 2) / 100
+
+    # Açgözlü kullanıcı: hak açıldığı anda tüketir
+    used = 0
+    while now <= 1100.0:
+        wait = bucket.time_until_available(now)
+        if wait > 0:
+            now += wait
+            continue
+        bucket.consume(now)
+        used += 1
+    assert used <= 10
+
+
+def test_wait_time_follows_refill():
+    bucket = TokenBucket(limit=10, period=100, burst=2)
+    bucket.updated_at = 1000.0
+    assert bucket.time_until_available(1000.0) == 0
+    bucket.consume(1000.0)
+    bucket.consume(1000.0)
+    assert bucket.time_until_available(1000.0) == pytest.approx(12.5)
+    assert bucket.time_until_available(1006.25) == pytest.approx(6.25)
+    assert bucket.time_until_available(1012.5) == pytest.approx(0, abs=1e-9)
+    # Kapasiteden fazla birikmez
+    assert bucket.time_until_available(5000.0) == 0
+    assert bucket.tokens == 2
+
+
+def test_block_until_reset_then_unblock():
+    bucket = TokenBucket(limit=10, period=100, burst=2)
+    bucket.updated_at = 1000.0
+    bucket.observe(0, reset_at=1050.0, now=1000.0)
+    assert bucket.time_until_available(1000.0) == pytest.approx(50.0)
+    assert bucket.time_until_available(1049.0) == pytest.approx(1.0)
+    assert bucket.time_until_available(1050.0) == 0
+
+
+def test_governor_waits_for_slowest_window(db):
+    governor = RateGovernor(db, LIMITS)
+    assert governor.time_until('tweet_create') == 0
+    governor.consume('tweet_create')
+    # 24 saatlik pencere (burst 1) en uzun beklemeyi belirler
+    assert governor.time_until('tweet_create') == pytest.approx(
+        86400 / 16, rel=0.01)
+    assert governor.time_until('media_upload') == 0
+    assert governor.time_until('unknown') == 0
+
+
+def test_governor_block_and_unblock(db):
+    governor = RateGovernor(db, LIMITS)
+    governor.block('tweet_create', '15m', time.time() + 600)
+    assert governor.time_until('tweet_create') == pytest.approx(600, abs=2)
+    governor.block('tweet_create', '15m', time.time() - 1)  # Geçmiş: etkisiz
+    assert governor.time_until('tweet_create') == pytest.approx(600, abs=2)
+
+    # Sıfırlanma zamanı geçince kilit kalkar; kilit kovayı boşalttığı için
+    # hak normal dolum hızıyla (900 / 8 sn'de bir) geri gelir
+    bucket = governor._buckets['tweet_create']['15m']
+    bucket.blocked_until = time.time() - 1
+    assert governor.time_until('tweet_create') == pytest.approx(112.5, abs=1)
+    bucket.updated_at -= 112.5
+    assert governor.time_until('tweet_create') == 0
+
+
+def test_state_survives_restart_per_namespace(db):
+    governor = RateGovernor(db, LIMITS, namespace='en')
+    governor.consume('tweet_create')
+    governor.block('media_upload', '15m', time.time() + 300)
+
+    restarted = RateGovernor(db, LIMITS, namespace='en')
+    assert restarted.time_until('tweet_create') > 5000
+    assert restarted.time_until('media_upload') == pytest.approx(300, abs=2)
+    # Başka hesabın kovaları etkilenmez
+    other = RateGovernor(db, LIMITS)
+    assert other.time_until('tweet_create') == 0
+    assert other.time_until('media_upload') == 0
+
+
+def test_response_headers_update_buckets(db):
+    governor = RateGovernor(db, LIMITS)
+    reset_at = time.time() + 120
+    response = SimpleNamespace(
+        request=SimpleNamespace(method='POST',
+                                url='https://api.twitter.com/2/tweets'),
+        headers={'x-rate-limit-remaining': '0',
+                 'x-rate-limit-reset': str(reset_at)})
+    governor.observe_response(response)
+    assert governor.time_until('tweet_create') == pytest.approx(120, abs=2)
+    assert RateGovernor(db, LIMITS).time_until('tweet_create') == pytest.approx(
+        120, abs=2)
+
+
+def test_endpoint_for():
+    assert RateGovernor.endpoint_for(
+        'POST', 'https://api.twitter.com/2/tweets') == 'tweet_create'
+    assert RateGovernor.endpoint_for(
+        'POST', 'https://upload.twitter.com/1.1/media/upload.json') == 'media_upload'
+    assert RateGovernor.endpoint_for(
+        'GET', 'https://api.twitter.com/2/tweets') is None
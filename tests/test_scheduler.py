@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""scheduler.Scheduler testleri."""
+
+import threading
+import time
+
+import pytest
+
+from scheduler import Scheduler
+
+
+@pytest.fixture
+def run():
+    """Zamanlayıcıyı arka planda çalıştırır; test sonunda durdurur."""
+    started = []
+
+    def start(scheduler):
+        thread = threading.Thread(target=scheduler.run_forever, daemon=True)
+        thread.start()
+        started.append((scheduler, thread))
+        return scheduler
+
+    yield start
+    for scheduler, thread in started:
+        scheduler.stop()
+        thread.join(timeout=5)
+
+
+def test_named_pool_runs_while_default_pool_is_busy(run):
+    scheduler = run(Scheduler(max_workers=1, pools={'post': 1}))
+    release = threading.Event()
+    posted = threading.Event()
+    hung_polls = []
+
+    def hung_poll(name):
+        hung_polls.append(name)
+        release.wait(5)
+
+    scheduler.schedule('poll:a', 0, hung_poll, 'a')
+    scheduler.schedule('poll:b', 0, hung_poll, 'b')
+    scheduler.schedule('post:default', 0.05, posted.set, pool='post')
+    try:
+        assert posted.wait(2)
+        assert hung_polls == ['a']  # Varsayılan havuzun tek işçisi hâlâ meşgul
+    finally:
+        release.set()
+
+
+def test_same_key_replaces_pending_job(run):
+    scheduler = run(Scheduler(max_workers=2))
+    ran = []
+    done = threading.Event()
+
+    def job(value):
+        ran.append(value)
+        done.set()
+
+    scheduler.schedule('job', 0.2, job, 'old')
+    scheduler.schedule('job', 0.05, job, 'new')
+    assert done.wait(2)
+    time.sleep(0.3)  # İptal edilen işin zamanı da geçsin
+    assert scheduler.snapshot() == {}
+    assert ran == ['new']
+
+
+def test_unknown_pool_is_rejected():
+    with pytest.raises(ValueError):
+        Scheduler(pools={'post': 1}).schedule('x', 0, print, pool='missing')
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""similarity.TitleIndex testleri."""
+
+import time
+
+from similarity import TitleIndex, title_tokens
+
+
+def test_title_tokens_drop_stopwords_and_plural_suffix():
+    assert title_tokens("Bitcoin prices hit a new high as ETFs grow") == {
+        'bitcoin', 'price', 'hit', 'high', 'etf', 'grow'}
+    assert 'class' in title_tokens("Asset class")
+    assert title_tokens("A to of") == frozenset()
+
+
+def test_near_duplicate_hit_and_miss():
+    index = TitleIndex(threshold=0.6)
+    index.add('coindesk', "Bitcoin price hits record high as ETF inflows surge")
+    # 7 ortak / 8 kelime = 0.875
+    link, score = index.find_similar("Bitcoin prices hit record high on ETF inflows")
+    assert link == 'coindesk'
+    assert score == 7 / 8
+    # 4 ortak / 9 kelime ≈ 0.44
+    assert index.find_similar("Ethereum price hits record high") is None
+    assert index.find_similar("Stablecoin bill passes senate") is None
+    assert index.stats()['lookups'] == 3
+    assert index.stats()['near_duplicates'] == 1
+
+
+def test_threshold_is_inclusive():
+    index = TitleIndex(threshold=0.6)
+    index.add('first', "alpha beta gamma delta")
+    assert index.find_similar("alpha beta gamma omega") == ('first', 3 / 5)
+    assert index.find_similar("alpha beta gamma omega sigma") is None
+
+
+def test_best_match_wins_and_own_link_is_excluded():
+    index = TitleIndex(threshold=0.5)
+    index.add('close', "alpha beta gamma delta")
+    index.add('exact', "alpha beta gamma delta omega")
+    assert index.find_similar("alpha beta gamma delta omega") == ('exact', 1.0)
+    assert index.find_similar("alpha beta gamma delta omega",
+                              exclude_link='exact') == ('close', 4 / 5)
+
+
+def test_readding_link_replaces_its_tokens():
+    index = TitleIndex(threshold=0.6)
+    index.add('story', "alpha beta gamma delta")
+    index.add('story', "omega sigma kappa theta")
+    assert index.find_similar("alpha beta gamma delta") is None
+    assert index.stats()['tokens'] == 4
+
+
+def test_prune_and_load_respect_window():
+    now = time.time()
+    index = TitleIndex(threshold=0.6, window=60)
+    index.load([
+        ('old', "alpha beta gamma delta", now - 120),
+        ('new', "omega sigma kappa theta", now),
+    ])
+    assert index.prune() == 1
+    assert index.find_similar("alpha beta gamma delta") is None
+    assert index.find_similar("omega sigma kappa theta") == ('new', 1.0)
+    assert index.stats()['titles'] == 1
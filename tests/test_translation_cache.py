@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""translation_cache.TranslatorPool testleri."""
+
+import threading
+
+from translation_cache import TranslatorPool
+
+THREADS = 8
+
+
+class StatefulTranslator:
+    """deep_translator gibi metni örnek üzerinde tutup sonra "gönderen" sahte çevirmen."""
+
+    def __init__(self, target, barrier=None):
+        self.target = target
+        self.barrier = barrier
+        self._url_params = {}
+
+    def translate(self, text):
+        self._url_params['q'] = text
+        if self.barrier is not None:
+            # Tüm thread'ler metnini yazmadan hiçbiri isteği "göndermesin"
+            self.barrier.wait(timeout=5)
+        return f"[{self.target}] {self._url_params['q']}"
+
+
+def test_parallel_translations_do_not_mix_texts():
+    barrier = threading.Barrier(THREADS)
+    pool = TranslatorPool(lambda lang: StatefulTranslator(lang, barrier))
+    results = {}
+
+    def worker(i):
+        results[i] = [pool.get('tr').translate(f"haber {i}-{n}")
+                      for n in range(5)]
+
+    threads = [threading.Thread(target=worker, args=(i, ))
+               for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {
+        i: [f"[tr] haber {i}-{n}" for n in range(5)]
+        for i in range(THREADS)
+    }
+
+
+def test_shared_instance_would_mix_texts():
+    # Havuzun neden gerektiğini gösterir: tek örnek paylaşılınca metinler karışır
+    barrier = threading.Barrier(2)
+    shared = StatefulTranslator('tr', barrier)
+    results = {}
+
+    def worker(i):
+        results[i] = shared.translate(f"haber {i}")
+
+    threads = [threading.Thread(target=worker, args=(i, )) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results[0] == results[1]
+
+
+def test_instance_reused_per_thread_and_language():
+    created = []
+
+    def factory(lang):
+        created.append(lang)
+        return StatefulTranslator(lang)
+
+    pool = TranslatorPool(factory)
+    assert pool.get('tr') is pool.get('tr')
+    assert pool.get('en') is not pool.get('tr')
+    other = []
+    thread = threading.Thread(target=lambda: other.append(pool.get('tr')))
+    thread.start()
+    thread.join()
+    assert other[0] is not pool.get('tr')
+    assert created == ['tr', 'en', 'tr']
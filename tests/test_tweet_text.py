@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""tweet_text ağırlıklı uzunluk ve tweet oluşturma testleri."""
+
+import pytest
+
+from tweet_text import (MAX_TWEET_WEIGHT, URL_WEIGHT, compose_tweet,
+                        truncate_to_weight, weighted_length)
+
+LONG_LINK = "https://example.com/news/" + "a" * 120
+
+
+@pytest.mark.parametrize("text, weight", [
+    ("Bitcoin", 7),
+    ("Türkçe başlık ğüşıöç", 20),
+    ("—", 1),
+    ("日本語", 6),
+    ("Bitcoin 上涨", 12),
+    ("비트코인", 8),
+    ("🚀", 2),
+    ("👍🏽", 2),  # ten rengi eki
+    ("👨‍👩‍👧", 2),  # ZWJ dizisi
+    ("🇹🇷", 2),  # bayrak
+    ("1️⃣", 2),
+    ("❤️", 2),  # varyasyon seçici
+    ("🚀🌕 BTC", 8),
+])
+def test_weighted_length_cjk_and_emoji(text, weight):
+    assert weighted_length(text) == weight
+
+
+def test_url_counts_as_fixed_weight():
+    assert weighted_length(LONG_LINK) == URL_WEIGHT
+    assert weighted_length("https://x.co/a") == URL_WEIGHT
+    assert weighted_length(f"see {LONG_LINK} 🚀 日本") == 4 + URL_WEIGHT + 4 + 4
+
+
+@pytest.mark.parametrize("text, weight", [
+    ("Crypto.com", URL_WEIGHT),
+    ("CRYPTO.COM", URL_WEIGHT),
+    ("Bitcoin.org", URL_WEIGHT),
+    ("Binance.US lists SOL", URL_WEIGHT + 10),
+    ("www.binance.us/en/markets", URL_WEIGHT),
+    ("ETF.com's report", URL_WEIGHT + 9),
+    ("Listed on Crypto.com.", 10 + URL_WEIGHT + 1),
+    # Link sayılmayanlar: e-posta, kısaltma, tutar, bilinmeyen uzantı
+    ("user@crypto.com", 15),
+    ("U.S. SEC e.g. BTC", 17),
+    ("$1.2bn inflows", 14),
+    ("Mt.Gox", 6),
+])
+def test_bare_domains_count_as_links(text, weight):
+    assert weighted_length(text) == weight
+
+
+def test_truncate_keeps_fitting_text_unchanged():
+    assert truncate_to_weight("日本語", 6) == "日本語"
+
+
+def test_truncate_never_splits_url_emoji_or_wide_char():
+    assert truncate_to_weight(f"Read {LONG_LINK} now", 20) == "Read..."
+    assert truncate_to_weight("abc 👨‍👩‍👧🚀🚀", 8) == "abc..."
+    truncated = truncate_to_weight("日本語日本語", 7)
+    assert truncated == "日本..."
+    assert weighted_length(truncated) <= 7
+
+
+def test_compose_keeps_link_whole_and_fits_limit():
+    title = "比特币价格创历史新高 🚀 " * 20
+    tags = ["#Bitcoin", "#BTC", "#Kripto", "#比特币"]
+    text = compose_tweet(title, LONG_LINK, tags, prefix="SON DAKİKA: ",
+                         emoji="🔥")
+    assert weighted_length(text) <= MAX_TWEET_WEIGHT
+    assert f"\n\n🔗 {LONG_LINK}" in text
+    assert text.startswith("SON DAKİKA: 比特币")
+
+
+def test_compose_counts_bare_domain_in_title():
+    tags = ["#Bitcoin", "#BTC", "#Kripto", "#Haber"]
+    text = compose_tweet("Crypto.com " + "x" * 200, LONG_LINK, tags,
+                         prefix="📰 ", emoji="🔥")
+    # Alan adı 10 değil 23 sayılır; başlık buna göre kısaltılır
+    assert weighted_length(text) <= MAX_TWEET_WEIGHT
+    assert text.startswith("📰 Crypto.com x") and " 🔥\n\n🔗 " in text
+    assert f"\n\n🔗 {LONG_LINK}\n\n#Bitcoin" in text
+
+
+def test_truncate_never_splits_bare_domain():
+    assert truncate_to_weight("Listing on Crypto.com today", 14) == "Listing on..."
+
+
+def test_compose_drops_tags_before_shortening_title():
+    title = "x" * 180
+    tags = ["#" + "t" * 30, "#" + "u" * 30, "#" + "v" * 30]
+    text = compose_tweet(title, LONG_LINK, tags, max_title_weight=190)
+    assert weighted_length(text) <= MAX_TWEET_WEIGHT
+    assert "x" * 180 in text
+    assert tags[1] in text and tags[2] not in text
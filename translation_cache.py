@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""Çeviri önbelleği: SQLite'ta kalıcı, üzerinde bellek içi LRU katmanı."""
+
+import threading
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from logs import get_logger
+
+log = get_logger(__name__)
+
+
+class TranslatorPool:
+    """Hedef dil ve thread başına ayrı çevirmen örneği.
+
+    deep_translator çevirmenleri istek parametrelerini (çevrilecek metin
+    dahil) örneğin üzerinde tutar; aynı örneği iki thread aynı anda
+    kullanırsa birbirinin metnini gönderebilir. factory(target_lang) yeni
+    bir çevirmen döndürmelidir.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._local = threading.local()
+
+    def get(self, target_lang):
+        translators = getattr(self._local, 'translators', None)
+        if translators is None:
+            translators = self._local.translators = {}
+        translator = translators.get(target_lang)
+        if translator is None:
+            translator = translators[target_lang] = self.factory(target_lang)
+        return translator
+
+
+class TranslationCache:
+    """(temizlenmiş metin, hedef dil) anahtarlı çeviri önbelleği.
+
+    Sık kullanılan kayıtlar bellekteki LRU katmanından, diğerleri SQLite'tan
+    okunur. TTL'i dolan kayıtlar okunurken yok sayılır ve prune() ile silinir.
+    """
+
+    def __init__(self, db, max_memory_items=2000, max_db_rows=20000,
+                 ttl_seconds=7 * 24 * 3600):
+        self.db = db  # storage.Database
+        self.max_memory_items = max_memory_items
+        self.max_db_rows = max_db_rows
+        self.ttl_seconds = ttl_seconds
+        self._memory = OrderedDict()
+        self._lock = Lock()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self._init_table()
+
+    def _init_table(self):
+        try:
+            conn = self.db.connection()
+            with conn:
+                conn.execute('''CREATE TABLE IF NOT EXISTS translation_cache
+                            (text TEXT NOT NULL,
+                            target_lang TEXT NOT NULL,
+                            translated TEXT NOT NULL,
+                            created_at REAL NOT NULL,
+                            PRIMARY KEY (text, target_lang))''')
+        except Exception as e:
+            log.error("❌ Çeviri önbelleği tablo hatası: %s", e)
+
+    def _remember(self, key, translated, created_at):
+        # Kilit çağıran tarafından tutuluyor olmalı
+        self._memory[key] = (translated, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, text, target_lang):
+        key = (text, target_lang)
+        expire_before = time.time() - self.ttl_seconds
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                if cached[1] >= expire_before:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return cached[0]
+                del self._memory[key]
+
+        try:
+            row = self.db.connection().execute(
+                "SELECT translated, created_at FROM translation_cache "
+                "WHERE text=? AND target_lang=? AND created_at>=?",
+                (text, target_lang, expire_before)).fetchone()
+        except Exception as e:
+            log.error("❌ Çeviri önbelleği okuma hatası: %s", e)
+            row = None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.db_hits += 1
+            self._remember(key, row[0], row[1])
+        return row[0]
+
+    def put(self, text, target_lang, translated):
+        created_at = time.time()
+        with self._lock:
+            self._remember((text, target_lang), translated, created_at)
+        try:
+            conn = self.db.connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO translation_cache "
+                    "(text, target_lang, translated, created_at) VALUES (?, ?, ?, ?)",
+                    (text, target_lang, translated, created_at))
+        except Exception as e:
+            log.error("❌ Çeviri önbelleği yazma hatası: %s", e)
+
+    def prune(self):
+        """Süresi dolan kayıtları siler, tabloyu max_db_rows ile sınırlar."""
+        try:
+            conn = self.db.connection()
+            with conn:
+                conn.execute("DELETE FROM translation_cache WHERE created_at<?",
+                             (time.time() - self.ttl_seconds, ))
+                conn.execute(
+                    "DELETE FROM translation_cache WHERE rowid IN "
+                    "(SELECT rowid FROM translation_cache ORDER BY created_at DESC "
+                    "LIMIT -1 OFFSET ?)", (self.max_db_rows, ))
+        except Exception as e:
+            log.error("❌ Çeviri önbelleği temizleme hatası: %s", e)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.db_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "db_hits": self.db_hits,
+                "misses": self.misses,
+                "hit_ratio": round((self.memory_hits + self.db_hits) / lookups, 3)
+                if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "max_memory_items": self.max_memory_items,
+            }
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""Twitter'ın ağırlıklı karakter sayımıyla tek geçişte tweet metni oluşturma."""
+
+import re
+import unicodedata
+
+MAX_TWEET_WEIGHT = 280
+URL_WEIGHT = 23  # t.co ile kısaltılan her link sabit 23 karakter sayılır
+EMOJI_WEIGHT = 2
+ELLIPSIS = "..."
+
+# twitter-text v3 yapılandırması: bu aralıklardaki karakterler 1, diğerleri 2
+_LIGHT_RANGES = ((0, 4351), (8192, 8205), (8208, 8223), (8242, 8247))
+
+_EMOJI_BASE = ("[\u2190-\u21ff\u2300-\u23ff\u2460-\u27bf\u2900-\u297f"
+               "\u2b00-\u2bff\u3030\u303d\u3297\u3299\U0001f000-\U0001faff]")
+_EMOJI_MOD = "(?:\ufe0f|[\U0001f3fb-\U0001f3ff]|\u20e3)*"
+# twitter-text şemasız alan adlarını da linkler (Crypto.com, Bitcoin.org):
+# önünde harf, rakam, @, $, #, -, _, . ya da / olmayan ve bilinen bir üst
+# alan adıyla biten adlar. Aşağıdaki liste twitter-text'in gTLD listesinin sık
+# görülen kısmıdır; iki harfli her uzantı ülke kodu sayılır. Fazladan link
+# saymak başlığı biraz kısaltır ama tweet'i sınırın üstüne çıkarmaz.
+_GENERIC_TLDS = sorted("""
+academy agency app asia bank bet biz blog cash capital casino cat click cloud
+club com company coop credit dev digital edu email exchange finance financial
+fun fund game games global gov group info int investments jobs link live loan
+ltd market markets media mil mobi money name net network news one online org
+page press pro run services site software solutions space store studio systems
+tech technology tel today top trade trading travel website win world xyz zone
+""".split(), key=len, reverse=True)
+_BARE_DOMAIN = (r"(?<![A-Za-z0-9@$#_./-])(?i:(?=[a-z0-9-]*\.)"
+                r"(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+"
+                f"(?:{'|'.join(_GENERIC_TLDS)}|[a-z]{{2}})"
+                r"(?![a-z0-9@+-])(?::[0-9]+)?(?:/[^\s]*)?)")
+_HEAVY_CHAR = "[^" + ''.join(f"{re.escape(chr(low))}-{re.escape(chr(high))}"
+                             for low, high in _LIGHT_RANGES) + "]"
+# Ağırlığı 1 olmayan parçalar: linkler (23, şemasız alan adları dahil) ile
+# emoji dizileri ve geniş karakterler (2). Bayraklar, ZWJ dizileri ve
+# renk/varyasyon ekleri tek emoji sayılır. Eşleşmeyen her karakterin ağırlığı
+# 1'dir.
+_SPECIAL = ("|[\U0001f1e6-\U0001f1ff]{2}"
+            f"|{_EMOJI_BASE}{_EMOJI_MOD}(?:\u200d{_EMOJI_BASE}{_EMOJI_MOD})*"
+            "|[0-9#*]\ufe0f?\u20e3"
+            f"|{_HEAVY_CHAR}")
+_SPECIAL_RE = re.compile(rf"(?P<url>https?://[^\s]+|{_BARE_DOMAIN})" + _SPECIAL)
+# Noktasız metinde alan adı olamaz; her kelime başında denenmesi gereksiz
+_SPECIAL_NO_DOMAIN_RE = re.compile(r"(?P<url>https?://[^\s]+)" + _SPECIAL)
+
+
+def _special_matches(text):
+    regex = _SPECIAL_RE if '.' in text else _SPECIAL_NO_DOMAIN_RE
+    return regex.finditer(text)
+
+
+def _special_weight(match):
+    return URL_WEIGHT if match.lastgroup == 'url' else EMOJI_WEIGHT
+
+
+def weighted_length(text):
+    """Metnin Twitter'ın saydığı ağırlıklı uzunluğu."""
+    text = unicodedata.normalize('NFC', text)
+    weight = len(text)
+    if text.isascii() and '.' not in text and '://' not in text:
+        return weight
+    for match in _special_matches(text):
+        weight += _special_weight(match) - (match.end() - match.start())
+    return weight
+
+
+def truncate_to_weight(text, budget, ellipsis=ELLIPSIS):
+    """Metni (üç nokta dahil) `budget` ağırlığa sığacak şekilde keser.
+
+    Linkler ve emoji dizileri bölünmez; zaten sığıyorsa metin aynen döner.
+    """
+    text = unicodedata.normalize('NFC', text)
+    if weighted_length(text) <= budget:
+        return text
+    room = max(budget - len(ellipsis), 0)
+    cut = None
+    pos = 0
+    for match in _special_matches(text):
+        gap = match.start() - pos
+        if gap >= room:
+            break
+        room -= gap
+        weight = _special_weight(match)
+        if weight > room:
+            cut = match.start()
+            break
+        room -= weight
+        pos = match.end()
+    if cut is None:
+        cut = pos + room
+    return text[:cut].rstrip() + ellipsis
+
+
+def compose_tweet(title, link, tags, prefix="", emoji="",
+                  max_title_weight=190, min_title_weight=20,
+                  max_weight=MAX_TWEET_WEIGHT):
+    """Başlık, link ve etiketlerden sınırı aşmayan tweet metni üretir.
+
+    Parçaların ağırlıkları bir kez hesaplanır ve bütçe sırayla dağıtılır:
+    link her zaman tam kalır, başlık önce max_title_weight'e kırpılır, sığmazsa
+    sondan etiketler (en az biri kalacak şekilde) çıkarılır, yine sığmazsa
+    başlık kısaltılır; başlık min_title_weight'in altına inecekse son etiket
+    de çıkarılır.
+    """
+    title_extra = weighted_length(prefix) + (
+        1 + weighted_length(emoji) if emoji else 0)
+    link_part = f"\n\n🔗 {link}"
+    link_weight = weighted_length(link_part)
+    tag_weights = [weighted_length(tag) for tag in tags]
+
+    title_weight = weighted_length(title)
+    title_fit = min(title_weight, max_title_weight - title_extra)
+
+    def tags_weight(count):
+        # "\n\n" ayırıcı + etiketler arası boşluklar
+        return (2 + sum(tag_weights[:count]) + count - 1) if count else 0
+
+    tag_count = len(tags)
+    while tag_count > 1 and (title_extra + title_fit + link_weight +
+                             tags_weight(tag_count)) > max_weight:
+        tag_count -= 1
+    title_budget = min(
+        title_fit,
+        max_weight - title_extra - link_weight - tags_weight(tag_count))
+    if title_budget < min(title_weight, min_title_weight) and tag_count:
+        tag_count = 0
+        title_budget = min(title_fit,
+                           max_weight - title_extra - link_weight)
+
+    display_title = truncate_to_weight(title, max(title_budget, 0))
+    text = f"{prefix}{display_title}"
+    if emoji:
+        text += f" {emoji}"
+    text += link_part
+    if tag_count:
+        text += "\n\n" + ' '.join(tags[:tag_count])
+    return text